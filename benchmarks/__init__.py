@@ -0,0 +1 @@
+"""Benchmarks for macpymessenger hot paths."""
@@ -0,0 +1,212 @@
+"""Stand-ins for ``osascript`` and the Messages database shared by benchmarks and tests.
+
+Benchmarks measure the library's own overhead, so they send through these stubs
+instead of Messages. The test suite uses the same stubs through
+:mod:`tests.support`.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+__all__ = [
+    "CHAT_DATABASE_SCHEMA",
+    "FAKE_WORKER_SOURCE",
+    "ExitingRunner",
+    "StubRunner",
+    "StubRunnerFactory",
+    "create_chat_database",
+    "write_fake_worker",
+]
+
+
+class StubRunner:
+    """Runner stub that records commands and fails for the given handles."""
+
+    def __init__(
+        self,
+        failing_recipient_handles: Sequence[str] | None = None,
+        latency_seconds: float = 0.0,
+    ) -> None:
+        self.commands: list[list[str]] = []
+        if failing_recipient_handles is None:
+            self.failing_recipient_handles = set()
+        else:
+            self.failing_recipient_handles = set(failing_recipient_handles)
+        self.latency_seconds = latency_seconds
+
+    def __call__(self, command: Sequence[str]) -> None:
+        arguments = list(command)
+        self.commands.append(arguments)
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        recipient_handle = arguments[2]
+        if recipient_handle in self.failing_recipient_handles:
+            raise subprocess.CalledProcessError(returncode=1, cmd=arguments)
+
+
+FAKE_WORKER_SOURCE = """\
+import json
+import os
+import sys
+
+log_path = sys.argv[1]
+for line in sys.stdin:
+    request = json.loads(line)
+    recipient = request["recipient"]
+    if recipient == "crash":
+        os._exit(3)
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        log_file.write(json.dumps([os.getpid(), recipient, request["body"]]) + "\\n")
+    if recipient == "fail":
+        response = {"id": request["id"], "ok": False, "error": "buddy not found"}
+    else:
+        response = {"id": request["id"], "ok": True}
+    sys.stdout.write(json.dumps(response) + "\\n")
+    sys.stdout.flush()
+"""
+
+
+def write_fake_worker(directory: Path) -> tuple[list[str], Path]:
+    """Write a stand-in send worker and return its command and send log path."""
+    worker_path = directory / "fake_worker.py"
+    worker_path.write_text(FAKE_WORKER_SOURCE, encoding="utf-8")
+    log_path = directory / "fake_worker.log"
+    return [sys.executable, str(worker_path), str(log_path)], log_path
+
+
+CHAT_DATABASE_SCHEMA = """
+CREATE TABLE handle (
+    ROWID INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE,
+    id TEXT NOT NULL,
+    country TEXT,
+    service TEXT NOT NULL,
+    uncanonicalized_id TEXT,
+    person_centric_id TEXT,
+    UNIQUE (id, service)
+);
+CREATE TABLE message (
+    ROWID INTEGER PRIMARY KEY AUTOINCREMENT,
+    guid TEXT UNIQUE NOT NULL,
+    text TEXT,
+    handle_id INTEGER DEFAULT 0,
+    service TEXT,
+    date INTEGER,
+    date_read INTEGER,
+    date_delivered INTEGER,
+    is_from_me INTEGER DEFAULT 0,
+    attributedBody BLOB
+);
+CREATE TABLE chat (
+    ROWID INTEGER PRIMARY KEY AUTOINCREMENT,
+    guid TEXT UNIQUE NOT NULL,
+    chat_identifier TEXT,
+    service_name TEXT
+);
+CREATE TABLE chat_message_join (
+    chat_id INTEGER REFERENCES chat (ROWID) ON DELETE CASCADE,
+    message_id INTEGER REFERENCES message (ROWID) ON DELETE CASCADE,
+    message_date INTEGER DEFAULT 0,
+    PRIMARY KEY (chat_id, message_id)
+);
+CREATE TABLE chat_handle_join (
+    chat_id INTEGER REFERENCES chat (ROWID) ON DELETE CASCADE,
+    handle_id INTEGER REFERENCES handle (ROWID) ON DELETE CASCADE,
+    UNIQUE (chat_id, handle_id)
+);
+CREATE INDEX message_idx_handle ON message (handle_id, date);
+CREATE INDEX chat_message_join_idx_message_id_only ON chat_message_join (message_id);
+"""
+"""Subset of the Messages ``chat.db`` schema read by :mod:`macpymessenger.history`."""
+
+
+def create_chat_database(
+    path: Path, conversations: dict[str, int], *, seconds_between: int = 60
+) -> None:
+    """Write a ``chat.db`` fixture with *conversations* mapping handle to message count.
+
+    Messages alternate direction, are interleaved across handles, and are dated in
+    nanoseconds since 2001-01-01 like current Messages databases.
+    """
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.executescript(CHAT_DATABASE_SCHEMA)
+        for handle_id, handle in enumerate(conversations, start=1):
+            connection.execute(
+                "INSERT INTO handle (ROWID, id, service) VALUES (?, ?, 'iMessage')",
+                (handle_id, handle),
+            )
+            connection.execute(
+                "INSERT INTO chat (ROWID, guid, chat_identifier, service_name) "
+                "VALUES (?, ?, ?, 'iMessage')",
+                (handle_id, f"iMessage;-;{handle}", handle),
+            )
+            connection.execute(
+                "INSERT INTO chat_handle_join (chat_id, handle_id) VALUES (?, ?)",
+                (handle_id, handle_id),
+            )
+        rows = (
+            (handle_id, index)
+            for index in range(max(conversations.values(), default=0))
+            for handle_id, count in enumerate(conversations.values(), start=1)
+            if index < count
+        )
+        for handle_id, index in rows:
+            date = (index * seconds_between + handle_id) * 1_000_000_000
+            cursor = connection.execute(
+                "INSERT INTO message (guid, text, handle_id, service, date, is_from_me) "
+                "VALUES (?, ?, ?, 'iMessage', ?, ?)",
+                (f"{handle_id}-{index}", f"message {index}", handle_id, date, index % 2),
+            )
+            connection.execute(
+                "INSERT INTO chat_message_join (chat_id, message_id, message_date) "
+                "VALUES (?, ?, ?)",
+                (handle_id, cursor.lastrowid, date),
+            )
+    connection.close()
+
+
+class ExitingRunner(StubRunner):
+    """Runner stub that ends its process on sending to an exiting handle, like a crash."""
+
+    def __init__(
+        self,
+        failing_recipient_handles: Sequence[str],
+        latency_seconds: float,
+        exiting_recipient_handles: Sequence[str],
+    ) -> None:
+        super().__init__(failing_recipient_handles, latency_seconds)
+        self.exiting_recipient_handles = set(exiting_recipient_handles)
+
+    def __call__(self, command: Sequence[str]) -> None:
+        if command[2] in self.exiting_recipient_handles:
+            os._exit(3)
+        super().__call__(command)
+
+
+class StubRunnerFactory:
+    """Picklable runner factory for worker processes, which cannot share a runner."""
+
+    def __init__(
+        self,
+        failing_recipient_handles: Sequence[str] = (),
+        latency_seconds: float = 0.0,
+        exiting_recipient_handles: Sequence[str] = (),
+    ) -> None:
+        self.failing_recipient_handles = list(failing_recipient_handles)
+        self.latency_seconds = latency_seconds
+        self.exiting_recipient_handles = list(exiting_recipient_handles)
+
+    def __call__(self) -> StubRunner:
+        return ExitingRunner(
+            self.failing_recipient_handles, self.latency_seconds, self.exiting_recipient_handles
+        )
@@ -0,0 +1,71 @@
+"""Compare repeated attachment sends staged per send and through an ``AttachmentStore``.
+
+Creates one ``--megabytes`` file and stages it ``--sends`` times, first by copy
+for every send (the fallback across volumes, where hard links are impossible),
+then through a store that stages it once and reuses it.
+
+Run with::
+
+    uv run python -m benchmarks.attachment_store --megabytes 50 --sends 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from macpymessenger import AttachmentPolicy, AttachmentStore
+from macpymessenger.attachments import inspect_attachment
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def _directory_bytes(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=int, default=50)
+    parser.add_argument("--sends", type=int, default=20)
+    arguments = parser.parse_args(argv)
+    size = arguments.megabytes * 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        source = root / "flyer.png"
+        with source.open("wb") as handle:
+            handle.write(PNG_HEADER)
+            handle.write(b"\x01" * (size - len(PNG_HEADER)))
+        attachment = inspect_attachment(source, AttachmentPolicy(max_bytes=size))
+
+        started = time.perf_counter()
+        for send in range(arguments.sends):
+            target = root / "per-send" / str(send)
+            target.mkdir(parents=True)
+            shutil.copyfile(source, target / source.name)
+        per_send_s = time.perf_counter() - started
+        per_send_bytes = _directory_bytes(root / "per-send")
+
+        store = AttachmentStore(root / "store")
+        started = time.perf_counter()
+        for _ in range(arguments.sends):
+            with store.lease(attachment):
+                pass
+        store_s = time.perf_counter() - started
+        store_bytes = _directory_bytes(root / "store")
+
+    mib = 1024 * 1024
+    print(f"staged per send:  {per_send_s * 1000:9.1f} ms  {per_send_bytes / mib:9.1f} MiB on disk")
+    print(f"attachment store: {store_s * 1000:9.1f} ms  {store_bytes / mib:9.1f} MiB on disk")
+
+
+if __name__ == "__main__":
+    main()
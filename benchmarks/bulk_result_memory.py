@@ -0,0 +1,78 @@
+"""Compare the memory held by bulk send results at one million recipients.
+
+The recipient strings belong to the caller and are not counted. ``two lists``
+is the former ``send_bulk`` return value, which records only success or
+failure; ``outcome list`` keeps every ``DeliveryOutcome`` to also retain error
+and duration, which is what :class:`BulkResult` stores in its arrays.
+
+Run with::
+
+    uv run python -m benchmarks.bulk_result_memory --recipients 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from macpymessenger import BulkResult
+from macpymessenger.delivery import DeliveryOutcome
+from macpymessenger.exceptions import MessageSendError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+
+def outcomes(recipients: Sequence[str], failure: MessageSendError) -> Iterator[DeliveryOutcome]:
+    """Yield one outcome per recipient, failing every tenth one."""
+    for index, recipient in enumerate(recipients):
+        error = failure if index % 10 == 0 else None
+        yield DeliveryOutcome(recipient, error, 1500)
+
+
+def as_lists(recipients: Sequence[str], failure: MessageSendError) -> object:
+    successful: list[str] = []
+    failed: list[str] = []
+    for outcome in outcomes(recipients, failure):
+        (successful if outcome.succeeded else failed).append(outcome.recipient_handle)
+    return successful, failed
+
+
+def as_outcome_list(recipients: Sequence[str], failure: MessageSendError) -> object:
+    return list(outcomes(recipients, failure))
+
+
+def as_bulk_result(recipients: Sequence[str], failure: MessageSendError) -> object:
+    return BulkResult.from_outcomes(outcomes(recipients, failure), recipients)
+
+
+def retained_bytes(build: Callable[[], object]) -> int:
+    """Return the bytes still allocated by *build* once its result is returned."""
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipients", type=int, default=1_000_000)
+    arguments = parser.parse_args(argv)
+
+    recipients = [f"+1555{index:07d}" for index in range(arguments.recipients)]
+    failure = MessageSendError.delivery_failed("+15550000000")
+    lists = retained_bytes(lambda: as_lists(recipients, failure))
+    outcome_list = retained_bytes(lambda: as_outcome_list(recipients, failure))
+    compact = retained_bytes(lambda: as_bulk_result(recipients, failure))
+    print(f"two lists:    {lists / 2**20:8.2f} MiB")
+    print(f"outcome list: {outcome_list / 2**20:8.2f} MiB")
+    print(f"BulkResult:   {compact / 2**20:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
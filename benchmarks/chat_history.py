@@ -0,0 +1,71 @@
+"""Compare a deep chat history page fetched with OFFSET and with keyset pagination.
+
+Builds a ``chat.db`` fixture with one heavy conversation, then times fetching
+the page at ``--depth`` messages back both ways.
+
+Run with::
+
+    uv run python -m benchmarks.chat_history --messages 500000 --depth 400000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from benchmarks._stubs import create_chat_database
+from macpymessenger import ChatHistoryReader
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+HANDLE = "+15550000001"
+
+OFFSET_PAGE = """
+SELECT m.ROWID, m.guid, m.text, m.date
+FROM message AS m JOIN handle AS h ON h.ROWID = m.handle_id
+WHERE h.id = ?
+ORDER BY m.date DESC, m.ROWID DESC
+LIMIT ? OFFSET ?
+"""
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=500_000)
+    parser.add_argument("--depth", type=int, default=400_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    arguments = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "chat.db"
+        create_chat_database(path, {HANDLE: arguments.messages, "+15550000002": 1_000})
+
+        connection = sqlite3.connect(path)
+        started = time.perf_counter()
+        offset_page = connection.execute(
+            OFFSET_PAGE, (HANDLE, arguments.page_size, arguments.depth)
+        ).fetchall()
+        offset_ms = (time.perf_counter() - started) * 1000
+        cursor = connection.execute(OFFSET_PAGE, (HANDLE, 1, arguments.depth - 1)).fetchone()[0]
+        connection.close()
+
+        with ChatHistoryReader(path) as reader:
+            reader.messages(HANDLE, limit=1)
+            started = time.perf_counter()
+            keyset_page = reader.messages(HANDLE, limit=arguments.page_size, before=cursor)
+            keyset_ms = (time.perf_counter() - started) * 1000
+
+    if [row[0] for row in offset_page] != [message.rowid for message in keyset_page]:
+        message = "OFFSET and keyset pages differ"
+        raise SystemExit(message)
+    print(f"OFFSET page:  {offset_ms:9.3f} ms")
+    print(f"keyset page:  {keyset_ms:9.3f} ms  ({offset_ms / keyset_ms:,.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare sequential and thread-pool ``send_bulk`` with a latency-injecting runner.
+
+Run with::
+
+    uv run python -m benchmarks.concurrent_bulk --recipients 200 --latency 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from benchmarks._stubs import StubRunner
+from macpymessenger import Configuration, IMessageClient
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def measure(client: IMessageClient, recipients: list[str], max_workers: int | None) -> float:
+    """Return the seconds ``send_bulk`` takes for *recipients*."""
+    started = time.perf_counter()
+    client.send_bulk(recipients, "Benchmark message", max_workers=max_workers)
+    return time.perf_counter() - started
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipients", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per send")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8, 16])
+    arguments = parser.parse_args(argv)
+
+    logger = logging.getLogger("benchmarks.concurrent_bulk")
+    logger.disabled = True
+    recipients = [f"+1555{index:07d}" for index in range(arguments.recipients)]
+    with tempfile.TemporaryDirectory() as directory:
+        script_path = Path(directory) / "send.scpt"
+        script_path.write_text("-- benchmark script", encoding="utf-8")
+        client = IMessageClient(
+            Configuration(script_path),
+            command_runner=StubRunner(latency_seconds=arguments.latency),
+            logger=logger,
+        )
+        sequential = measure(client, recipients, None)
+        print(f"sequential:      {sequential:8.3f} s")
+        for max_workers in arguments.workers:
+            elapsed = measure(client, recipients, max_workers)
+            print(f"max_workers={max_workers:<3} {elapsed:8.3f} s  ({sequential / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
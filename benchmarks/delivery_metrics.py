@@ -0,0 +1,68 @@
+"""Measure the per-send cost of delivery metrics.
+
+Times ``MessageDelivery.deliver`` with a no-op command runner, without a metrics
+sink and with :class:`~macpymessenger.metrics.DeliveryMetrics`, so the numbers
+are the library's own overhead rather than ``osascript``.
+
+Run with::
+
+    uv run python -m benchmarks.delivery_metrics --sends 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from macpymessenger import Configuration, DeliveryMetrics, render_prometheus
+from macpymessenger.delivery import MessageDelivery
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from macpymessenger.metrics import MetricsSink
+
+
+def _run_nothing(_command: Sequence[str]) -> None:
+    return None
+
+
+def measure(configuration: Configuration, metrics: MetricsSink | None, sends: int) -> float:
+    """Return nanoseconds per ``deliver`` call."""
+    logger = logging.getLogger("benchmarks.delivery_metrics")
+    logger.setLevel(logging.WARNING)
+    delivery = MessageDelivery(configuration, _run_nothing, logger, metrics=metrics)
+    started = time.perf_counter_ns()
+    for _ in range(sends):
+        delivery.deliver("+15555555555", "Hello")
+    return (time.perf_counter_ns() - started) / sends
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sends", type=int, default=200_000)
+    arguments = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        script = Path(directory) / "send.scpt"
+        script.write_text("-- benchmark script", encoding="utf-8")
+        configuration = Configuration(script)
+        measure(configuration, None, 1_000)
+        disabled = measure(configuration, None, arguments.sends)
+        metrics = DeliveryMetrics()
+        enabled = measure(configuration, metrics, arguments.sends)
+        started = time.perf_counter_ns()
+        render_prometheus(metrics)
+        render_us = (time.perf_counter_ns() - started) / 1000
+
+    print(f"metrics disabled: {disabled:8.0f} ns/send")
+    print(f"metrics enabled:  {enabled:8.0f} ns/send  (+{enabled - disabled:,.0f} ns)")
+    print(f"render_prometheus: {render_us:7.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure the per-send cost of file logging in synchronous and asynchronous mode.
+
+Sends through ``IMessageClient`` with a no-op command runner, so the difference
+between the modes is the time the sending thread spends logging. Synchronous
+mode writes and flushes each record before ``send`` returns; asynchronous mode
+only queues it. The asynchronous time excludes writing the queued records, which
+``close`` waits for and which is reported separately. In this tight loop the
+listener thread competes with the sender for the GIL, so the difference is
+mostly the saved flushes; on slow or contended disks the sender also stops
+waiting for writes.
+
+Run with::
+
+    uv run python -m benchmarks.file_logging --sends 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from macpymessenger import Configuration, FileLoggingConfiguration, IMessageClient
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def _run_nothing(_command: Sequence[str]) -> None:
+    return None
+
+
+def measure(
+    configuration: Configuration, file_logging: FileLoggingConfiguration | None, sends: int
+) -> tuple[float, float]:
+    """Return nanoseconds per ``send`` and the milliseconds ``close`` took to flush."""
+    logger = logging.getLogger(f"benchmarks.file_logging.{id(file_logging)}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    client = IMessageClient(
+        configuration, command_runner=_run_nothing, logger=logger, file_logging=file_logging
+    )
+    started = time.perf_counter_ns()
+    for _ in range(sends):
+        client.send("+15555555555", "Hello")
+    per_send = (time.perf_counter_ns() - started) / sends
+    started = time.perf_counter_ns()
+    client.close()
+    flush_ms = (time.perf_counter_ns() - started) / 1e6
+    for handler in logger.handlers:
+        handler.close()
+    return per_send, flush_ms
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sends", type=int, default=100_000)
+    arguments = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        script = Path(directory) / "send.scpt"
+        script.write_text("-- benchmark script", encoding="utf-8")
+        configuration = Configuration(script)
+        modes = {
+            "no file logging": None,
+            "synchronous": FileLoggingConfiguration(Path(directory) / "sync.log"),
+            "asynchronous": FileLoggingConfiguration(
+                Path(directory) / "async.log", asynchronous=True
+            ),
+            "async + rotation": FileLoggingConfiguration(
+                Path(directory) / "rotating.log",
+                asynchronous=True,
+                max_bytes=1 << 20,
+                compress=True,
+            ),
+        }
+        measure(configuration, None, 1_000)
+        for name, file_logging in modes.items():
+            per_send, flush_ms = measure(configuration, file_logging, arguments.sends)
+            print(f"{name:18} {per_send:8.0f} ns/send  close: {flush_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
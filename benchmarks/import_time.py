@@ -0,0 +1,99 @@
+"""Measure package import time with ``python -X importtime`` and catch regressions.
+
+Each case runs in a fresh interpreter ``--runs`` times. The import time of a
+case is the sum of the self times ``-X importtime`` reports for every module its
+statement imports, so interpreter startup is excluded. Results and the
+comparison against ``--baseline`` work as in :mod:`benchmarks.suite`: the run
+exits with status 1 when a case is more than ``--threshold`` slower.
+
+Run with::
+
+    uv run python -m benchmarks.import_time
+    uv run python -m benchmarks.import_time --save-baseline benchmarks/import-baseline.json
+    uv run python -m benchmarks.import_time --baseline benchmarks/import-baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from benchmarks.suite import SCHEMA_VERSION, Result, compare
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+MARKER = "macpymessenger-import-time-start"
+
+CASES = {
+    "import_package": "import macpymessenger",
+    "import_client": "from macpymessenger import Configuration, IMessageClient",
+    "construct_client": (
+        "from macpymessenger import Configuration, IMessageClient\nIMessageClient(Configuration())"
+    ),
+    "import_async_client": "from macpymessenger import AsyncIMessageClient",
+}
+
+
+def import_time_us(statement: str) -> int:
+    """Return microseconds spent importing modules while *statement* runs."""
+    code = f"import sys\nsys.stderr.write({MARKER!r} + '\\n')\n{statement}"
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    _, _, report = completed.stderr.partition(MARKER)
+    total = 0
+    for line in report.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[0].strip().isdigit():  # noqa: PLR2004
+            total += int(fields[0])
+    return total
+
+
+def measure(name: str, statement: str, runs: int) -> Result:
+    samples = [import_time_us(statement) * 1000 for _ in range(runs)]
+    return Result(name, statistics.median(samples), min(samples), runs)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against this results file")
+    parser.add_argument("--save-baseline", type=Path, help="write results as a new baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.20, help="allowed slowdown, 0.20 for 20%%"
+    )
+    arguments = parser.parse_args(argv)
+
+    results = [measure(name, statement, arguments.runs) for name, statement in CASES.items()]
+    document = {
+        "schema": SCHEMA_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.name: result.as_json() for result in results},
+    }
+    for path in (arguments.output, arguments.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    baseline = {}
+    if arguments.baseline is not None:
+        baseline = json.loads(arguments.baseline.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, arguments.threshold)
+    if regressions:
+        message = f"{len(regressions)} case(s) regressed: {', '.join(regressions)}"
+        raise SystemExit(message)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Measure :class:`~macpymessenger.outbox.Outbox` enqueue throughput.
+
+Run with::
+
+    uv run python -m benchmarks.outbox_enqueue --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from macpymessenger import Outbox, OutboxEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    arguments = parser.parse_args(argv)
+
+    for batch_size in arguments.batch_sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            entries = (
+                OutboxEntry(f"+1555{index:07d}", "Benchmark message")
+                for index in range(arguments.rows)
+            )
+            with Outbox(Path(directory) / "outbox.db") as outbox:
+                started = time.perf_counter()
+                outbox.enqueue_many(entries, batch_size=batch_size)
+                elapsed = time.perf_counter() - started
+        rows_per_minute = arguments.rows / elapsed * 60
+        print(f"batch_size={batch_size:<6} {elapsed:8.3f} s  {rows_per_minute:12,.0f} rows/min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Measure how ``ShardedDispatcher`` throughput scales with the number of shards.
+
+Each worker process sends through a stub runner that sleeps ``--latency``
+seconds per message, standing in for ``osascript``. With the latency dominating,
+messages per second should grow close to linearly with the shard count until
+recipients stop spreading evenly across shards.
+
+Run with::
+
+    uv run python -m benchmarks.sharded_dispatch --messages 400 --latency 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from benchmarks._stubs import StubRunnerFactory
+from macpymessenger import Configuration, ShardedDispatcher
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def measure(
+    configuration: Configuration, messages: list[tuple[str, str]], shards: int, latency: float
+) -> float:
+    """Return messages per second for *messages* sent over *shards* worker processes."""
+    logger = logging.getLogger("benchmarks.sharded_dispatch")
+    logger.disabled = True
+    with ShardedDispatcher(
+        configuration,
+        shards=shards,
+        runner_factory=StubRunnerFactory(latency_seconds=latency),
+        logger=logger,
+    ) as dispatcher:
+        # Worker start-up is excluded: one message per shard warms every process.
+        for _ in dispatcher.dispatch(messages[:shards]):
+            pass
+        started = time.perf_counter()
+        for _ in dispatcher.dispatch(messages):
+            pass
+        return len(messages) / (time.perf_counter() - started)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=400)
+    parser.add_argument("--recipients", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per send")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    arguments = parser.parse_args(argv)
+
+    messages = [
+        (f"+1555{index % arguments.recipients:07d}", f"Message {index}")
+        for index in range(arguments.messages)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        script_path = Path(directory) / "send.scpt"
+        script_path.write_text("-- benchmark script", encoding="utf-8")
+        configuration = Configuration(script_path)
+        baseline = None
+        for shards in arguments.shards:
+            rate = measure(configuration, messages, shards, arguments.latency)
+            baseline = baseline or rate
+            print(f"shards={shards:<3} {rate:9.1f} messages/s  ({rate / baseline:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Run the hot-path microbenchmarks and compare them against a stored baseline.
+
+Cases cover ``MessageDelivery.deliver`` with a no-op runner, ``_process_template``
+across template shapes, ``send_bulk`` at 1k, 100k and 1M recipients, and
+``IMessageClient`` construction. Each case reports nanoseconds per operation
+(per send for ``send_bulk``): the median and the fastest of ``--repeats`` runs.
+
+Results are written as JSON to ``--output``. With ``--baseline``, each median is
+compared against the baseline's and the run exits with status 1 when any case is
+more than ``--threshold`` slower. Baselines are machine specific; record one on
+the machine that compares against it with ``--save-baseline``.
+
+Run with::
+
+    uv run python -m benchmarks.suite --output benchmark-results.json
+    uv run python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    uv run python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import tempfile
+import time
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from string.templatelib import Interpolation, Template
+from typing import TYPE_CHECKING
+
+from macpymessenger import Configuration, IMessageClient
+from macpymessenger.delivery import MessageDelivery
+from macpymessenger.templates import _process_template
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    """One benchmark: *setup* returns the callable that is timed."""
+
+    name: str
+    setup: Callable[[Path], Callable[[], object]]
+    operations: int = 1
+    """Operations performed by one call of the timed callable."""
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    name: str
+    median_ns: float
+    min_ns: float
+    calls: int
+
+    def as_json(self) -> dict[str, float | int]:
+        return {"median_ns": self.median_ns, "min_ns": self.min_ns, "calls": self.calls}
+
+
+def _run_nothing(_command: Sequence[str]) -> None:
+    return None
+
+
+def _logger() -> logging.Logger:
+    logger = logging.getLogger("benchmarks.suite")
+    logger.disabled = True
+    return logger
+
+
+def _deliver(script_path: Path) -> Callable[[], object]:
+    delivery = MessageDelivery(Configuration(script_path), _run_nothing, _logger())
+    return lambda: delivery.deliver("+15555555555", "Benchmark message")
+
+
+def _template(*parts: str | Interpolation) -> Callable[[Path], Callable[[], object]]:
+    template = Template(*parts)
+    return lambda _script_path: lambda: _process_template(template)
+
+
+def _send_bulk(recipients: int) -> Callable[[Path], Callable[[], object]]:
+    def setup(script_path: Path) -> Callable[[], object]:
+        # Built here rather than at import, so only the selected cases allocate.
+        numbers = [f"+1555{index:07d}" for index in range(recipients)]
+        client = IMessageClient(
+            Configuration(script_path), command_runner=_run_nothing, logger=_logger()
+        )
+        return lambda: client.send_bulk(numbers, "Benchmark message")
+
+    return setup
+
+
+def _construct_client(script_path: Path) -> Callable[[], object]:
+    configuration = Configuration(script_path)
+    logger = _logger()
+    return lambda: IMessageClient(configuration, command_runner=_run_nothing, logger=logger)
+
+
+FIELD = Interpolation("Ada", "name")
+CASES = (
+    Case("deliver_noop_runner", _deliver),
+    Case("process_template_static", _template("Your appointment is confirmed.")),
+    Case("process_template_one_field", _template("Hi ", FIELD, ", your code is ready.")),
+    Case(
+        "process_template_eight_fields",
+        _template(*(part for _ in range(8) for part in (FIELD, " "))),
+    ),
+    Case(
+        "process_template_formatted",
+        _template("Hi ", Interpolation("Ada", "name", "r", ">12"), "!"),
+    ),
+    Case("send_bulk_1k", _send_bulk(1_000), operations=1_000),
+    Case("send_bulk_100k", _send_bulk(100_000), operations=100_000),
+    Case("send_bulk_1m", _send_bulk(1_000_000), operations=1_000_000),
+    Case("client_construction", _construct_client),
+)
+
+
+def measure(case: Case, script_path: Path, repeats: int) -> Result:
+    """Time *case* and return nanoseconds per operation."""
+    timed = case.setup(script_path)
+    if case.operations == 1:
+        timer = timeit.Timer(timed)
+        calls, _ = timer.autorange()
+        samples = [elapsed / calls for elapsed in timer.repeat(repeats, calls)]
+    else:
+        calls = 1
+        samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            timed()
+            samples.append(time.perf_counter() - started)
+    per_operation = [sample * 1e9 / case.operations for sample in samples]
+    return Result(case.name, statistics.median(per_operation), min(per_operation), calls)
+
+
+def compare(
+    results: Sequence[Result], baseline: dict[str, dict[str, float]], threshold: float
+) -> list[str]:
+    """Print each case against *baseline* and return the names that regressed."""
+    regressions: list[str] = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            print(f"{result.name:32} {result.median_ns:12,.1f} ns/op  (no baseline)")
+            continue
+        ratio = result.median_ns / previous["median_ns"]
+        regressed = ratio > 1 + threshold
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{result.name:32} {result.median_ns:12,.1f} ns/op  {ratio:6.2f}x{marker}")
+        if regressed:
+            regressions.append(result.name)
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against this results file")
+    parser.add_argument("--save-baseline", type=Path, help="write results as a new baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 for 10%%"
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--filter", default="", help="run only cases whose name contains this")
+    arguments = parser.parse_args(argv)
+
+    cases = [case for case in CASES if arguments.filter in case.name]
+    with tempfile.TemporaryDirectory() as directory:
+        script_path = Path(directory) / "send.scpt"
+        script_path.write_text("-- benchmark script", encoding="utf-8")
+        results = [measure(case, script_path, arguments.repeats) for case in cases]
+
+    document = {
+        "schema": SCHEMA_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.name: result.as_json() for result in results},
+    }
+    for path in (arguments.output, arguments.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    baseline = {}
+    if arguments.baseline is not None:
+        baseline = json.loads(arguments.baseline.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, arguments.threshold)
+    if regressions:
+        message = f"{len(regressions)} case(s) regressed: {', '.join(regressions)}"
+        raise SystemExit(message)
+
+
+if __name__ == "__main__":
+    main()
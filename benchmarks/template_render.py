@@ -0,0 +1,53 @@
+"""Compare renders per second of the reference renderer and the compiled render plan.
+
+Run with::
+
+    uv run python -m benchmarks.template_render --renders 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import TYPE_CHECKING
+
+from macpymessenger import TemplateManager
+from macpymessenger.templates import _process_template
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from string.templatelib import Template
+
+
+def greeting(first_name: str, last_name: str, code: str) -> Template:
+    return t"Hi {first_name} {last_name}, your code is {code}. Reply STOP to opt out."
+
+
+def measure(render: Callable[[dict[str, str]], str], contexts: list[dict[str, str]]) -> float:
+    """Return renders per second of *render* over *contexts*."""
+    started = time.perf_counter()
+    for context in contexts:
+        render(context)
+    return len(contexts) / (time.perf_counter() - started)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--renders", type=int, default=1_000_000)
+    arguments = parser.parse_args(argv)
+
+    contexts = [
+        {"first_name": "Ada", "last_name": "Lovelace", "code": f"{index:06d}"}
+        for index in range(arguments.renders)
+    ]
+    manager = TemplateManager()
+    manager.create_template("greeting", greeting)
+
+    reference = measure(lambda context: _process_template(greeting(**dict(context))), contexts)
+    compiled = measure(lambda context: manager.render_template("greeting", context), contexts)
+    print(f"reference renderer: {reference:12,.0f} renders/s")
+    print(f"compiled plan:      {compiled:12,.0f} renders/s  ({compiled / reference:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
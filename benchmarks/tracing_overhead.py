@@ -0,0 +1,74 @@
+"""Measure the per-send cost of tracing hooks.
+
+Times ``MessageDelivery.deliver`` with a no-op command runner, first with no
+tracer registered and then with a tracer whose callbacks do nothing, so the
+difference is the cost of the spans themselves.
+
+Run with::
+
+    uv run python -m benchmarks.tracing_overhead --sends 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from macpymessenger import Configuration, set_tracer
+from macpymessenger.delivery import MessageDelivery
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from macpymessenger import Span
+
+
+class NullTracer:
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        pass
+
+
+def _run_nothing(_command: Sequence[str]) -> None:
+    return None
+
+
+def measure(delivery: MessageDelivery, sends: int) -> float:
+    """Return nanoseconds per ``deliver`` call."""
+    started = time.perf_counter_ns()
+    for _ in range(sends):
+        delivery.deliver("+15555555555", "Hello")
+    return (time.perf_counter_ns() - started) / sends
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sends", type=int, default=200_000)
+    arguments = parser.parse_args(argv)
+
+    logger = logging.getLogger("benchmarks.tracing_overhead")
+    logger.setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as directory:
+        script = Path(directory) / "send.scpt"
+        script.write_text("-- benchmark script", encoding="utf-8")
+        delivery = MessageDelivery(Configuration(script), _run_nothing, logger)
+        measure(delivery, 1_000)
+        untraced = measure(delivery, arguments.sends)
+        previous = set_tracer(NullTracer())
+        try:
+            traced = measure(delivery, arguments.sends)
+        finally:
+            set_tracer(previous)
+
+    print(f"no tracer:   {untraced:8.0f} ns/send")
+    print(f"null tracer: {traced:8.0f} ns/send  (+{traced - untraced:,.0f} ns for two spans)")
+
+
+if __name__ == "__main__":
+    main()
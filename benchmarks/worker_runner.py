@@ -0,0 +1,74 @@
+"""Compare spawn-per-send delivery with the long-lived send worker.
+
+Both paths run a Python stand-in for ``osascript`` so the benchmark works on
+any platform. Run with::
+
+    uv run python -m benchmarks.worker_runner --messages 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from benchmarks._stubs import write_fake_worker
+from macpymessenger import Configuration, SubprocessCommandRunner, WorkerCommandRunner
+from macpymessenger.delivery import MessageDelivery
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from macpymessenger import CommandRunner
+
+ONE_SHOT_SEND_SOURCE = "import sys\nsys.exit(0)\n"
+
+
+class PythonSpawnRunner:
+    """Spawn-per-send runner that swaps ``osascript`` for the Python interpreter."""
+
+    def __init__(self) -> None:
+        self._runner = SubprocessCommandRunner()
+
+    def __call__(self, command: Sequence[str]) -> None:
+        self._runner([sys.executable, *command[1:]])
+
+
+def measure(runner: CommandRunner, configuration: Configuration, messages: int) -> float:
+    """Return messages per second for *messages* deliveries through *runner*."""
+    logger = logging.getLogger("benchmarks.worker_runner")
+    logger.disabled = True
+    delivery = MessageDelivery(configuration=configuration, command_runner=runner, logger=logger)
+    started = time.perf_counter()
+    for index in range(messages):
+        delivery.deliver(f"+1555000{index:04d}", "Benchmark message")
+    return messages / (time.perf_counter() - started)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200)
+    arguments = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        workspace = Path(directory)
+        send_script = workspace / "send.py"
+        send_script.write_text(ONE_SHOT_SEND_SOURCE, encoding="utf-8")
+        configuration = Configuration(send_script)
+        worker_command, _ = write_fake_worker(workspace)
+
+        spawn_rate = measure(PythonSpawnRunner(), configuration, arguments.messages)
+        with WorkerCommandRunner(worker_command) as worker_runner:
+            worker_rate = measure(worker_runner, configuration, arguments.messages)
+
+    print(f"spawn-per-send: {spawn_rate:10.1f} messages/s")
+    print(f"send worker:    {worker_rate:10.1f} messages/s")
+    print(f"speedup:        {worker_rate / spawn_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,149 @@
-"""Public package exports for macpymessenger."""
+"""Public package exports for macpymessenger.
+
+Exports are imported from their modules on first access, so ``import
+macpymessenger`` is cheap and using :class:`IMessageClient` never imports the
+asyncio, SQLite or thread pool machinery of features it does not use.
+"""
 
 from __future__ import annotations
 
-from .client import FileLoggingConfiguration, IMessageClient
-from .commands import CommandRunner, SubprocessCommandRunner
-from .configuration import Configuration
-from .templates import RenderedTemplate, TemplateManager
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .async_client import AsyncIMessageClient
+    from .attachments import AttachmentPolicy, AttachmentStore
+    from .bulklog import BulkLogPolicy
+    from .client import FileLoggingConfiguration, IMessageClient
+    from .commands import (
+        AsyncCommandRunner,
+        AsyncSubprocessCommandRunner,
+        CommandRunner,
+        OutputCommandRunner,
+        SubprocessCommandRunner,
+        SubprocessOutputCommandRunner,
+    )
+    from .configuration import Configuration
+    from .history import ChatDatabaseTailer, ChatHistoryReader, ChatMessage
+    from .metrics import DeliveryMetrics, MetricsSink, render_prometheus
+    from .ordering import KeyedSerialExecutor
+    from .outbox import Outbox, OutboxEntry
+    from .ratelimit import RateLimit, RateLimiter
+    from .recipients import RecipientPlan, normalize_handle, plan_recipients
+    from .results import BulkResult, ErrorKind, RecipientView, SendStatus
+    from .retry import CircuitBreaker, CircuitState, RetryPolicy
+    from .scheduling import DeliveryScheduler, ScheduledSend
+    from .sharding import ShardedDispatcher
+    from .templates import RenderedTemplate, TemplateManager
+    from .tracing import OpenTelemetryTracer, Span, Tracer, set_tracer
+    from .worker import WorkerCommandRunner
+
+_EXPORTS: dict[str, str] = {
+    "AsyncCommandRunner": "commands",
+    "AsyncIMessageClient": "async_client",
+    "AsyncSubprocessCommandRunner": "commands",
+    "AttachmentPolicy": "attachments",
+    "AttachmentStore": "attachments",
+    "BulkLogPolicy": "bulklog",
+    "BulkResult": "results",
+    "ChatDatabaseTailer": "history",
+    "ChatHistoryReader": "history",
+    "ChatMessage": "history",
+    "CircuitBreaker": "retry",
+    "CircuitState": "retry",
+    "CommandRunner": "commands",
+    "Configuration": "configuration",
+    "DeliveryMetrics": "metrics",
+    "DeliveryScheduler": "scheduling",
+    "ErrorKind": "results",
+    "FileLoggingConfiguration": "client",
+    "IMessageClient": "client",
+    "KeyedSerialExecutor": "ordering",
+    "MetricsSink": "metrics",
+    "OpenTelemetryTracer": "tracing",
+    "Outbox": "outbox",
+    "OutboxEntry": "outbox",
+    "OutputCommandRunner": "commands",
+    "RateLimit": "ratelimit",
+    "RateLimiter": "ratelimit",
+    "RecipientPlan": "recipients",
+    "RecipientView": "results",
+    "RenderedTemplate": "templates",
+    "RetryPolicy": "retry",
+    "ScheduledSend": "scheduling",
+    "SendStatus": "results",
+    "ShardedDispatcher": "sharding",
+    "Span": "tracing",
+    "SubprocessCommandRunner": "commands",
+    "SubprocessOutputCommandRunner": "commands",
+    "TemplateManager": "templates",
+    "Tracer": "tracing",
+    "WorkerCommandRunner": "worker",
+    "normalize_handle": "recipients",
+    "plan_recipients": "recipients",
+    "render_prometheus": "metrics",
+    "set_tracer": "tracing",
+}
+"""Module, relative to this package, that defines each export."""
 
 __all__ = [
+    "AsyncCommandRunner",
+    "AsyncIMessageClient",
+    "AsyncSubprocessCommandRunner",
+    "AttachmentPolicy",
+    "AttachmentStore",
+    "BulkLogPolicy",
+    "BulkResult",
+    "ChatDatabaseTailer",
+    "ChatHistoryReader",
+    "ChatMessage",
+    "CircuitBreaker",
+    "CircuitState",
     "CommandRunner",
     "Configuration",
+    "DeliveryMetrics",
+    "DeliveryScheduler",
+    "ErrorKind",
     "FileLoggingConfiguration",
     "IMessageClient",
+    "KeyedSerialExecutor",
+    "MetricsSink",
+    "OpenTelemetryTracer",
+    "Outbox",
+    "OutboxEntry",
+    "OutputCommandRunner",
+    "RateLimit",
+    "RateLimiter",
+    "RecipientPlan",
+    "RecipientView",
     "RenderedTemplate",
+    "RetryPolicy",
+    "ScheduledSend",
+    "SendStatus",
+    "ShardedDispatcher",
+    "Span",
     "SubprocessCommandRunner",
+    "SubprocessOutputCommandRunner",
     "TemplateManager",
+    "Tracer",
+    "WorkerCommandRunner",
+    "normalize_handle",
+    "plan_recipients",
+    "render_prometheus",
+    "set_tracer",
 ]
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        message = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(message) from None
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
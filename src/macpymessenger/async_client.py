@@ -0,0 +1,216 @@
+"""The asyncio messaging client."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Final, overload
+
+from .client import _configure_logger
+from .commands import AsyncSubprocessCommandRunner
+from .delivery import DeliveryOutcome, MessageDelivery, _elapsed_us
+from .exceptions import InvalidConcurrencyError, MessageSendError
+from .results import BulkResult
+from .templates import TemplateManager
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Mapping, Sequence
+
+    from .bulklog import BulkLogger, BulkLogPolicy
+    from .client import FileLoggingConfiguration
+    from .commands import AsyncCommandRunner
+    from .configuration import Configuration
+    from .metrics import MetricsSink
+    from .ratelimit import RateLimiter
+    from .retry import CircuitBreaker, RetryPolicy
+
+__all__ = ["DEFAULT_MAX_CONCURRENCY", "AsyncIMessageClient"]
+
+DEFAULT_MAX_CONCURRENCY: Final = 8
+"""Default number of sends an :class:`AsyncIMessageClient` runs at once."""
+
+
+class AsyncIMessageClient:
+    """An asyncio client for sending messages via iMessage on macOS.
+
+    Sends run through an :class:`~macpymessenger.commands.AsyncCommandRunner`, so no
+    thread is blocked while ``osascript`` runs. At most ``max_concurrency`` sends run
+    at once; further sends wait for a free slot, so thousands of sends can be awaited
+    together without starting thousands of child processes.
+
+    The client's concurrency limit binds to the event loop that first uses it.
+
+    Parameters
+    ----------
+    configuration:
+        Resolved configuration specifying the AppleScript entry point.
+    template_manager:
+        Template storage and rendering backend used for templated messages.
+    command_runner:
+        Awaitable runner that executes the generated AppleScript command. Defaults to
+        :class:`~macpymessenger.commands.AsyncSubprocessCommandRunner`.
+    logger:
+        Logger instance used for emitting operational events. When omitted a module-scoped
+        logger is created and defaulted to ``INFO`` only if no handlers are configured.
+    file_logging:
+        Optional file logging destination, handled as in
+        :class:`~macpymessenger.client.IMessageClient`.
+    max_concurrency:
+        Maximum number of sends in flight at once.
+    rate_limiter:
+        Optional :class:`~macpymessenger.ratelimit.RateLimiter`. Sends wait for a slot
+        with :func:`asyncio.sleep`, so no thread is blocked.
+    retry_policy:
+        Optional :class:`~macpymessenger.retry.RetryPolicy`; backoffs are awaited.
+    circuit_breaker:
+        Optional :class:`~macpymessenger.retry.CircuitBreaker`, as in
+        :class:`~macpymessenger.client.IMessageClient`.
+    metrics:
+        Optional :class:`~macpymessenger.metrics.MetricsSink`, as in
+        :class:`~macpymessenger.client.IMessageClient`.
+    bulk_logging:
+        Optional :class:`~macpymessenger.bulklog.BulkLogPolicy` for :meth:`send_bulk`, as
+        in :class:`~macpymessenger.client.IMessageClient`. Outcomes are logged as sends
+        complete.
+    """
+
+    __slots__ = (
+        "_delivery",
+        "_logger",
+        "_semaphore",
+        "bulk_logging",
+        "circuit_breaker",
+        "command_runner",
+        "configuration",
+        "file_logging",
+        "max_concurrency",
+        "metrics",
+        "rate_limiter",
+        "retry_policy",
+        "template_manager",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        configuration: Configuration,
+        template_manager: TemplateManager | None = None,
+        command_runner: AsyncCommandRunner | None = None,
+        logger: logging.Logger | None = None,
+        file_logging: FileLoggingConfiguration | None = None,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        metrics: MetricsSink | None = None,
+        bulk_logging: BulkLogPolicy | None = None,
+    ) -> None:
+        if (
+            isinstance(max_concurrency, bool)
+            or not isinstance(max_concurrency, int)
+            or max_concurrency < 1
+        ):
+            raise InvalidConcurrencyError
+        self.configuration = configuration
+        self.template_manager = (
+            template_manager if template_manager is not None else TemplateManager()
+        )
+        self.command_runner = (
+            command_runner if command_runner is not None else AsyncSubprocessCommandRunner()
+        )
+        self.file_logging = file_logging
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.metrics = metrics
+        self.bulk_logging = bulk_logging
+        self.max_concurrency = max_concurrency
+        self._logger = _configure_logger(logger, file_logging, __name__)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._delivery = MessageDelivery(
+            configuration=self.configuration,
+            command_runner=None,
+            logger=self._logger,
+            async_command_runner=self.command_runner,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            circuit_breaker=self.circuit_breaker,
+            metrics=self.metrics,
+        )
+
+    @property
+    def logger(self) -> logging.Logger:
+        return self._logger
+
+    @overload
+    async def send(self, phone_number: str, message: str, delay_seconds: int = 0) -> None: ...
+
+    @overload
+    async def send(self, phone_number: str, message: str, delay_seconds: object = 0) -> None: ...
+
+    async def send(self, phone_number: str, message: str, delay_seconds: object = 0) -> None:
+        MessageDelivery._validate_delay(delay_seconds)
+        async with self._semaphore:
+            await self._delivery.deliver_async(phone_number, message, delay_seconds)
+
+    async def send_template(
+        self,
+        phone_number: str,
+        template_id: str,
+        context: Mapping[str, object] | None = None,
+        delay_seconds: int = 0,
+    ) -> None:
+        rendered_template = self.template_manager.compose_template(template_id, context)
+        await self.send(phone_number, rendered_template.content, delay_seconds)
+
+    async def send_bulk(
+        self,
+        phone_numbers: Sequence[str],
+        message: str,
+    ) -> BulkResult:
+        """Send *message* to every recipient concurrently and classify the results.
+
+        Returns
+        -------
+        BulkResult
+            Status, error kind and duration per recipient in input order, unpacking to
+            ``(successful, failed)`` as for :meth:`IMessageClient.send_bulk`.
+        """
+        bulk_logger = None
+        delivery = self._delivery
+        if self.bulk_logging is not None:
+            from .bulklog import BulkLogger  # noqa: PLC0415 - only for bulk_logging
+
+            bulk_logger = BulkLogger(self._logger, self.bulk_logging)
+            delivery = delivery.without_outcome_logging(on_retry=bulk_logger.count_retry)
+        try:
+            outcomes = await asyncio.gather(
+                *(
+                    self._send_outcome(delivery, number, message, bulk_logger)
+                    for number in phone_numbers
+                )
+            )
+        finally:
+            if bulk_logger is not None:
+                bulk_logger.finish()
+        return BulkResult.from_outcomes(outcomes, phone_numbers)
+
+    async def _send_outcome(
+        self,
+        delivery: MessageDelivery,
+        phone_number: str,
+        message: str,
+        bulk_logger: BulkLogger | None,
+    ) -> DeliveryOutcome:
+        started = time.perf_counter_ns()
+        try:
+            async with self._semaphore:
+                await delivery.deliver_async(phone_number, message)
+        except MessageSendError as error:
+            outcome = DeliveryOutcome(phone_number, error, _elapsed_us(started))
+        else:
+            outcome = DeliveryOutcome(phone_number, duration_us=_elapsed_us(started))
+        if bulk_logger is not None:
+            bulk_logger.observe(outcome)
+        return outcome
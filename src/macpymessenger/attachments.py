@@ -0,0 +1,494 @@
+"""Attachment validation and staging for macpymessenger.
+
+Messages only sends files it can read from its own sandbox, so attachments are
+staged into ``Configuration.attachment_staging_path`` before the send script
+runs. This module keeps both steps cheap for large files:
+
+- :func:`inspect_attachment` checks the size with ``stat`` and the type by
+  sniffing the first :data:`SNIFF_BYTES` bytes for a known signature, so a
+  video is never read into memory to be validated.
+- :func:`stage_attachment` hard-links the file into the staging directory,
+  falls back to a copy-on-write clone (``clonefile`` on macOS, ``FICLONE`` on
+  Linux), and only then copies it with :func:`shutil.copyfile`, which copies in
+  the kernel where it can and in chunks otherwise.
+
+:class:`AttachmentStore` stages each distinct file content once. Files are
+keyed by a SHA-256 digest computed in fixed-size chunks, so sending one flyer
+to many recipients, or in many campaigns, reuses one staged copy. Entries in
+use are reference counted; the rest are evicted least recently used first once
+the store exceeds its disk quota.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from .exceptions import AttachmentError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+__all__ = [
+    "DEFAULT_MAX_ATTACHMENT_BYTES",
+    "DEFAULT_STORE_QUOTA_BYTES",
+    "SNIFF_BYTES",
+    "STAGED_RETENTION_SECONDS",
+    "Attachment",
+    "AttachmentPolicy",
+    "AttachmentStore",
+    "file_digest",
+    "inspect_attachment",
+    "remove_staged_attachments",
+    "sniff_media_type",
+    "stage_attachment",
+]
+
+DEFAULT_MAX_ATTACHMENT_BYTES: Final = 100 * 1024 * 1024
+"""Largest attachment accepted by default, matching the iMessage limit."""
+
+SNIFF_BYTES: Final = 4096
+"""Bytes read from the start of a file to recognize its type."""
+
+DEFAULT_STORE_QUOTA_BYTES: Final = 1024 * 1024 * 1024
+"""Disk space an :class:`AttachmentStore` keeps before evicting unused entries."""
+
+STAGED_RETENTION_SECONDS: Final = 24 * 60 * 60
+"""Age after which a staged file is no longer read by Messages and may be deleted."""
+
+STAGING_SWEEP_INTERVAL_SECONDS: Final = 60 * 60
+"""Least time between two sweeps of the staging directory by one client."""
+
+_HASH_CHUNK_BYTES: Final = 1024 * 1024
+_DIGEST_CACHE_SIZE: Final = 1024
+
+_FTYP_BRANDS: Final = {
+    b"heic": "image/heic",
+    b"heix": "image/heic",
+    b"mif1": "image/heif",
+    b"qt  ": "video/quicktime",
+    b"M4A ": "audio/mp4",
+    b"M4V ": "video/mp4",
+    b"isom": "video/mp4",
+    b"iso2": "video/mp4",
+    b"mp41": "video/mp4",
+    b"mp42": "video/mp4",
+    b"3gp4": "video/3gpp",
+    b"3gp5": "video/3gpp",
+}
+"""ISO base media ``ftyp`` brands at byte 8, after the box size and ``ftyp``."""
+
+_PREFIXES: Final = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"ID3", "audio/mpeg"),
+    (b"\xff\xfb", "audio/mpeg"),
+    (b"#!AMR\n", "audio/amr"),
+    (b"BEGIN:VCARD", "text/vcard"),
+)
+
+DEFAULT_MEDIA_TYPES: Final = frozenset(
+    {
+        *_FTYP_BRANDS.values(),
+        *(media_type for _, media_type in _PREFIXES),
+        "audio/wav",
+        "image/webp",
+        "text/plain",
+    }
+)
+"""Media types accepted by the default :class:`AttachmentPolicy`."""
+
+
+@dataclass(frozen=True, slots=True)
+class AttachmentPolicy:
+    """Limits applied to attachments before they are staged."""
+
+    max_bytes: int = DEFAULT_MAX_ATTACHMENT_BYTES
+    allowed_media_types: frozenset[str] = DEFAULT_MEDIA_TYPES
+
+
+@dataclass(frozen=True, slots=True)
+class Attachment:
+    """A validated attachment."""
+
+    path: Path
+    size: int
+    media_type: str
+
+
+def sniff_media_type(header: bytes) -> str | None:
+    """Return the media type recognized from a file's first bytes, or ``None``."""
+    for prefix, media_type in _PREFIXES:
+        if header.startswith(prefix):
+            return media_type
+    if header[4:8] == b"ftyp":
+        return _FTYP_BRANDS.get(header[8:12])
+    if header[:4] == b"RIFF":
+        return {b"WEBP": "image/webp", b"WAVE": "audio/wav"}.get(header[8:12])
+    if b"\x00" not in header:
+        try:
+            header.decode("utf-8")
+        except UnicodeDecodeError as error:
+            if error.start < len(header) - 3:
+                return None
+        return "text/plain"
+    return None
+
+
+def inspect_attachment(path: str | Path, policy: AttachmentPolicy | None = None) -> Attachment:
+    """Validate *path* against *policy* without reading more than :data:`SNIFF_BYTES`.
+
+    Raises
+    ------
+    AttachmentError:
+        When *path* is not a readable regular file, is larger than ``max_bytes``, or
+        its type is not in ``allowed_media_types``.
+    """
+    policy = policy if policy is not None else AttachmentPolicy()
+    attachment_path = Path(path).expanduser()
+    try:
+        with attachment_path.open("rb") as handle:
+            status = os.fstat(handle.fileno())
+            if not stat.S_ISREG(status.st_mode):
+                raise AttachmentError.not_a_file(attachment_path)
+            if status.st_size > policy.max_bytes:
+                raise AttachmentError.too_large(attachment_path, status.st_size, policy.max_bytes)
+            header = handle.read(SNIFF_BYTES)
+    except OSError as error:
+        raise AttachmentError.not_a_file(attachment_path) from error
+    media_type = sniff_media_type(header)
+    if media_type not in policy.allowed_media_types:
+        raise AttachmentError.unsupported_type(attachment_path, media_type)
+    return Attachment(attachment_path, status.st_size, media_type)
+
+
+def stage_attachment(attachment: Attachment, staging_directory: str | Path) -> Path:
+    """Place *attachment* in *staging_directory* and return the staged path.
+
+    The file keeps its name inside a new unique subdirectory. It is hard-linked
+    when source and staging directory share a file system, cloned where the file
+    system supports it, and copied otherwise.
+
+    Raises
+    ------
+    AttachmentError:
+        When the staging directory cannot be created or the file cannot be copied.
+    """
+    target_directory = Path(staging_directory).expanduser() / uuid.uuid4().hex
+    target = target_directory / attachment.path.name
+    try:
+        target_directory.mkdir(parents=True)
+        if not _link(attachment.path, target):
+            _clone_or_copy(attachment.path, target)
+    except OSError as error:
+        shutil.rmtree(target_directory, ignore_errors=True)
+        raise AttachmentError.staging_failed(attachment.path, str(error)) from error
+    return target
+
+
+def remove_staged_attachments(staging_directory: str | Path, older_than_seconds: float) -> int:
+    """Delete staged attachments older than *older_than_seconds* and return how many.
+
+    Messages reads a staged file after the send script returns, so staged files are
+    kept until this is called. :class:`~macpymessenger.client.IMessageClient` calls
+    it with :data:`STAGED_RETENTION_SECONDS` before staging, at most once per
+    :data:`STAGING_SWEEP_INTERVAL_SECONDS`.
+    """
+    directory = Path(staging_directory).expanduser()
+    if not directory.is_dir():
+        return 0
+    cutoff = time.time() - older_than_seconds
+    removed = 0
+    for entry in directory.iterdir():
+        try:
+            stale = entry.is_dir() and entry.stat().st_mtime < cutoff
+        except OSError:
+            # Removed by a concurrent sweep.
+            continue
+        if stale:
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def file_digest(path: Path, chunk_size: int = _HASH_CHUNK_BYTES) -> str:
+    """Return the SHA-256 hex digest of *path*, read in chunks of *chunk_size* bytes."""
+    import hashlib  # noqa: PLC0415 - only needed by the attachment store
+
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with path.open("rb", buffering=0) as handle:
+        while count := handle.readinto(buffer):
+            digest.update(view[:count])
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class _StoreEntry:
+    path: Path
+    size: int
+    references: int = 0
+    last_used: float = 0.0
+
+
+class AttachmentStore:
+    """Content-addressed staging area shared by attachment sends.
+
+    Each distinct content is staged once as ``<directory>/<sha256>/<file name>``,
+    by copy-on-write clone or copy. Entries are not hard-linked, so editing the
+    original file later cannot change staged content under its digest. Digests of
+    unchanged files (same inode, size and modification time) are remembered, so a
+    file is hashed once per process.
+
+    Parameters
+    ----------
+    directory:
+        Staging directory Messages can read. Existing entries are indexed on creation,
+        least recently used first by modification time.
+    quota_bytes:
+        Total size of entries kept. Unreferenced entries beyond it are deleted, least
+        recently used first. Entries in use are never deleted, so the store can exceed
+        the quota while they are.
+    chunk_size:
+        Bytes read per step while hashing.
+    retention_seconds:
+        Time an entry is kept after its last use, even over the quota. Messages reads a
+        staged file after the send script returns, so a just-sent file must outlive
+        its lease.
+    clock:
+        Wall clock returning seconds, compared with entry modification times. Tests
+        substitute a fake clock.
+    """
+
+    __slots__ = (
+        "_digests",
+        "_entries",
+        "_lock",
+        "_size",
+        "chunk_size",
+        "clock",
+        "directory",
+        "quota_bytes",
+        "retention_seconds",
+    )
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        quota_bytes: int = DEFAULT_STORE_QUOTA_BYTES,
+        chunk_size: int = _HASH_CHUNK_BYTES,
+        retention_seconds: float = STAGED_RETENTION_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = Path(directory).expanduser()
+        self.quota_bytes = quota_bytes
+        self.chunk_size = chunk_size
+        self.retention_seconds = retention_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _StoreEntry] = OrderedDict()
+        self._digests: OrderedDict[tuple[int, int, int, int], str] = OrderedDict()
+        self._size = 0
+        self._index()
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the entries currently kept."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @contextmanager
+    def lease(self, attachment: Attachment) -> Iterator[Path]:
+        """Stage *attachment* if its content is new and yield the staged path.
+
+        The entry is referenced until the block exits and cannot be evicted meanwhile.
+
+        Raises
+        ------
+        AttachmentError:
+            When the file cannot be read or staged.
+        """
+        digest = self._digest(attachment.path)
+        path = self.acquire(attachment, digest)
+        try:
+            yield path
+        finally:
+            self.release(digest)
+
+    def acquire(self, attachment: Attachment, digest: str | None = None) -> Path:
+        """Reference the entry for *attachment*, staging it first if needed.
+
+        Pair every call with :meth:`release`, or use :meth:`lease`.
+
+        Raises
+        ------
+        AttachmentError:
+            When the file cannot be read or staged.
+        """
+        digest = digest if digest is not None else self._digest(attachment.path)
+        staged: _StoreEntry | None = None
+        while True:
+            with self._lock:
+                entry = self._entries.get(digest)
+                if entry is not None:
+                    self._entries.move_to_end(digest)
+                    entry.path.parent.touch()
+                elif staged is not None and staged.path.is_file():
+                    entry = staged
+                    self._entries[digest] = entry
+                    self._size += entry.size
+                if entry is not None:
+                    entry.references += 1
+                    entry.last_used = self.clock()
+                    self._evict()
+                    return entry.path
+            # Staging copies the whole file, so it runs without the lock; only
+            # publishing the entry above needs it.
+            staged = self._stage(attachment, digest)
+
+    def release(self, digest: str) -> None:
+        """Drop one reference taken by :meth:`acquire` for the content *digest*."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and entry.references > 0:
+                entry.references -= 1
+                entry.last_used = self.clock()
+            self._evict()
+
+    def _digest(self, path: Path) -> str:
+        try:
+            status = path.stat()
+            key = (status.st_dev, status.st_ino, status.st_size, status.st_mtime_ns)
+            with self._lock:
+                digest = self._digests.get(key)
+            if digest is None:
+                digest = file_digest(path, self.chunk_size)
+        except OSError as error:
+            raise AttachmentError.not_a_file(path) from error
+        with self._lock:
+            self._digests[key] = digest
+            self._digests.move_to_end(key)
+            if len(self._digests) > _DIGEST_CACHE_SIZE:
+                self._digests.popitem(last=False)
+        return digest
+
+    def _stage(self, attachment: Attachment, digest: str) -> _StoreEntry:
+        target_directory = self.directory / digest
+        target = target_directory / attachment.path.name
+        partial = self.directory / f".{digest}.{uuid.uuid4().hex}"
+        try:
+            partial.mkdir(parents=True)
+            _clone_or_copy(attachment.path, partial / attachment.path.name)
+            try:
+                partial.rename(target_directory)
+            except OSError:
+                # Staged by another thread or process, or left by an earlier run:
+                # the directory already holds this content.
+                existing = _staged_file(target_directory)
+                if existing is None:
+                    raise
+                shutil.rmtree(partial, ignore_errors=True)
+                target = existing
+            return _StoreEntry(target, target.stat().st_size)
+        except OSError as error:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise AttachmentError.staging_failed(attachment.path, str(error)) from error
+
+    def _evict(self) -> None:
+        # Entries used within the retention time may still be read by Messages.
+        used_before = self.clock() - self.retention_seconds
+        for digest in list(self._entries):
+            if self._size <= self.quota_bytes:
+                return
+            entry = self._entries[digest]
+            if entry.references == 0 and entry.last_used <= used_before:
+                del self._entries[digest]
+                self._size -= entry.size
+                shutil.rmtree(entry.path.parent, ignore_errors=True)
+
+    def _index(self) -> None:
+        if not self.directory.is_dir():
+            return
+        found: list[tuple[float, str, _StoreEntry]] = []
+        for entry_directory in self.directory.iterdir():
+            files = list(entry_directory.iterdir()) if entry_directory.is_dir() else []
+            if entry_directory.name.startswith(".") or len(files) != 1:
+                continue
+            status = files[0].stat()
+            used_at = entry_directory.stat().st_mtime
+            found.append(
+                (used_at, entry_directory.name, _StoreEntry(files[0], status.st_size, 0, used_at))
+            )
+        for _, digest, entry in sorted(found, key=lambda item: item[0]):
+            self._entries[digest] = entry
+            self._size += entry.size
+
+
+def _staged_file(entry_directory: Path) -> Path | None:
+    """Return the file in a store entry directory, or ``None`` if there is none."""
+    try:
+        return next((path for path in entry_directory.iterdir() if path.is_file()), None)
+    except OSError:
+        return None
+
+
+def _clone_or_copy(source: Path, target: Path) -> None:
+    if not _clone(source, target):
+        shutil.copyfile(source, target)
+
+
+def _link(source: Path, target: Path) -> bool:
+    try:
+        target.hardlink_to(source)
+    except OSError:
+        return False
+    return True
+
+
+@cache
+def _clonefile() -> Callable[[bytes, bytes, int], int] | None:
+    """Return macOS ``clonefile``, loading :mod:`ctypes` on first use only."""
+    if sys.platform != "darwin":
+        return None
+    import ctypes  # noqa: PLC0415 - slow to import and only needed on macOS
+
+    return ctypes.CDLL(None, use_errno=True).clonefile
+
+
+def _clone(source: Path, target: Path) -> bool:
+    clonefile = _clonefile()
+    if clonefile is not None:
+        return clonefile(os.fsencode(source), os.fsencode(target), 0) == 0
+    ficlone = getattr(fcntl, "FICLONE", None)
+    if ficlone is None:
+        return False
+    with source.open("rb") as source_file, target.open("wb") as target_file:
+        try:
+            fcntl.ioctl(target_file.fileno(), ficlone, source_file.fileno())
+        except OSError:
+            cloned = False
+        else:
+            cloned = True
+    if not cloned:
+        target.unlink()
+    return cloned
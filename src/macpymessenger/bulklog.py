@@ -0,0 +1,246 @@
+"""Bounded logging for bulk sends.
+
+By default every send logs its own record: ``Message sent to ...`` for each
+success and an error with a full traceback for each failure. With a
+:class:`BulkLogPolicy`, bulk sends log through a :class:`BulkLogger` instead:
+
+- one summary record per ``summary_every`` outcomes, with the counts, the send
+  rate and the p50 and p99 latency of that window, and a final summary;
+- one ``Message sent to ...`` line per ``success_sample_every`` successes;
+- a full traceback only for the first ``tracebacks_per_signature`` failures of
+  each :func:`error_signature`. Later failures with the same signature are
+  counted and reported once per window;
+- retried commands counted in the summaries instead of a warning per retry.
+
+Log volume is then one summary per window plus at most one record per sampled
+success and per distinct signature, and at most ``max_signatures`` signatures
+are tracked, however large the campaign.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
+
+from .exceptions import InvalidBulkLogPolicyError
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Iterable, Iterator
+
+    from .delivery import DeliveryOutcome
+
+__all__ = ["OTHER_SIGNATURE", "BulkLogPolicy", "BulkLogger", "error_signature"]
+
+OTHER_SIGNATURE: Final = "other"
+"""Signature counted for failures once ``max_signatures`` signatures are tracked."""
+
+# Batch script reasons quote the recipient, as in ``Can't get buddy id "+1555…"``.
+_QUOTED: Final = re.compile(r'"[^"]*"')
+
+
+@dataclass(frozen=True, slots=True)
+class BulkLogPolicy:
+    """How much a bulk send logs. See :mod:`macpymessenger.bulklog`."""
+
+    summary_every: int = 1000
+    """Outcomes per summary record."""
+    success_sample_every: int = 0
+    """Log one success line per this many successes; ``0`` logs none."""
+    tracebacks_per_signature: int = 1
+    """Failures logged with a traceback for each error signature."""
+    max_signatures: int = 100
+    """Distinct error signatures tracked; further ones are counted as ``"other"``."""
+
+    def __post_init__(self) -> None:
+        if (
+            self.summary_every < 1
+            or self.success_sample_every < 0
+            or self.tracebacks_per_signature < 0
+            or self.max_signatures < 1
+        ):
+            raise InvalidBulkLogPolicyError
+
+
+def error_signature(error: BaseException) -> str:
+    """Return what identifies the failure mode of *error*.
+
+    The signature names each exception along the ``__cause__`` chain with its exit
+    status or ``errno``, the first note of each with quoted text replaced by
+    ``"..."``, and the line that raised the innermost exception, for example
+    ``MessageSendError <- CalledProcessError(exit 1) at commands.py:57``.
+    Recipient handles are not part of it.
+    """
+    parts: list[str] = []
+    current: BaseException | None = error
+    innermost = error
+    while current is not None:
+        part = type(current).__name__
+        returncode = getattr(current, "returncode", None)
+        if returncode is not None:
+            part += f"(exit {returncode})"
+        elif isinstance(current, OSError) and current.errno is not None:
+            part += f"(errno {current.errno})"
+        notes = getattr(current, "__notes__", None)
+        if notes:
+            part += f" [{_QUOTED.sub('"..."', notes[0])}]"
+        parts.append(part)
+        innermost = current
+        current = current.__cause__
+    signature = " <- ".join(parts)
+    traceback = innermost.__traceback__
+    if traceback is None:
+        return signature
+    while traceback.tb_next is not None:
+        traceback = traceback.tb_next
+    filename = traceback.tb_frame.f_code.co_filename.rpartition("/")[2]
+    return f"{signature} at {filename}:{traceback.tb_lineno}"
+
+
+def _percentile_ms(sorted_durations_us: list[int], fraction: float) -> float:
+    index = round(fraction * (len(sorted_durations_us) - 1))
+    return sorted_durations_us[index] / 1000
+
+
+class BulkLogger:
+    """Logs the outcomes of one bulk send according to a :class:`BulkLogPolicy`.
+
+    Parameters
+    ----------
+    logger:
+        Logger that receives the records.
+    policy:
+        Summary interval, success sampling and traceback limits.
+    """
+
+    __slots__ = (
+        "_failed",
+        "_logger",
+        "_policy",
+        "_retries",
+        "_retries_lock",
+        "_signatures",
+        "_started",
+        "_succeeded",
+        "_suppressed",
+        "_window_durations_us",
+        "_window_failed",
+        "_window_retries",
+        "_window_started",
+    )
+
+    def __init__(self, logger: logging.Logger, policy: BulkLogPolicy) -> None:
+        self._logger = logger
+        self._policy = policy
+        self._succeeded = 0
+        self._failed = 0
+        self._signatures: dict[str, int] = {}
+        self._suppressed: dict[str, int] = {}
+        self._window_durations_us: list[int] = []
+        self._window_failed = 0
+        self._retries = self._window_retries = 0
+        self._retries_lock = threading.Lock()
+        self._started = self._window_started = time.monotonic()
+
+    def track(self, outcomes: Iterable[DeliveryOutcome]) -> Iterator[DeliveryOutcome]:
+        """Yield *outcomes* unchanged, logging each, and log the final summary at the end."""
+        try:
+            for outcome in outcomes:
+                self.observe(outcome)
+                yield outcome
+        finally:
+            self.finish()
+
+    def observe(self, outcome: DeliveryOutcome) -> None:
+        """Count *outcome* and log it if the policy samples it."""
+        error = outcome.error
+        if error is None:
+            self._succeeded += 1
+            every = self._policy.success_sample_every
+            if every and self._succeeded % every == 0:
+                self._logger.info("Message sent to %s", outcome.recipient_handle)
+        else:
+            self._failed += 1
+            self._window_failed += 1
+            self._log_failure(outcome.recipient_handle, error)
+        self._window_durations_us.append(outcome.duration_us)
+        if len(self._window_durations_us) >= self._policy.summary_every:
+            self._summarize()
+
+    def count_retry(self, count: int = 1) -> None:
+        """Count *count* retried commands. Safe to call from the threads running the sends.
+
+        Pass this as ``on_retry`` to
+        :meth:`~macpymessenger.delivery.MessageDelivery.without_outcome_logging`.
+        """
+        with self._retries_lock:
+            self._window_retries += count
+
+    def finish(self) -> None:
+        """Log the last window and a summary of the whole send."""
+        if self._window_durations_us:
+            self._summarize()
+        with self._retries_lock:
+            self._retries += self._window_retries
+            self._window_retries = 0
+        elapsed = time.monotonic() - self._started
+        total = self._succeeded + self._failed
+        self._logger.info(
+            "Bulk send finished: %d sent, %d failed of %d in %.1f s (%.1f/s), %d retries",
+            self._succeeded,
+            self._failed,
+            total,
+            elapsed,
+            total / elapsed if elapsed > 0 else 0.0,
+            self._retries,
+        )
+
+    def _log_failure(self, recipient_handle: str, error: BaseException) -> None:
+        signature = error_signature(error)
+        signatures = self._signatures
+        if signature not in signatures and len(signatures) >= self._policy.max_signatures:
+            signature = OTHER_SIGNATURE
+        seen = signatures.get(signature, 0) + 1
+        signatures[signature] = seen
+        if seen <= self._policy.tracebacks_per_signature:
+            self._logger.error(
+                "Failed to send message to %s (%s)", recipient_handle, signature, exc_info=error
+            )
+        else:
+            self._suppressed[signature] = self._suppressed.get(signature, 0) + 1
+
+    def _summarize(self) -> None:
+        durations = sorted(self._window_durations_us)
+        now = time.monotonic()
+        elapsed = now - self._window_started
+        with self._retries_lock:
+            retries = self._window_retries
+            self._retries += retries
+            self._window_retries = 0
+        self._logger.info(
+            "Bulk send progress: %d sent, %d failed of %d (%.1f/s), %d retries, "
+            "latency p50 %.1f ms, p99 %.1f ms; %d sent, %d failed so far",
+            len(durations) - self._window_failed,
+            self._window_failed,
+            len(durations),
+            len(durations) / elapsed if elapsed > 0 else 0.0,
+            retries,
+            _percentile_ms(durations, 0.5),
+            _percentile_ms(durations, 0.99),
+            self._succeeded,
+            self._failed,
+        )
+        for signature, count in self._suppressed.items():
+            self._logger.warning(
+                "%d more failures without traceback: %s (%d in total)",
+                count,
+                signature,
+                self._signatures[signature],
+            )
+        self._suppressed.clear()
+        self._window_durations_us.clear()
+        self._window_failed = 0
+        self._window_started = now
@@ -3,43 +3,140 @@
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Callable, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
-from importlib import import_module
-from pathlib import Path
-from typing import TYPE_CHECKING, overload
+from itertools import repeat
+from typing import TYPE_CHECKING, Final, overload
 
-from .commands import CommandRunner, SubprocessCommandRunner
-from .delivery import MessageDelivery
+from .commands import CommandRunner, OutputCommandRunner, SubprocessCommandRunner
+from .delivery import DeliveryOutcome, MessageDelivery, _elapsed_us
 from .exceptions import (
     ConfigurationError,
+    ConflictingBulkOptionsError,
+    InvalidConcurrencyError,
     MessageSendError,
 )
+from .results import BulkResult
 from .templates import TemplateManager
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Mapping, Sequence
+    from collections.abc import Iterable, Iterator, Mapping
+    from pathlib import Path
     from string.templatelib import Template
 
+    from .attachments import AttachmentPolicy, AttachmentStore
+    from .bulklog import BulkLogger, BulkLogPolicy
     from .configuration import Configuration
-else:
-    Template = import_module("string.templatelib").Template
-    Configuration = import_module("macpymessenger.configuration").Configuration
+    from .history import ChatHistoryReader, ChatMessage
+    from .metrics import MetricsSink
+    from .outbox import DrainReport, Outbox
+    from .ratelimit import RateLimiter
+    from .retry import CircuitBreaker, RetryPolicy
+    from .scheduling import DeliveryScheduler, ScheduledSend
+
+
+_ROTATION_INTERVALS: Final = frozenset(
+    {"S", "M", "H", "D", "MIDNIGHT", *(f"W{day}" for day in range(7))}
+)
+"""Values of ``when`` accepted by :class:`logging.handlers.TimedRotatingFileHandler`."""
 
 
 @dataclass(frozen=True, slots=True)
 class FileLoggingConfiguration:
-    """File logging destination for client operational events."""
+    """File logging destination for client operational events.
+
+    By default each record is written and flushed on the thread that logs it. With
+    ``asynchronous`` the client logs through a
+    :class:`~macpymessenger.logfiles.QueuedFileHandler`: the sending thread only
+    queues the record and a background thread writes it. Set ``max_bytes`` or
+    ``when`` to rotate the file instead of letting it grow.
+
+    Raises
+    ------
+    ConfigurationError
+        If both ``max_bytes`` and ``when`` are set, a count is negative, or
+        ``when`` is not a rotation interval.
+    """
 
     path: str | Path | None = None
+    asynchronous: bool = False
+    """Write records on a background thread instead of the logging thread."""
+    max_bytes: int = 0
+    """Rotate before the file grows past this many bytes; ``0`` disables size rotation."""
+    when: str | None = None
+    """Rotate on a schedule, as ``when`` of :class:`logging.handlers.TimedRotatingFileHandler`.
+
+    One of ``"S"``, ``"M"``, ``"H"``, ``"D"``, ``"midnight"`` or ``"W0"`` to ``"W6"``.
+    """
+    backup_count: int = 5
+    """Rotated files to keep."""
+    compress: bool = False
+    """Gzip rotated files on a background thread."""
+
+    def __post_init__(self) -> None:
+        if self.max_bytes < 0 or self.backup_count < 0:
+            reason = "max_bytes and backup_count must not be negative"
+            raise ConfigurationError.invalid_log_rotation(reason)
+        if self.max_bytes and self.when is not None:
+            reason = "rotate by size or by time, not both"
+            raise ConfigurationError.invalid_log_rotation(reason)
+        if self.when is not None and self.when.upper() not in _ROTATION_INTERVALS:
+            reason = f"unknown interval {self.when!r}"
+            raise ConfigurationError.invalid_log_rotation(reason)
 
 
 __all__ = [
+    "BulkProgressCallback",
     "CommandRunner",
     "FileLoggingConfiguration",
     "IMessageClient",
     "SubprocessCommandRunner",
 ]
 
+_CONCURRENT_SEND_BUFFER_FACTOR: Final = 4
+"""Sends queued per worker thread ahead of the result being consumed."""
+
+BulkProgressCallback = Callable[[int, int], object]
+"""Progress hook for :meth:`IMessageClient.send_bulk_iter`, called with ``(succeeded, failed)``."""
+
+
+def _configure_logger(
+    logger: logging.Logger | None,
+    file_logging: FileLoggingConfiguration | None,
+    default_logger_name: str,
+) -> logging.Logger:
+    """Resolve the client logger and attach opt-in file logging.
+
+    When *logger* is omitted, the logger named *default_logger_name* is used and
+    defaulted to ``INFO`` only if no handlers or level are configured.
+    """
+    if logger is None:
+        created_default_logger = True
+        logger_instance = logging.getLogger(default_logger_name)
+    else:
+        created_default_logger = False
+        logger_instance = logger
+
+    if (
+        created_default_logger
+        and not logger_instance.handlers
+        and logger_instance.level == logging.NOTSET
+    ):
+        logger_instance.setLevel(logging.INFO)
+
+    if file_logging is not None:
+        from .logfiles import (  # noqa: PLC0415 - imports logging.handlers
+            has_file_handler,
+            open_file_handler,
+        )
+
+        if not has_file_handler(logger_instance):
+            logger_instance.addHandler(open_file_handler(file_logging))
+
+    return logger_instance
+
 
 class IMessageClient:
     """A client for sending messages via iMessage on macOS.
@@ -52,31 +149,81 @@ class IMessageClient:
         Template storage and rendering backend used for templated messages.
     command_runner:
         Callable responsible for executing the generated AppleScript command.
+    output_command_runner:
+        Callable that executes batch send commands and returns their stdout. Only used by
+        :meth:`send_bulk` when ``batch_size`` is given.
     logger:
         Logger instance used for emitting operational events. When omitted a module-scoped
         logger is created and defaulted to ``INFO`` only if no handlers are configured.
     file_logging:
-        Optional file logging destination. When provided, a :class:`logging.FileHandler` is
-        attached if one is not already configured. When the path is omitted, the handler writes
-        to ``macpymessenger.log`` in the current working directory.
+        Optional file logging destination. When provided, a file handler is attached if one
+        is not already configured. When the path is omitted, the handler writes to
+        ``macpymessenger.log`` in the current working directory. See
+        :class:`FileLoggingConfiguration` for asynchronous writes and rotation.
+    rate_limiter:
+        Optional :class:`~macpymessenger.ratelimit.RateLimiter` that every send waits on
+        before its command runs.
+    retry_policy:
+        Optional :class:`~macpymessenger.retry.RetryPolicy` applied to every failed send
+        command, including batch invocations.
+    circuit_breaker:
+        Optional :class:`~macpymessenger.retry.CircuitBreaker`. While it is open, sends fail
+        with :class:`~macpymessenger.exceptions.CircuitOpenError` without running a command,
+        and :meth:`send_bulk` reports those recipients as failed.
+    attachment_policy:
+        Size and type limits checked by :meth:`send_with_attachment` and
+        :meth:`send_attachment_bulk`. ``None`` uses the defaults of
+        :class:`~macpymessenger.attachments.AttachmentPolicy`.
+    attachment_store:
+        Optional :class:`~macpymessenger.attachments.AttachmentStore`. When set, files are
+        staged once per distinct content and reused across sends instead of being staged
+        into ``configuration.attachment_staging_path`` for every call.
+    metrics:
+        Optional :class:`~macpymessenger.metrics.MetricsSink`, such as
+        :class:`~macpymessenger.metrics.DeliveryMetrics`, that receives stage latencies,
+        per-recipient results and the in-flight count for every send.
+    bulk_logging:
+        Optional :class:`~macpymessenger.bulklog.BulkLogPolicy`. When set, bulk sends log
+        periodic summaries, sampled successes and deduplicated failure tracebacks instead
+        of one record per recipient. :meth:`send` is unaffected.
     """
 
     __slots__ = (
         "_delivery",
+        "_history",
         "_logger",
+        "_scheduler",
+        "_staging_swept_at",
+        "attachment_policy",
+        "attachment_store",
+        "bulk_logging",
+        "circuit_breaker",
         "command_runner",
         "configuration",
         "file_logging",
+        "metrics",
+        "output_command_runner",
+        "rate_limiter",
+        "retry_policy",
         "template_manager",
     )
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         configuration: Configuration,
         template_manager: TemplateManager | None = None,
         command_runner: CommandRunner | None = None,
         logger: logging.Logger | None = None,
         file_logging: FileLoggingConfiguration | None = None,
+        *,
+        output_command_runner: OutputCommandRunner | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        attachment_policy: AttachmentPolicy | None = None,
+        attachment_store: AttachmentStore | None = None,
+        metrics: MetricsSink | None = None,
+        bulk_logging: BulkLogPolicy | None = None,
     ) -> None:
         self.configuration = configuration
         self.template_manager = (
@@ -85,48 +232,31 @@ class IMessageClient:
         self.command_runner = (
             command_runner if command_runner is not None else SubprocessCommandRunner()
         )
+        self.output_command_runner = output_command_runner
         self.file_logging = file_logging
-
-        if logger is None:
-            created_default_logger = True
-            logger_instance = logging.getLogger(__name__)
-        else:
-            created_default_logger = False
-            logger_instance = logger
-
-        if (
-            created_default_logger
-            and not logger_instance.handlers
-            and logger_instance.level == logging.NOTSET
-        ):
-            logger_instance.setLevel(logging.INFO)
-
-        has_file_handler = any(
-            isinstance(handler, logging.FileHandler) for handler in logger_instance.handlers
-        )
-        if self.file_logging is not None and not has_file_handler:
-            log_file_path_obj = (
-                Path(self.file_logging.path)
-                if self.file_logging.path is not None
-                else Path.cwd() / "macpymessenger.log"
-            )
-            try:
-                file_handler = logging.FileHandler(log_file_path_obj, encoding="utf-8")
-            except OSError as error:
-                error_message = error.strerror or str(error)
-                raise ConfigurationError.file_logging_unavailable(
-                    log_file_path_obj, error_message
-                ) from error
-            formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-            file_handler.setFormatter(formatter)
-            logger_instance.addHandler(file_handler)
-
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.attachment_policy = attachment_policy
+        self.attachment_store = attachment_store
+        self.metrics = metrics
+        self.bulk_logging = bulk_logging
+
+        logger_instance = _configure_logger(logger, file_logging, __name__)
         self._logger = logger_instance
         self._delivery = MessageDelivery(
             configuration=self.configuration,
             command_runner=self.command_runner,
             logger=self._logger,
+            output_command_runner=self.output_command_runner,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            circuit_breaker=self.circuit_breaker,
+            metrics=self.metrics,
         )
+        self._scheduler: DeliveryScheduler | None = None
+        self._history: ChatHistoryReader | None = None
+        self._staging_swept_at: float | None = None
 
     @property
     def logger(self) -> logging.Logger:
@@ -141,6 +271,65 @@ class IMessageClient:
     def send(self, phone_number: str, message: str, delay_seconds: object = 0) -> None:
         self._delivery.deliver(phone_number, message, delay_seconds)
 
+    def schedule(
+        self,
+        phone_number: str,
+        message: str,
+        delay_seconds: int,
+    ) -> ScheduledSend:
+        """Send *message* after *delay_seconds* without holding a process while waiting.
+
+        The send is queued on an in-process :class:`~macpymessenger.scheduling.DeliveryScheduler`
+        and the command runner starts only once it is due. Use the returned handle to cancel
+        the send, query the time remaining, or wait for the result. Call :meth:`close` to stop
+        the scheduler.
+
+        Raises
+        ------
+        InvalidDelayTypeError:
+            When ``delay_seconds`` is not a plain ``int``.
+        NegativeDelayError:
+            When ``delay_seconds`` is negative.
+        """
+        if self._scheduler is None:
+            from .scheduling import DeliveryScheduler  # noqa: PLC0415 - imports concurrent.futures
+
+            self._scheduler = DeliveryScheduler(self._delivery)
+            self._scheduler.start()
+        return self._scheduler.schedule(phone_number, message, delay_seconds)
+
+    def close(self, *, cancel_pending: bool = True) -> None:
+        """Stop the scheduler used by :meth:`schedule` and close the chat history reader.
+
+        Records queued for asynchronous file logging are written before it returns.
+
+        With ``cancel_pending`` queued sends are cancelled; otherwise the call waits until
+        they have been sent.
+        """
+        scheduler = self._scheduler
+        self._scheduler = None
+        if scheduler is not None:
+            scheduler.shutdown(cancel_pending=cancel_pending)
+        history = self._history
+        self._history = None
+        if history is not None:
+            history.close()
+        if self.file_logging is not None and self.file_logging.asynchronous:
+            from .logfiles import QueuedFileHandler  # noqa: PLC0415 - imports logging.handlers
+
+            for handler in self._logger.handlers:
+                if isinstance(handler, QueuedFileHandler):
+                    handler.flush()
+
+    def drain_outbox(self, outbox: Outbox, *, batch_size: int = 100) -> DrainReport:
+        """Send every claimable message in *outbox* with this client's delivery and templates.
+
+        See :meth:`~macpymessenger.outbox.Outbox.drain` for the delivery guarantees.
+        """
+        return outbox.drain(
+            self._delivery, template_manager=self.template_manager, batch_size=batch_size
+        )
+
     def send_template(
         self,
         phone_number: str,
@@ -164,81 +353,311 @@ class IMessageClient:
     def delete_template(self, template_id: str) -> None:
         self.template_manager.delete_template(template_id)
 
-    def send_bulk(self, phone_numbers: Sequence[str], message: str) -> tuple[list[str], list[str]]:
-        successful: list[str] = []
-        failed: list[str] = []
-        for number in phone_numbers:
-            try:
-                self.send(number, message)
-                successful.append(number)
-            except MessageSendError:
-                failed.append(number)
-        return successful, failed
-
-    def get_chat_history(self, phone_number: str, limit: int = 10) -> list[Mapping[str, object]]:
-        """Experimental: Chat history retrieval is not yet implemented.
+    def send_bulk(
+        self,
+        phone_numbers: Iterable[str],
+        message: str,
+        *,
+        batch_size: int | None = None,
+        max_workers: int | None = None,
+    ) -> BulkResult:
+        """Send *message* to every recipient and classify the results.
 
         Parameters
         ----------
-        phone_number:
-            The E.164-formatted phone number or iMessage handle whose history would be fetched.
-        limit:
-            Maximum number of messages to return once the feature ships. Values must be
-            positive and are expected to cap the page size. The default of ``10`` is a
-            placeholder until the implementation is available.
+        phone_numbers:
+            Recipient handles, sent in order.
+        message:
+            Message body sent to every recipient.
+        batch_size:
+            When given, recipients are sent in chunks of at most this many through the
+            batch send script, one ``osascript`` invocation per chunk. By default each
+            recipient is sent with :meth:`send`.
+        max_workers:
+            When given, sends run concurrently on a pool of at most this many threads.
+            Results keep input order; log records are emitted as sends complete. Cannot
+            be combined with ``batch_size``.
 
         Returns
         -------
-        List[Mapping[str, object]]
-            This method will eventually return structured message payloads ordered from most
-            recent to oldest. The exact schema is intentionally unspecified while the feature
-            is experimental.
+        BulkResult
+            Status, error kind and duration per recipient in input order. It unpacks to
+            ``(successful, failed)`` views of recipient handles, which compare equal to
+            lists. When *phone_numbers* is a sequence the result refers to it rather
+            than copying it.
 
         Raises
         ------
-        NotImplementedError
-            Always raised. The message includes the ``"Experimental"`` prefix to signal that
-            the public API exists but is not yet functional.
-
-        Notes
-        -----
-        Expected availability: TBD. Tracking work is scoped for a future minor release.
-        Until then, callers must not rely on this method.
+        ConflictingBulkOptionsError:
+            When both ``batch_size`` and ``max_workers`` are given.
+        InvalidConcurrencyError:
+            When ``max_workers`` is not a positive ``int``.
         """
+        outcomes = self.send_bulk_iter(
+            phone_numbers, message, batch_size=batch_size, max_workers=max_workers
+        )
+        recipients = phone_numbers if isinstance(phone_numbers, Sequence) else None
+        return BulkResult.from_outcomes(outcomes, recipients)
 
-        message = "Experimental: Chat history retrieval is not yet implemented."
-        raise NotImplementedError(message)
+    def send_bulk_iter(
+        self,
+        phone_numbers: Iterable[str],
+        message: str,
+        *,
+        batch_size: int | None = None,
+        max_workers: int | None = None,
+        progress: BulkProgressCallback | None = None,
+    ) -> Iterator[DeliveryOutcome]:
+        """Send *message* to every recipient and yield a :class:`DeliveryOutcome` per send.
+
+        Unlike :meth:`send_bulk`, recipients are read from *phone_numbers* only as sends
+        need them and no results are collected, so memory stays flat for any campaign
+        size; *phone_numbers* may be a generator reading from disk. Sends happen while
+        the returned iterator is consumed. Outcomes are yielded in input order as soon
+        as each send (or each batch chunk) finishes.
+
+        Parameters
+        ----------
+        phone_numbers:
+            Recipient handles, sent in order.
+        message:
+            Message body sent to every recipient.
+        batch_size:
+            As in :meth:`send_bulk`.
+        max_workers:
+            As in :meth:`send_bulk`.
+        progress:
+            Optional callback called with the running counts of successful and failed
+            sends before each outcome is yielded.
+
+        Raises
+        ------
+        ConflictingBulkOptionsError:
+            When both ``batch_size`` and ``max_workers`` are given.
+        InvalidConcurrencyError:
+            When ``max_workers`` is not a positive ``int``.
+        InvalidBatchSizeError:
+            When ``batch_size`` is not a positive ``int``.
+        """
+        if batch_size is not None and max_workers is not None:
+            raise ConflictingBulkOptionsError.batch_and_workers()
+        if max_workers is not None and (
+            isinstance(max_workers, bool) or not isinstance(max_workers, int) or max_workers < 1
+        ):
+            raise InvalidConcurrencyError
+        delivery, bulk_logger = self._bulk_delivery()
+        if batch_size is not None:
+            outcomes = delivery.deliver_batch_iter(
+                ((number, message) for number in phone_numbers), chunk_size=batch_size
+            )
+        elif max_workers is not None:
+            outcomes = self._send_concurrently(delivery, phone_numbers, message, max_workers)
+        else:
+            outcomes = (self._send_outcome(delivery, number, message) for number in phone_numbers)
+        if bulk_logger is not None:
+            outcomes = bulk_logger.track(outcomes)
+        if progress is None:
+            return outcomes
+        return self._report_progress(outcomes, progress)
+
+    def _bulk_delivery(self) -> tuple[MessageDelivery, BulkLogger | None]:
+        """Return the delivery and, with :attr:`bulk_logging`, the logger for one bulk send."""
+        if self.bulk_logging is None:
+            return self._delivery, None
+        from .bulklog import BulkLogger  # noqa: PLC0415 - only for bulk_logging
+
+        bulk_logger = BulkLogger(self._logger, self.bulk_logging)
+        return self._delivery.without_outcome_logging(on_retry=bulk_logger.count_retry), bulk_logger
+
+    @staticmethod
+    def _report_progress(
+        outcomes: Iterable[DeliveryOutcome], progress: BulkProgressCallback
+    ) -> Iterator[DeliveryOutcome]:
+        succeeded = failed = 0
+        for outcome in outcomes:
+            if outcome.succeeded:
+                succeeded += 1
+            else:
+                failed += 1
+            progress(succeeded, failed)
+            yield outcome
+
+    @staticmethod
+    def _send_outcome(
+        delivery: MessageDelivery, phone_number: str, message: str
+    ) -> DeliveryOutcome:
+        started = time.perf_counter_ns()
+        try:
+            delivery.deliver(phone_number, message)
+        except MessageSendError as error:
+            return DeliveryOutcome(phone_number, error, _elapsed_us(started))
+        return DeliveryOutcome(phone_number, duration_us=_elapsed_us(started))
+
+    def _send_concurrently(
+        self,
+        delivery: MessageDelivery,
+        phone_numbers: Iterable[str],
+        message: str,
+        max_workers: int,
+    ) -> Iterator[DeliveryOutcome]:
+        """Yield send outcomes in input order while a thread pool runs the sends."""
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415 - only for max_workers
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="macpymessenger-send"
+        ) as executor:
+            yield from executor.map(
+                self._send_outcome,
+                repeat(delivery),
+                phone_numbers,
+                repeat(message),
+                buffersize=max_workers * _CONCURRENT_SEND_BUFFER_FACTOR,
+            )
+
+    def get_chat_history(
+        self, phone_number: str, limit: int = 10, *, before: int | None = None
+    ) -> list[ChatMessage]:
+        """Return up to *limit* messages exchanged with *phone_number*, newest first.
+
+        Messages are read from ``configuration.chat_database_path`` through a read-only
+        :class:`~macpymessenger.history.ChatHistoryReader` that the client opens on first
+        use and :meth:`close` closes.
+
+        Parameters
+        ----------
+        phone_number:
+            The E.164-formatted phone number or iMessage handle whose history is fetched.
+        limit:
+            Maximum number of messages to return.
+        before:
+            ``rowid`` of the last message of the previous page, to fetch the next, older page.
 
-    def send_with_attachment(self, phone_number: str, message: str, attachment_path: str) -> bool:
-        """Experimental: Sending messages with attachments is not yet implemented.
+        Raises
+        ------
+        ChatHistoryError:
+            When *limit* is not a positive ``int``, or the database cannot be read, for
+            example because the process lacks Full Disk Access.
+        """
+        if self._history is None:
+            from .history import ChatHistoryReader  # noqa: PLC0415 - imports sqlite3
+
+            self._history = ChatHistoryReader(self.configuration.chat_database_path)
+        return self._history.messages(phone_number, limit=limit, before=before)
+
+    def send_with_attachment(self, phone_number: str, message: str, attachment_path: str) -> None:
+        """Send the file at *attachment_path* to *phone_number*, preceded by *message*.
+
+        The file is checked against :attr:`attachment_policy` by size and by sniffing its
+        first bytes, then staged into ``configuration.attachment_staging_path`` without
+        copying where possible, or reused from :attr:`attachment_store`. See
+        :mod:`macpymessenger.attachments`.
+
+        Without a store, every call stages the file into a new subdirectory that is
+        kept after the send, because Messages reads it later. Before staging, the
+        client deletes subdirectories older than
+        :data:`~macpymessenger.attachments.STAGED_RETENTION_SECONDS` (one day), at most
+        once an hour; call :func:`~macpymessenger.attachments.remove_staged_attachments`
+        to clean up sooner.
 
         Parameters
         ----------
         phone_number:
-            Intended recipient handle in E.164 or email format.
+            Recipient handle in E.164 or email format.
         message:
-            Text body that would accompany the attachment when support lands.
+            Text sent before the attachment. An empty string sends the file alone.
         attachment_path:
-            Absolute path to a file on disk. Future implementations will validate MIME type,
-            existence, and maximum payload size before sending.
+            Path to a file on disk.
+
+        Raises
+        ------
+        AttachmentError:
+            When the file fails validation or cannot be staged.
+        MessageSendError:
+            When delivery or command execution fails.
+        """
+        with self._staged(attachment_path) as staged_path:
+            self._delivery.deliver_attachment(phone_number, staged_path, message)
+
+    def send_attachment_bulk(
+        self,
+        phone_numbers: Iterable[str],
+        attachment_path: str,
+        message: str = "",
+    ) -> BulkResult:
+        """Send the file at *attachment_path* to every recipient.
+
+        The file is validated and staged once for all recipients. With an
+        :attr:`attachment_store`, the staged entry stays referenced, and so cannot be
+        evicted, until the last recipient has been sent to.
 
         Returns
         -------
-        bool
-            Planned to indicate whether the attachment send succeeded. The concrete semantics
-            will be finalised alongside the implementation.
+        BulkResult
+            Status, error kind and duration per recipient in input order, as for
+            :meth:`send_bulk`.
 
         Raises
         ------
-        NotImplementedError
-            Always raised with an ``"Experimental"`` prefixed message, ensuring callers are
-            aware that attachment delivery is not currently supported.
-
-        Notes
-        -----
-        Expected availability: TBD. The method is defined to stabilise the public API surface
-        but must not be invoked in production workflows yet.
+        AttachmentError:
+            When the file fails validation or cannot be staged. Nothing is sent.
         """
+        recipients = phone_numbers if isinstance(phone_numbers, Sequence) else None
+        with self._staged(attachment_path) as staged_path:
+            delivery, bulk_logger = self._bulk_delivery()
+            outcomes: Iterator[DeliveryOutcome] = (
+                self._attachment_outcome(delivery, number, staged_path, message)
+                for number in phone_numbers
+            )
+            if bulk_logger is not None:
+                outcomes = bulk_logger.track(outcomes)
+            return BulkResult.from_outcomes(outcomes, recipients)
+
+    @contextmanager
+    def _staged(self, attachment_path: str) -> Iterator[Path]:
+        from .attachments import (  # noqa: PLC0415 - imports shutil and uuid
+            inspect_attachment,
+            stage_attachment,
+        )
+
+        attachment = inspect_attachment(attachment_path, self.attachment_policy)
+        if self.attachment_store is None:
+            self._sweep_staging()
+            yield stage_attachment(attachment, self.configuration.attachment_staging_path)
+            return
+        with self.attachment_store.lease(attachment) as staged_path:
+            yield staged_path
+
+    def _sweep_staging(self) -> None:
+        """Delete stale staged attachments, at most once per sweep interval."""
+        from .attachments import (  # noqa: PLC0415 - imports shutil and uuid
+            STAGED_RETENTION_SECONDS,
+            STAGING_SWEEP_INTERVAL_SECONDS,
+            remove_staged_attachments,
+        )
+
+        now = time.monotonic()
+        swept_at = self._staging_swept_at
+        if swept_at is not None and now - swept_at < STAGING_SWEEP_INTERVAL_SECONDS:
+            return
+        self._staging_swept_at = now
+        try:
+            remove_staged_attachments(
+                self.configuration.attachment_staging_path, STAGED_RETENTION_SECONDS
+            )
+        except OSError:
+            self._logger.warning(
+                "Could not remove stale staged attachments from %s",
+                self.configuration.attachment_staging_path,
+                exc_info=True,
+            )
 
-        message = "Experimental: Sending messages with attachments is not yet implemented."
-        raise NotImplementedError(message)
+    @staticmethod
+    def _attachment_outcome(
+        delivery: MessageDelivery, phone_number: str, staged_path: Path, message: str
+    ) -> DeliveryOutcome:
+        started = time.perf_counter_ns()
+        try:
+            delivery.deliver_attachment(phone_number, staged_path, message)
+        except MessageSendError as error:
+            return DeliveryOutcome(phone_number, error, _elapsed_us(started))
+        return DeliveryOutcome(phone_number, duration_us=_elapsed_us(started))
@@ -1,8 +1,10 @@
 """Command execution for the messaging client.
 
 This module defines the :class:`CommandRunner` protocol and the
-subprocess-backed :class:`SubprocessCommandRunner` adapter. Tests replace the
-runner with a stub so no real AppleScript runs.
+subprocess-backed :class:`SubprocessCommandRunner` adapter, plus the
+:class:`OutputCommandRunner` variant used when a command reports results on
+stdout and the :class:`AsyncCommandRunner` variant used by the asyncio client.
+Tests replace the runners with stubs so no real AppleScript runs.
 """
 
 from __future__ import annotations
@@ -13,7 +15,14 @@ from typing import Protocol
 
 from .exceptions import InvalidCommandError
 
-__all__ = ["CommandRunner", "SubprocessCommandRunner"]
+__all__ = [
+    "AsyncCommandRunner",
+    "AsyncSubprocessCommandRunner",
+    "CommandRunner",
+    "OutputCommandRunner",
+    "SubprocessCommandRunner",
+    "SubprocessOutputCommandRunner",
+]
 
 
 class CommandRunner(Protocol):
@@ -23,13 +32,71 @@ class CommandRunner(Protocol):
         """Execute the provided command."""
 
 
+class OutputCommandRunner(Protocol):
+    """Protocol describing command runners that return the command's stdout."""
+
+    def __call__(self, command: Sequence[str]) -> str:  # pragma: no cover - Protocol definition
+        """Execute the provided command and return its standard output."""
+
+
+class AsyncCommandRunner(Protocol):
+    """Protocol describing awaitable command runners."""
+
+    async def __call__(self, command: Sequence[str]) -> None:  # pragma: no cover - Protocol
+        """Execute the provided command."""
+
+
+def _validate_command(command: Sequence[str]) -> tuple[str, ...]:
+    """Return *command* as a tuple after checking it is a sequence of strings."""
+    if not isinstance(command, Sequence) or isinstance(command, (str, bytes)):
+        raise InvalidCommandError.non_sequence()
+    for segment in command:
+        if not isinstance(segment, str):
+            raise InvalidCommandError.non_string_segment()
+    return tuple(command)
+
+
 class SubprocessCommandRunner:
     """Command runner that delegates to :func:`subprocess.run`."""
 
     def __call__(self, command: Sequence[str]) -> None:
-        if not isinstance(command, Sequence) or isinstance(command, (str, bytes)):
-            raise InvalidCommandError.non_sequence()
-        for segment in command:
-            if not isinstance(segment, str):
-                raise InvalidCommandError.non_string_segment()
-        subprocess.run(tuple(command), check=True, text=True, shell=False)  # noqa: S603
+        arguments = _validate_command(command)
+        subprocess.run(arguments, check=True, text=True, shell=False)  # noqa: S603
+
+
+class SubprocessOutputCommandRunner:
+    """Output command runner that delegates to :func:`subprocess.run`."""
+
+    def __call__(self, command: Sequence[str]) -> str:
+        arguments = _validate_command(command)
+        completed = subprocess.run(  # noqa: S603
+            arguments,
+            check=True,
+            text=True,
+            shell=False,
+            stdout=subprocess.PIPE,
+        )
+        return completed.stdout
+
+
+class AsyncSubprocessCommandRunner:
+    """Async command runner that delegates to :func:`asyncio.create_subprocess_exec`.
+
+    A non-zero exit status raises :class:`subprocess.CalledProcessError`, matching
+    :class:`SubprocessCommandRunner`. Cancelling the call kills the child process.
+    """
+
+    async def __call__(self, command: Sequence[str]) -> None:
+        import asyncio  # noqa: PLC0415 - slower to import than the rest of the package
+
+        arguments = _validate_command(command)
+        process = await asyncio.create_subprocess_exec(*arguments)
+        try:
+            returncode = await process.wait()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode=returncode, cmd=arguments)
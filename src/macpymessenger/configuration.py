@@ -9,29 +9,73 @@ from typing import Final
 from .exceptions import ScriptNotFoundError
 
 _PACKAGE_ROOT: Final[Path] = Path(__file__).resolve().parent
+_MESSAGES_DATABASE: Final[Path] = Path("~/Library/Messages/chat.db")
+_ATTACHMENT_STAGING: Final[Path] = Path("~/Library/Messages/Attachments/macpymessenger")
+
+_validated_scripts: dict[Path, tuple[int, int, int, int]] = {}
+"""Script paths known to be readable, with the ``stat`` signature they had then."""
 
 
 @dataclass(frozen=True, slots=True)
 class Configuration:
-    """Immutable configuration for :class:`~macpymessenger.client.IMessageClient`."""
+    """Immutable configuration for :class:`~macpymessenger.client.IMessageClient`.
+
+    ``attachment_staging_path`` receives a new subdirectory for every attachment sent
+    without an :class:`~macpymessenger.attachments.AttachmentStore`. The client
+    deletes subdirectories older than
+    :data:`~macpymessenger.attachments.STAGED_RETENTION_SECONDS`, so do not point it
+    at a directory holding anything else.
+    """
 
     send_script_path: Path
+    worker_script_path: Path
+    batch_script_path: Path
+    chat_database_path: Path
+    attachment_script_path: Path
+    attachment_staging_path: Path
 
-    def __init__(self, send_script_path: Path | str | None = None) -> None:
-        script_path = self._determine_script_path(send_script_path)
+    def __init__(  # noqa: PLR0913
+        self,
+        send_script_path: Path | str | None = None,
+        *,
+        worker_script_path: Path | str | None = None,
+        batch_script_path: Path | str | None = None,
+        chat_database_path: Path | str | None = None,
+        attachment_script_path: Path | str | None = None,
+        attachment_staging_path: Path | str | None = None,
+    ) -> None:
+        script_path = self._determine_script_path(send_script_path, "sendMessage.scpt")
         object.__setattr__(self, "send_script_path", script_path)
+        worker_path = self._determine_script_path(worker_script_path, "sendMessageWorker.scpt")
+        object.__setattr__(self, "worker_script_path", worker_path)
+        batch_path = self._determine_script_path(batch_script_path, "sendMessageBatch.scpt")
+        object.__setattr__(self, "batch_script_path", batch_path)
+        database_path = Path(chat_database_path or _MESSAGES_DATABASE).expanduser()
+        object.__setattr__(self, "chat_database_path", database_path)
+        attachment_path = self._determine_script_path(attachment_script_path, "sendAttachment.scpt")
+        object.__setattr__(self, "attachment_script_path", attachment_path)
+        staging_path = Path(attachment_staging_path or _ATTACHMENT_STAGING).expanduser()
+        object.__setattr__(self, "attachment_staging_path", staging_path)
 
     @staticmethod
-    def _determine_script_path(candidate: Path | str | None) -> Path:
+    def _determine_script_path(candidate: Path | str | None, bundled_name: str) -> Path:
         if candidate is None:
-            script_path = _PACKAGE_ROOT / "osascript" / "sendMessage.scpt"
+            script_path = _PACKAGE_ROOT / "osascript" / bundled_name
         elif isinstance(candidate, Path):
             script_path = candidate
         else:
             script_path = Path(candidate)
 
-        if not script_path.exists():
-            raise ScriptNotFoundError.missing_script(script_path)
+        try:
+            status = script_path.stat()
+        except OSError as error:
+            raise ScriptNotFoundError.missing_script(script_path) from error
+
+        # A changed inode, mtime or ctime (which chmod and chown update) means the
+        # file may no longer be readable, so only an identical signature skips the open.
+        signature = (status.st_dev, status.st_ino, status.st_mtime_ns, status.st_ctime_ns)
+        if _validated_scripts.get(script_path) == signature:
+            return script_path
 
         try:
             with script_path.open("rb"):
@@ -41,7 +85,15 @@ class Configuration:
         except OSError as error:
             raise ScriptNotFoundError.unreadable_script(script_path, str(error)) from error
 
+        _validated_scripts[script_path] = signature
         return script_path
 
     def __repr__(self) -> str:
-        return f"Configuration(send_script_path={self.send_script_path!s})"
+        return (
+            f"Configuration(send_script_path={self.send_script_path!s}, "
+            f"worker_script_path={self.worker_script_path!s}, "
+            f"batch_script_path={self.batch_script_path!s}, "
+            f"chat_database_path={self.chat_database_path!s}, "
+            f"attachment_script_path={self.attachment_script_path!s}, "
+            f"attachment_staging_path={self.attachment_staging_path!s})"
+        )
@@ -2,7 +2,10 @@
 
 This module defines :class:`MessageDelivery`, which owns the full delivery
 behavior surface: delay validation, send command construction, command
-execution, delivery failure mapping, and send logging.
+execution, delivery failure mapping, send logging, and optional stage
+metrics (see :mod:`macpymessenger.metrics`). Batch delivery sends
+chunks of messages through the batch send script and reports a
+:class:`DeliveryOutcome` per recipient.
 
 The delivery class depends on the :class:`~macpymessenger.commands.CommandRunner`
 seam so tests can stub execution without invoking real AppleScript.
@@ -10,22 +13,93 @@ seam so tests can stub execution without invoking real AppleScript.
 
 from __future__ import annotations
 
+import copy
 import subprocess
-from typing import TYPE_CHECKING
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
 
+from .commands import AsyncSubprocessCommandRunner, SubprocessOutputCommandRunner
 from .exceptions import (
+    CircuitOpenError,
+    ConfigurationError,
+    InvalidBatchSizeError,
     InvalidDelayTypeError,
     MessageSendError,
     NegativeDelayError,
 )
+from .retry import CircuitState
+from .tracing import active_tracer, trace_span
 
 if TYPE_CHECKING:
     import logging
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from pathlib import Path
 
-    from .commands import CommandRunner
+    from .commands import AsyncCommandRunner, CommandRunner, OutputCommandRunner
     from .configuration import Configuration
+    from .metrics import MetricsSink
+    from .ratelimit import RateLimiter
+    from .retry import CircuitBreaker, RetryPolicy
 
-__all__ = ["MessageDelivery"]
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "DEFAULT_MAX_ARGUMENT_BYTES",
+    "DeliveryOutcome",
+    "MessageDelivery",
+]
+
+DEFAULT_BATCH_SIZE: Final = 50
+"""Default number of messages sent per batch script invocation."""
+
+DEFAULT_MAX_ARGUMENT_BYTES: Final = 256 * 1024
+"""Default argument byte budget per batch invocation, well under macOS ``ARG_MAX``."""
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryOutcome:
+    """The result of delivering one message to one recipient handle."""
+
+    recipient_handle: str
+    error: MessageSendError | None = None
+    duration_us: int = 0
+    """Wall time of the send in microseconds; batch sends share their invocation's time."""
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def _elapsed_us(started_ns: int) -> int:
+    return (time.perf_counter_ns() - started_ns) // 1000
+
+
+class _StageTimer:
+    """Reports the stages of one send, or one batch chunk, to a metrics sink."""
+
+    __slots__ = ("_last", "_metrics", "_recipients")
+
+    def __init__(self, metrics: MetricsSink, recipients: int = 1) -> None:
+        self._metrics = metrics
+        self._recipients = recipients
+        metrics.add_in_flight(recipients)
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._metrics.observe(stage, now - self._last)
+        self._last = now
+
+    def finish(self, *errors: BaseException | None) -> None:
+        """Record one result per recipient and take them out of flight."""
+        for error in errors:
+            self._metrics.record(error)
+        self._metrics.add_in_flight(-self._recipients)
+
+
+def _missing_command_runner(_command: Sequence[str]) -> None:
+    """Stand in for the command runner of a delivery built for asynchronous sends only."""
+    raise ConfigurationError.missing_command_runner()
 
 
 class MessageDelivery:
@@ -36,22 +110,107 @@ class MessageDelivery:
     configuration:
         Resolved configuration specifying the AppleScript entry point.
     command_runner:
-        Callable that executes the generated AppleScript command.
+        Callable that executes the generated AppleScript command. May be ``None`` when
+        an ``async_command_runner`` is given; synchronous sends then raise
+        :class:`~macpymessenger.exceptions.ConfigurationError`.
     logger:
         Logger instance for operational events.
+    output_command_runner:
+        Callable that executes batch commands and returns their stdout. Defaults
+        to :class:`~macpymessenger.commands.SubprocessOutputCommandRunner`.
+    async_command_runner:
+        Awaitable runner used by :meth:`deliver_async`. Defaults to
+        :class:`~macpymessenger.commands.AsyncSubprocessCommandRunner`.
+    rate_limiter:
+        Optional :class:`~macpymessenger.ratelimit.RateLimiter`. Each send waits for
+        a slot before its command runs.
+    retry_policy:
+        Optional :class:`~macpymessenger.retry.RetryPolicy` for failed send commands.
+        Each retry waits for its backoff and, with a rate limiter, for a new slot.
+    circuit_breaker:
+        Optional :class:`~macpymessenger.retry.CircuitBreaker`. While it is open, sends
+        raise :class:`~macpymessenger.exceptions.CircuitOpenError` without running a
+        command, and retries stop.
+    metrics:
+        Optional :class:`~macpymessenger.metrics.MetricsSink` that receives stage
+        latencies, per-recipient results and the in-flight count. Without one, no
+        timing is done.
+    log_outcomes:
+        Log a record for each sent or failed recipient. Bulk sends with a
+        :class:`~macpymessenger.bulklog.BulkLogPolicy` turn this off and log through a
+        :class:`~macpymessenger.bulklog.BulkLogger` instead.
     """
 
-    __slots__ = ("_command_runner", "_configuration", "_logger")
+    __slots__ = (
+        "_async_command_runner",
+        "_circuit_breaker",
+        "_command_runner",
+        "_configuration",
+        "_log_outcomes",
+        "_logger",
+        "_metrics",
+        "_on_retry",
+        "_output_command_runner",
+        "_rate_limiter",
+        "_retry_policy",
+    )
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         configuration: Configuration,
-        command_runner: CommandRunner,
+        command_runner: CommandRunner | None,
         logger: logging.Logger,
+        *,
+        output_command_runner: OutputCommandRunner | None = None,
+        async_command_runner: AsyncCommandRunner | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        metrics: MetricsSink | None = None,
+        log_outcomes: bool = True,
     ) -> None:
+        if command_runner is None and async_command_runner is None:
+            raise ConfigurationError.missing_command_runner()
         self._configuration = configuration
-        self._command_runner = command_runner
+        self._command_runner = (
+            command_runner if command_runner is not None else _missing_command_runner
+        )
         self._logger = logger
+        self._output_command_runner = (
+            output_command_runner
+            if output_command_runner is not None
+            else SubprocessOutputCommandRunner()
+        )
+        self._async_command_runner = (
+            async_command_runner
+            if async_command_runner is not None
+            else AsyncSubprocessCommandRunner()
+        )
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+        self._metrics = metrics
+        self._log_outcomes = log_outcomes
+        self._on_retry: Callable[[], object] | None = None
+
+    @property
+    def metrics(self) -> MetricsSink | None:
+        return self._metrics
+
+    def without_outcome_logging(
+        self, *, on_retry: Callable[[], object] | None = None
+    ) -> MessageDelivery:
+        """Return a delivery sharing this one's runners, limiter, breaker and metrics.
+
+        The copy does not log per-recipient results. With *on_retry*, it calls
+        *on_retry* instead of logging a warning for each retried command, so a
+        :class:`~macpymessenger.bulklog.BulkLogger` can count retries. Circuit
+        breaker changes are still logged.
+        """
+        delivery = copy.copy(self)
+        delivery._log_outcomes = False
+        delivery._on_retry = on_retry
+        return delivery
 
     def deliver(
         self,
@@ -79,9 +238,276 @@ class MessageDelivery:
         MessageSendError:
             When delivery or command execution fails.
         """
-        delay_value = self._validate_delay(delay_seconds)
-        command = self._build_command(recipient_handle, message_body, delay_value)
-        self._execute(recipient_handle, command)
+        tracer = active_tracer()
+        if tracer is None:
+            self._deliver(recipient_handle, message_body, delay_seconds)
+            return
+        with trace_span(tracer, "macpymessenger.deliver", recipient=recipient_handle):
+            self._deliver(recipient_handle, message_body, delay_seconds)
+
+    def _deliver(self, recipient_handle: str, message_body: str, delay_seconds: object) -> None:
+        if self._metrics is None:
+            delay_value = self._validate_delay(delay_seconds)
+            command = self._build_command(recipient_handle, message_body, delay_value)
+            self._execute(recipient_handle, command)
+            return
+        timer = _StageTimer(self._metrics)
+        try:
+            delay_value = self._validate_delay(delay_seconds)
+            timer.lap("validate")
+            command = self._build_command(recipient_handle, message_body, delay_value)
+            timer.lap("build_command")
+            try:
+                self._execute(recipient_handle, command)
+            finally:
+                timer.lap("execute")
+        except Exception as error:
+            timer.finish(error)
+            raise
+        timer.finish(None)
+
+    async def deliver_async(
+        self,
+        recipient_handle: str,
+        message_body: str,
+        delay_seconds: object = 0,
+    ) -> None:
+        """Send *message_body* to *recipient_handle* through the async command runner.
+
+        Validation, command construction and failure mapping match :meth:`deliver`.
+
+        Raises
+        ------
+        InvalidDelayTypeError:
+            When ``delay_seconds`` is not a plain ``int``.
+        NegativeDelayError:
+            When ``delay_seconds`` is negative.
+        MessageSendError:
+            When delivery or command execution fails.
+        """
+        tracer = active_tracer()
+        if tracer is None:
+            await self._deliver_async(recipient_handle, message_body, delay_seconds)
+            return
+        with trace_span(tracer, "macpymessenger.deliver", recipient=recipient_handle):
+            await self._deliver_async(recipient_handle, message_body, delay_seconds)
+
+    async def _deliver_async(
+        self, recipient_handle: str, message_body: str, delay_seconds: object
+    ) -> None:
+        if self._metrics is None:
+            delay_value = self._validate_delay(delay_seconds)
+            command = self._build_command(recipient_handle, message_body, delay_value)
+            await self._execute_async(recipient_handle, command)
+            return
+        timer = _StageTimer(self._metrics)
+        try:
+            delay_value = self._validate_delay(delay_seconds)
+            timer.lap("validate")
+            command = self._build_command(recipient_handle, message_body, delay_value)
+            timer.lap("build_command")
+            try:
+                await self._execute_async(recipient_handle, command)
+            finally:
+                timer.lap("execute")
+        except Exception as error:
+            timer.finish(error)
+            raise
+        timer.finish(None)
+
+    async def _execute_async(self, recipient_handle: str, command: list[str]) -> None:
+        """Await *command* via the async command runner, as :meth:`_execute` does."""
+        import asyncio  # noqa: PLC0415 - slower to import than the rest of the package
+
+        attempt = 1
+        while True:
+            self._check_circuit(recipient_handle)
+            try:
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire_async(recipient_handle)
+                tracer = active_tracer()
+                if tracer is None:
+                    await self._async_command_runner(command)
+                else:
+                    with trace_span(
+                        tracer,
+                        "macpymessenger.command",
+                        recipient=recipient_handle,
+                        attempt=attempt,
+                    ):
+                        await self._async_command_runner(command)
+            except (subprocess.CalledProcessError, OSError) as error:
+                retry_delay = self._record_failure(recipient_handle, error, attempt)
+                if retry_delay is None:
+                    raise self._map_failure(recipient_handle, error) from error
+                await asyncio.sleep(retry_delay)
+                attempt += 1
+            except BaseException:
+                # Cancellation included: the half-open trial must not stay taken.
+                self._record_aborted()
+                raise
+            else:
+                self._record_success()
+                if self._log_outcomes:
+                    self._logger.info("Message sent to %s", recipient_handle)
+                return
+
+    def deliver_attachment(
+        self,
+        recipient_handle: str,
+        attachment_path: Path,
+        message_body: str = "",
+    ) -> None:
+        """Send the staged file at *attachment_path*, preceded by *message_body* if given.
+
+        Retries, rate limiting, circuit breaking, metrics and tracing apply as for
+        :meth:`deliver`.
+
+        Raises
+        ------
+        MessageSendError:
+            When delivery or command execution fails.
+        """
+        tracer = active_tracer()
+        if tracer is None:
+            self._deliver_attachment(recipient_handle, attachment_path, message_body)
+            return
+        with trace_span(tracer, "macpymessenger.deliver", recipient=recipient_handle):
+            self._deliver_attachment(recipient_handle, attachment_path, message_body)
+
+    def _deliver_attachment(
+        self, recipient_handle: str, attachment_path: Path, message_body: str
+    ) -> None:
+        if self._metrics is None:
+            self._execute(
+                recipient_handle,
+                self._build_attachment_command(recipient_handle, attachment_path, message_body),
+            )
+            return
+        timer = _StageTimer(self._metrics)
+        try:
+            command = self._build_attachment_command(
+                recipient_handle, attachment_path, message_body
+            )
+            timer.lap("build_command")
+            try:
+                self._execute(recipient_handle, command)
+            finally:
+                timer.lap("execute")
+        except Exception as error:
+            timer.finish(error)
+            raise
+        timer.finish(None)
+
+    def deliver_batch(
+        self,
+        messages: Iterable[tuple[str, str]],
+        *,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
+        max_argument_bytes: int = DEFAULT_MAX_ARGUMENT_BYTES,
+    ) -> list[DeliveryOutcome]:
+        """Send ``(recipient_handle, message_body)`` pairs in chunked batch invocations.
+
+        Each chunk runs the batch send script once, so Messages and the iMessage
+        service are resolved once per chunk rather than once per recipient. With a
+        rate limiter, a chunk runs once every message in it has a send slot.
+
+        Parameters
+        ----------
+        messages:
+            Recipient handle and message body pairs, sent in order.
+        chunk_size:
+            Maximum number of messages per batch invocation.
+        max_argument_bytes:
+            Maximum UTF-8 size of the recipient and body arguments per invocation.
+            A single message larger than the budget is sent in a chunk of its own.
+
+        Returns
+        -------
+        list[DeliveryOutcome]
+            One outcome per input pair, in input order. Failed sends carry a
+            :class:`MessageSendError`.
+
+        Raises
+        ------
+        InvalidBatchSizeError:
+            When ``chunk_size`` or ``max_argument_bytes`` is not a positive ``int``.
+        """
+        return list(
+            self.deliver_batch_iter(
+                messages, chunk_size=chunk_size, max_argument_bytes=max_argument_bytes
+            )
+        )
+
+    def deliver_batch_iter(
+        self,
+        messages: Iterable[tuple[str, str]],
+        *,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
+        max_argument_bytes: int = DEFAULT_MAX_ARGUMENT_BYTES,
+    ) -> Iterator[DeliveryOutcome]:
+        """Like :meth:`deliver_batch`, but yield outcomes as each chunk finishes.
+
+        *messages* is consumed one chunk at a time, so memory use does not grow with
+        the number of messages. The limits are validated before anything is sent.
+
+        Raises
+        ------
+        InvalidBatchSizeError:
+            When ``chunk_size`` or ``max_argument_bytes`` is not a positive ``int``.
+        """
+        chunk_size = self._validate_batch_size(chunk_size)
+        max_argument_bytes = self._validate_batch_size(max_argument_bytes)
+        return self._deliver_chunks(self._chunk_messages(messages, chunk_size, max_argument_bytes))
+
+    def _deliver_chunks(self, chunks: Iterable[list[tuple[str, str]]]) -> Iterator[DeliveryOutcome]:
+        metrics = self._metrics
+        for chunk in chunks:
+            if metrics is None:
+                yield from self._execute_batch(chunk, self._build_batch_command(chunk))
+                continue
+            timer = _StageTimer(metrics, len(chunk))
+            command = self._build_batch_command(chunk)
+            timer.lap("build_command")
+            try:
+                outcomes = self._execute_batch(chunk, command)
+            except Exception as error:
+                timer.lap("execute")
+                timer.finish(*[error] * len(chunk))
+                raise
+            timer.lap("execute")
+            timer.finish(*(outcome.error for outcome in outcomes))
+            yield from outcomes
+
+    @staticmethod
+    def _validate_batch_size(size: object) -> int:
+        """Validate and return a positive batch limit."""
+        if isinstance(size, bool) or not isinstance(size, int) or size < 1:
+            raise InvalidBatchSizeError
+        return size
+
+    @staticmethod
+    def _chunk_messages(
+        messages: Iterable[tuple[str, str]],
+        chunk_size: int,
+        max_argument_bytes: int,
+    ) -> Iterator[list[tuple[str, str]]]:
+        """Group *messages* into chunks bounded by count and argument bytes."""
+        chunk: list[tuple[str, str]] = []
+        chunk_bytes = 0
+        for recipient_handle, message_body in messages:
+            # Each argument also costs a terminating NUL byte in the exec argument block.
+            message_bytes = len(recipient_handle.encode()) + len(message_body.encode()) + 2
+            if chunk and (
+                len(chunk) >= chunk_size or chunk_bytes + message_bytes > max_argument_bytes
+            ):
+                yield chunk
+                chunk = []
+                chunk_bytes = 0
+            chunk.append((recipient_handle, message_body))
+            chunk_bytes += message_bytes
+        if chunk:
+            yield chunk
 
     @staticmethod
     def _validate_delay(delay_seconds: object) -> int:
@@ -115,14 +541,231 @@ class MessageDelivery:
             str(delay_value),
         ]
 
+    def _build_attachment_command(
+        self,
+        recipient_handle: str,
+        attachment_path: Path,
+        message_body: str,
+    ) -> list[str]:
+        """Return the ``osascript`` argument list for an attachment send."""
+        return [
+            "osascript",
+            str(self._configuration.attachment_script_path),
+            recipient_handle,
+            str(attachment_path),
+            message_body,
+        ]
+
+    def _build_batch_command(self, chunk: list[tuple[str, str]]) -> list[str]:
+        """Return the ``osascript`` argument list for one batch chunk."""
+        command = ["osascript", str(self._configuration.batch_script_path)]
+        for recipient_handle, message_body in chunk:
+            command.append(recipient_handle)
+            command.append(message_body)
+        return command
+
     def _execute(self, recipient_handle: str, command: list[str]) -> None:
         """Run *command* via the command runner and map failures to typed exceptions."""
+        attempt = 1
+        while True:
+            self._check_circuit(recipient_handle)
+            try:
+                if self._rate_limiter is not None:
+                    self._rate_limiter.acquire(recipient_handle)
+                tracer = active_tracer()
+                if tracer is None:
+                    self._command_runner(command)
+                else:
+                    with trace_span(
+                        tracer,
+                        "macpymessenger.command",
+                        recipient=recipient_handle,
+                        attempt=attempt,
+                    ):
+                        self._command_runner(command)
+            except (subprocess.CalledProcessError, OSError) as error:
+                retry_delay = self._record_failure(recipient_handle, error, attempt)
+                if retry_delay is None:
+                    raise self._map_failure(recipient_handle, error) from error
+                time.sleep(retry_delay)
+                attempt += 1
+            except BaseException:
+                self._record_aborted()
+                raise
+            else:
+                self._record_success()
+                if self._log_outcomes:
+                    self._logger.info("Message sent to %s", recipient_handle)
+                return
+
+    def _check_circuit(self, recipient_handle: str) -> None:
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.before_send(recipient_handle)
+
+    def _record_success(self) -> None:
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record_success()
+
+    def _record_aborted(self) -> None:
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record_aborted()
+
+    def _record_failure(
+        self,
+        target: str,
+        error: subprocess.CalledProcessError | OSError,
+        attempt: int,
+    ) -> float | None:
+        """Record a failed command and return the backoff before retrying, or ``None``."""
+        breaker = self._circuit_breaker
+        if breaker is not None:
+            breaker.record_failure()
+        policy = self._retry_policy
+        if policy is None or not policy.should_retry(error, attempt):
+            return None
+        if breaker is not None and breaker.state is not CircuitState.CLOSED:
+            return None
+        retry_delay = policy.backoff(attempt)
+        if self._on_retry is not None:
+            self._on_retry()
+            return retry_delay
+        self._logger.warning(
+            "Send to %s failed on attempt %d of %d; retrying in %.2f s",
+            target,
+            attempt,
+            policy.max_attempts,
+            retry_delay,
+        )
+        return retry_delay
+
+    def _map_failure(
+        self,
+        recipient_handle: str,
+        error: subprocess.CalledProcessError | OSError,
+    ) -> MessageSendError:
+        """Log *error* with its traceback and return the matching :class:`MessageSendError`."""
+        if isinstance(error, subprocess.CalledProcessError):
+            if self._log_outcomes:
+                self._logger.error("Failed to send message to %s", recipient_handle, exc_info=error)
+            return MessageSendError.delivery_failed(recipient_handle)
+        if self._log_outcomes:
+            self._logger.error(
+                "Execution error while sending to %s", recipient_handle, exc_info=error
+            )
+        return MessageSendError.command_failed(recipient_handle)
+
+    def _execute_batch(
+        self,
+        chunk: list[tuple[str, str]],
+        command: list[str],
+    ) -> list[DeliveryOutcome]:
+        """Run one batch *command* and map its per-recipient report to outcomes.
+
+        Each outcome is given an equal share of the invocation's duration.
+        """
+        started = time.perf_counter_ns()
         try:
-            self._command_runner(command)
-            self._logger.info("Message sent to %s", recipient_handle)
+            output = self._run_batch(chunk, command)
+        except CircuitOpenError:
+            return [
+                DeliveryOutcome(recipient_handle, CircuitOpenError.circuit_open(recipient_handle))
+                for recipient_handle, _ in chunk
+            ]
         except subprocess.CalledProcessError as error:
-            self._logger.exception("Failed to send message to %s", recipient_handle)
-            raise MessageSendError.delivery_failed(recipient_handle) from error
+            if self._log_outcomes:
+                self._logger.exception("Batch send failed for %d recipients", len(chunk))
+            duration_us = _elapsed_us(started) // len(chunk)
+            return [
+                self._batch_failure(
+                    recipient_handle,
+                    MessageSendError.delivery_failed(recipient_handle),
+                    error,
+                    duration_us,
+                )
+                for recipient_handle, _ in chunk
+            ]
         except OSError as error:
-            self._logger.exception("Execution error while sending to %s", recipient_handle)
-            raise MessageSendError.command_failed(recipient_handle) from error
+            if self._log_outcomes:
+                self._logger.exception(
+                    "Execution error while batch sending to %d recipients", len(chunk)
+                )
+            duration_us = _elapsed_us(started) // len(chunk)
+            return [
+                self._batch_failure(
+                    recipient_handle,
+                    MessageSendError.command_failed(recipient_handle),
+                    error,
+                    duration_us,
+                )
+                for recipient_handle, _ in chunk
+            ]
+
+        duration_us = _elapsed_us(started) // len(chunk)
+        reported = self._parse_batch_report(output)
+        outcomes: list[DeliveryOutcome] = []
+        for index, (recipient_handle, _) in enumerate(chunk):
+            reason = reported.get(index, "no result reported")
+            if reason is None:
+                if self._log_outcomes:
+                    self._logger.info("Message sent to %s", recipient_handle)
+                outcomes.append(DeliveryOutcome(recipient_handle, duration_us=duration_us))
+            else:
+                if self._log_outcomes:
+                    self._logger.error("Failed to send message to %s: %s", recipient_handle, reason)
+                error = MessageSendError.delivery_failed(recipient_handle)
+                error.add_note(f"Batch script reported: {reason}")
+                outcomes.append(DeliveryOutcome(recipient_handle, error, duration_us))
+        return outcomes
+
+    def _run_batch(self, chunk: list[tuple[str, str]], command: list[str]) -> str:
+        """Run one batch *command*, retrying failures of the whole invocation."""
+        target = f"{len(chunk)} recipients"
+        attempt = 1
+        while True:
+            self._check_circuit(target)
+            try:
+                if self._rate_limiter is not None:
+                    for recipient_handle, _ in chunk:
+                        self._rate_limiter.acquire(recipient_handle)
+                tracer = active_tracer()
+                if tracer is None:
+                    output = self._output_command_runner(command)
+                else:
+                    with trace_span(
+                        tracer, "macpymessenger.command", recipients=len(chunk), attempt=attempt
+                    ):
+                        output = self._output_command_runner(command)
+            except (subprocess.CalledProcessError, OSError) as error:
+                retry_delay = self._record_failure(target, error, attempt)
+                if retry_delay is None:
+                    raise
+                time.sleep(retry_delay)
+                attempt += 1
+            except BaseException:
+                self._record_aborted()
+                raise
+            else:
+                self._record_success()
+                return output
+
+    @staticmethod
+    def _batch_failure(
+        recipient_handle: str,
+        error: MessageSendError,
+        cause: BaseException,
+        duration_us: int,
+    ) -> DeliveryOutcome:
+        error.__cause__ = cause
+        return DeliveryOutcome(recipient_handle, error, duration_us)
+
+    @staticmethod
+    def _parse_batch_report(output: str) -> dict[int, str | None]:
+        """Parse batch script output into ``index -> None`` (sent) or a failure reason."""
+        reported: dict[int, str | None] = {}
+        for line in output.splitlines():
+            index_text, _, remainder = line.partition("\t")
+            if not index_text.isdigit():
+                continue
+            status, _, reason = remainder.partition("\t")
+            reported[int(index_text)] = None if status == "ok" else reason or status
+        return reported
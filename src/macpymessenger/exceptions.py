@@ -25,6 +25,14 @@ class InvalidCommandError(MacPyMessengerError, TypeError):
         message = "Command segments must be strings."
         return cls(message)
 
+    @classmethod
+    def malformed_send(cls) -> Self:
+        message = (
+            "Send commands must be interpreter, script, recipient handle and message body, "
+            "optionally followed by a delay in whole seconds."
+        )
+        return cls(message)
+
 
 class InvalidDelayTypeError(MacPyMessengerError, TypeError):
     """Raised when a send delay is not an integer number of seconds."""
@@ -42,6 +50,76 @@ class NegativeDelayError(MacPyMessengerError, ValueError):
         super().__init__(message)
 
 
+class InvalidBatchSizeError(MacPyMessengerError, ValueError):
+    """Raised when a batch chunk size is not a positive integer."""
+
+    def __init__(self) -> None:
+        message = "Batch size must be a positive integer."
+        super().__init__(message)
+
+
+class InvalidConcurrencyError(MacPyMessengerError, ValueError):
+    """Raised when a concurrency limit is not a positive integer."""
+
+    def __init__(self) -> None:
+        message = "Concurrency limit must be a positive integer."
+        super().__init__(message)
+
+
+class InvalidRateLimitError(MacPyMessengerError, ValueError):
+    """Raised when a rate limit or its bucket bound is not positive."""
+
+    def __init__(self) -> None:
+        message = "Rate limits must be positive and allow a burst of at least one send."
+        super().__init__(message)
+
+
+class InvalidRetryPolicyError(MacPyMessengerError, ValueError):
+    """Raised when a retry policy or circuit breaker setting is out of range."""
+
+    def __init__(self) -> None:
+        message = "Retry attempts and failure thresholds must be positive; backoffs non-negative."
+        super().__init__(message)
+
+
+class InvalidBulkLogPolicyError(MacPyMessengerError, ValueError):
+    """Raised when a bulk logging policy setting is out of range."""
+
+    def __init__(self) -> None:
+        message = (
+            "Bulk log summaries and signature limits must be positive; sample rates non-negative."
+        )
+        super().__init__(message)
+
+
+class ConflictingBulkOptionsError(MacPyMessengerError, ValueError):
+    """Raised when bulk send options that cannot be combined are given together."""
+
+    @classmethod
+    def batch_and_workers(cls) -> Self:
+        message = "batch_size and max_workers cannot be combined."
+        return cls(message)
+
+
+class InvalidRecipientHandleError(MacPyMessengerError, ValueError):
+    """Raised when a recipient handle is neither a phone number nor an email address."""
+
+    @classmethod
+    def invalid_phone_number(cls, handle: str) -> Self:
+        message = f"Recipient handle {handle!r} is not a valid phone number."
+        return cls(message)
+
+    @classmethod
+    def invalid_email(cls, handle: str) -> Self:
+        message = f"Recipient handle {handle!r} is not a valid email address."
+        return cls(message)
+
+    @classmethod
+    def invalid_country_code(cls, country_code: str) -> Self:
+        message = f"Default country code {country_code!r} must be one to three digits."
+        return cls(message)
+
+
 class MessageSendError(MacPyMessengerError):
     """Raised when sending a message fails."""
 
@@ -56,6 +134,92 @@ class MessageSendError(MacPyMessengerError):
         return cls(message)
 
 
+class OutboxError(MacPyMessengerError):
+    """Raised when an outbox entry cannot be queued or prepared for delivery."""
+
+    @classmethod
+    def invalid_entry(cls, recipient_handle: str) -> Self:
+        message = (
+            f"Outbox entry for {recipient_handle} must set exactly one of "
+            "message_body and template_id."
+        )
+        return cls(message)
+
+    @classmethod
+    def template_manager_required(cls, template_id: str) -> Self:
+        message = f"Outbox message uses template '{template_id}' but no template manager was given."
+        return cls(message)
+
+
+class CircuitOpenError(MessageSendError):
+    """Raised instead of sending while a circuit breaker is open."""
+
+    @classmethod
+    def circuit_open(cls, phone_number: str) -> Self:
+        message = f"Circuit breaker is open; not sending to {phone_number}"
+        return cls(message)
+
+
+class ChatHistoryError(MacPyMessengerError):
+    """Raised when chat history cannot be read from the Messages database."""
+
+    @classmethod
+    def invalid_limit(cls) -> Self:
+        message = "Chat history limit must be a positive integer."
+        return cls(message)
+
+    @classmethod
+    def invalid_poll_interval(cls) -> Self:
+        message = "Poll intervals must be positive, with min_interval <= max_interval."
+        return cls(message)
+
+    @classmethod
+    def database_unavailable(cls, path: Path, reason: str) -> Self:
+        message = (
+            f"Cannot read Messages database at {path}: {reason}. "
+            "Reading chat.db requires Full Disk Access for the running process."
+        )
+        return cls(message)
+
+
+class AttachmentError(MacPyMessengerError):
+    """Raised when an attachment fails validation or cannot be staged for Messages."""
+
+    @classmethod
+    def not_a_file(cls, path: Path) -> Self:
+        message = f"Attachment {path} is not a readable regular file."
+        return cls(message)
+
+    @classmethod
+    def too_large(cls, path: Path, size: int, limit: int) -> Self:
+        message = f"Attachment {path} is {size} bytes; the limit is {limit} bytes."
+        return cls(message)
+
+    @classmethod
+    def unsupported_type(cls, path: Path, media_type: str | None) -> Self:
+        message = f"Attachment {path} has unsupported type {media_type or 'unknown'}."
+        return cls(message)
+
+    @classmethod
+    def staging_failed(cls, path: Path, reason: str) -> Self:
+        message = f"Cannot stage attachment {path}: {reason}"
+        return cls(message)
+
+
+class DispatcherError(MacPyMessengerError):
+    """Raised when a dispatcher or keyed executor cannot accept or finish sends."""
+
+    @classmethod
+    def closed(cls) -> Self:
+        message = "The dispatcher is closed."
+        return cls(message)
+
+    @classmethod
+    def shard_exited(cls, shard: int, exitcode: int | None) -> Self:
+        message = f"Shard {shard} exited unexpectedly with exit code {exitcode}."
+        return cls(message)
+
+
 class TemplateError(MacPyMessengerError):
     """Base exception for template-related errors."""
 
@@ -105,6 +269,16 @@ class ConfigurationError(MacPyMessengerError):
         message = f"Unable to configure file logging using '{log_file_path}': {reason}"
         return cls(message)
 
+    @classmethod
+    def invalid_log_rotation(cls, reason: str) -> Self:
+        message = f"Invalid file logging rotation: {reason}"
+        return cls(message)
+
+    @classmethod
+    def missing_command_runner(cls) -> Self:
+        message = "MessageDelivery needs a command_runner for synchronous sends."
+        return cls(message)
+
 
 class ScriptNotFoundError(ConfigurationError):
     """Raised when the configured AppleScript cannot be found on disk."""
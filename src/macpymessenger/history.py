@@ -0,0 +1,362 @@
+"""Chat history for macpymessenger.
+
+This module defines :class:`ChatHistoryReader`, which reads messages from the
+Messages database (``~/Library/Messages/chat.db``). The database is opened
+through a ``mode=ro`` URI, so the reader never writes to it or creates it.
+
+Pages are fetched with keyset pagination: each page asks for messages older
+than the last one already returned, ordered by ``(date, ROWID)``. SQLite answers
+that with a seek on the ``message (handle_id, date)`` index of the Messages schema
+instead of skipping rows as ``OFFSET`` does, so a page deep in a long
+conversation costs the same as the first one. A handle with rows for several
+services (iMessage and SMS) is read with one seek per row, merged in Python.
+Queries are constant SQL with bound parameters, so the connection's statement
+cache prepares each one once.
+
+:class:`ChatDatabaseTailer` follows the database for new messages in either
+direction. It keeps a ``ROWID`` high-watermark and reads only rows above it, one
+batch query per poll, so its cost grows with new traffic rather than with
+history size. Before querying it compares the size and modification time of
+``chat.db`` and its ``-wal`` file with the previous poll and skips the query
+when neither changed. Idle polls back off from ``min_interval`` to
+``max_interval``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from heapq import merge
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, Self
+
+from .exceptions import ChatHistoryError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from types import TracebackType
+
+__all__ = ["ChatDatabaseTailer", "ChatHistoryReader", "ChatMessage"]
+
+_APPLE_EPOCH: Final = datetime(2001, 1, 1, tzinfo=UTC)
+"""Origin of ``message.date``, which Messages stores relative to 2001-01-01 UTC."""
+
+_NANOSECOND_DATES: Final = 10**11
+"""``message.date`` values above this are nanoseconds; older databases store seconds."""
+
+_MAX_KEY: Final = 2**63 - 1
+
+_SELECT_HANDLES: Final = "SELECT ROWID FROM handle WHERE id = ?"
+
+_SELECT_PAGE: Final = """
+SELECT
+    m.ROWID, m.guid, m.text, m.date, m.is_from_me, m.service,
+    (SELECT cmj.chat_id FROM chat_message_join AS cmj WHERE cmj.message_id = m.ROWID LIMIT 1)
+FROM message AS m
+WHERE m.handle_id = ? AND (m.date, m.ROWID) < (?, ?)
+ORDER BY m.date DESC, m.ROWID DESC
+LIMIT ?
+"""
+
+_SELECT_DATE: Final = "SELECT date FROM message WHERE ROWID = ?"
+
+_SELECT_NEW: Final = """
+SELECT
+    m.ROWID, m.guid, m.text, m.date, m.is_from_me, m.service,
+    (SELECT cmj.chat_id FROM chat_message_join AS cmj WHERE cmj.message_id = m.ROWID LIMIT 1),
+    h.id
+FROM message AS m
+LEFT JOIN handle AS h ON h.ROWID = m.handle_id
+WHERE m.ROWID > ?
+ORDER BY m.ROWID
+LIMIT ?
+"""
+
+_SELECT_MAX_ROWID: Final = "SELECT COALESCE(MAX(ROWID), 0) FROM message"
+
+
+@dataclass(frozen=True, slots=True)
+class ChatMessage:
+    """One message row from the Messages database."""
+
+    rowid: int
+    """Message ``ROWID``; pass the last one of a page as ``before`` to fetch the next page."""
+    guid: str
+    text: str | None
+    """Plain text, or ``None`` for messages stored only as attributed text or attachments."""
+    handle: str | None
+    """Other party's handle; ``None`` for messages without one, such as group sends."""
+    is_from_me: bool
+    sent_at: datetime | None
+    service: str | None
+    chat_id: int | None
+
+
+def _page_key(row: tuple[int, ...]) -> tuple[int, int]:
+    return row[3], row[0]
+
+
+def _to_datetime(value: int | None) -> datetime | None:
+    if not value:
+        return None
+    if value > _NANOSECOND_DATES:
+        return _APPLE_EPOCH + timedelta(microseconds=value // 1000)
+    return _APPLE_EPOCH + timedelta(seconds=value)
+
+
+def _to_message(row: tuple[Any, ...], handle: str | None) -> ChatMessage:
+    rowid, guid, text, date, is_from_me, service, chat_id = row[:7]
+    return ChatMessage(
+        rowid=rowid,
+        guid=guid,
+        text=text,
+        handle=handle,
+        is_from_me=bool(is_from_me),
+        sent_at=_to_datetime(date),
+        service=service,
+        chat_id=chat_id,
+    )
+
+
+def _connect_read_only(database_path: Path) -> sqlite3.Connection:
+    uri = f"{database_path.expanduser().resolve().as_uri()}?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+class ChatHistoryReader:
+    """Read-only access to the Messages ``chat.db``.
+
+    Parameters
+    ----------
+    database_path:
+        Path of the Messages database. The file is opened on first use.
+
+    The connection is shared between threads and serialized with a lock.
+    """
+
+    __slots__ = ("_connection", "_lock", "database_path")
+
+    def __init__(self, database_path: str | Path) -> None:
+        self.database_path = Path(database_path)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def messages(
+        self, handle: str, *, limit: int = 10, before: int | None = None
+    ) -> list[ChatMessage]:
+        """Return up to *limit* messages exchanged with *handle*, newest first.
+
+        Parameters
+        ----------
+        handle:
+            Recipient handle as stored in ``handle.id``, such as ``"+15551234567"``.
+        limit:
+            Page size.
+        before:
+            ``rowid`` of the last message of the previous page. Only older messages are
+            returned, so this fetches the next page. An unknown ``rowid`` returns an empty
+            page.
+
+        Raises
+        ------
+        ChatHistoryError:
+            When *limit* is not a positive ``int``, or the database cannot be read.
+        """
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            raise ChatHistoryError.invalid_limit()
+        with self._lock:
+            try:
+                connection = self._connect()
+                cursor = (_MAX_KEY, _MAX_KEY)
+                if before is not None:
+                    row = connection.execute(_SELECT_DATE, (before,)).fetchone()
+                    if row is None:
+                        return []
+                    cursor = (row[0], before)
+                handle_ids = connection.execute(_SELECT_HANDLES, (handle,)).fetchall()
+                pages = [
+                    connection.execute(_SELECT_PAGE, (handle_id, *cursor, limit)).fetchall()
+                    for (handle_id,) in handle_ids
+                ]
+            except sqlite3.Error as error:
+                raise ChatHistoryError.database_unavailable(
+                    self.database_path, str(error)
+                ) from error
+        rows = pages[0] if len(pages) == 1 else merge(*pages, key=_page_key, reverse=True)
+        return [_to_message(row, handle) for row in islice(rows, limit)]
+
+    def close(self) -> None:
+        with self._lock:
+            connection = self._connection
+            self._connection = None
+        if connection is not None:
+            connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = _connect_read_only(self.database_path)
+        return self._connection
+
+
+class ChatDatabaseTailer:
+    """Follow the Messages ``chat.db`` for new messages.
+
+    Parameters
+    ----------
+    database_path:
+        Path of the Messages database. The file is opened on first use.
+    watermark:
+        ``ROWID`` of the last message already handled, as saved from :attr:`watermark`
+        by an earlier run. Only newer messages are returned. When omitted, tailing
+        starts after the newest message in the database.
+    batch_size:
+        Maximum messages returned by one poll.
+    min_interval:
+        Seconds :meth:`follow` waits after a poll that found messages.
+    max_interval:
+        Longest wait; idle polls double the wait up to this value.
+    watch_files:
+        Skip the query when ``chat.db`` and its ``-wal`` file are unchanged since
+        the previous poll.
+    sleep:
+        Called with the seconds to wait between polls. Tests substitute a recorder.
+
+    Raises
+    ------
+    ChatHistoryError:
+        When *batch_size* is not a positive ``int`` or the intervals are not positive
+        with ``min_interval <= max_interval``.
+    """
+
+    __slots__ = (
+        "_connection",
+        "_file_state",
+        "_sleep",
+        "_watermark",
+        "batch_size",
+        "database_path",
+        "max_interval",
+        "min_interval",
+        "watch_files",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        database_path: str | Path,
+        *,
+        watermark: int | None = None,
+        batch_size: int = 500,
+        min_interval: float = 0.5,
+        max_interval: float = 5.0,
+        watch_files: bool = True,
+        sleep: Callable[[float], object] = time.sleep,
+    ) -> None:
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+            raise ChatHistoryError.invalid_limit()
+        if not 0 < min_interval <= max_interval:
+            raise ChatHistoryError.invalid_poll_interval()
+        self.database_path = Path(database_path)
+        self.batch_size = batch_size
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.watch_files = watch_files
+        self._sleep = sleep
+        self._watermark = watermark
+        self._connection: sqlite3.Connection | None = None
+        self._file_state: tuple[tuple[int, int] | None, ...] | None = None
+
+    @property
+    def watermark(self) -> int | None:
+        """``ROWID`` of the newest message returned so far; save it to resume later."""
+        return self._watermark
+
+    def poll(self) -> list[ChatMessage]:
+        """Return up to ``batch_size`` messages newer than the watermark, oldest first.
+
+        Raises
+        ------
+        ChatHistoryError:
+            When the database cannot be read.
+        """
+        file_state = self._stat_files() if self.watch_files else None
+        if file_state is not None and file_state == self._file_state:
+            return []
+        try:
+            connection = self._connect()
+            if self._watermark is None:
+                self._watermark = connection.execute(_SELECT_MAX_ROWID).fetchone()[0]
+            rows = connection.execute(_SELECT_NEW, (self._watermark, self.batch_size)).fetchall()
+        except sqlite3.Error as error:
+            raise ChatHistoryError.database_unavailable(self.database_path, str(error)) from error
+        if len(rows) < self.batch_size:
+            self._file_state = file_state
+        if rows:
+            self._watermark = rows[-1][0]
+        return [_to_message(row, row[7]) for row in rows]
+
+    def follow(self, stop: threading.Event | None = None) -> Iterator[list[ChatMessage]]:
+        """Yield each non-empty batch of new messages until *stop* is set.
+
+        A full batch is followed by another poll at once. An empty poll doubles the
+        wait, from ``min_interval`` up to ``max_interval``.
+        """
+        interval = self.min_interval
+        while stop is None or not stop.is_set():
+            messages = self.poll()
+            if messages:
+                yield messages
+                interval = self.min_interval
+                if len(messages) == self.batch_size:
+                    continue
+            else:
+                interval = min(interval * 2, self.max_interval)
+            self._sleep(interval)
+
+    def close(self) -> None:
+        connection = self._connection
+        self._connection = None
+        if connection is not None:
+            connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = _connect_read_only(self.database_path)
+        return self._connection
+
+    def _stat_files(self) -> tuple[tuple[int, int] | None, ...]:
+        path = self.database_path.expanduser()
+        return _file_signature(path), _file_signature(path.with_name(f"{path.name}-wal"))
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        status = path.stat()
+    except OSError:
+        return None
+    return status.st_mtime_ns, status.st_size
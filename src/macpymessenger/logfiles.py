@@ -0,0 +1,235 @@
+"""File logging handlers for the messaging clients.
+
+:func:`open_file_handler` builds the handler a
+:class:`~macpymessenger.client.FileLoggingConfiguration` describes: a plain,
+size-rotating or time-rotating file handler. In asynchronous mode that handler
+sits behind a :class:`QueuedFileHandler`, so logging a record on the sending
+thread only puts it on a queue. A :class:`logging.handlers.QueueListener`
+thread writes the records and flushes the file when the queue runs empty
+rather than after every record.
+
+Rotated files can be gzip-compressed on a background thread, so neither the
+sender nor the listener waits for compression. Queued records are written when
+:meth:`QueuedFileHandler.flush` or :meth:`QueuedFileHandler.close` is called;
+:func:`logging.shutdown` calls both at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .exceptions import ConfigurationError
+
+if TYPE_CHECKING:
+    from .client import FileLoggingConfiguration
+
+__all__ = ["LOG_FORMAT", "QueuedFileHandler", "has_file_handler", "open_file_handler"]
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """File handler that leaves the per-record flush to :class:`_DrainingQueueListener`."""
+
+    _emitting = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._emitting = True
+        try:
+            super().emit(record)
+        finally:
+            self._emitting = False
+
+    def flush(self) -> None:
+        if not self._emitting:
+            super().flush()
+
+
+class _BufferedRotatingFileHandler(_BufferedFileHandler, RotatingFileHandler):
+    pass
+
+
+class _BufferedTimedRotatingFileHandler(_BufferedFileHandler, TimedRotatingFileHandler):
+    pass
+
+
+class _FlushRequest(logging.LogRecord):
+    """Queued by :meth:`QueuedFileHandler.flush`; the listener sets ``done`` on reaching it."""
+
+    def __init__(self) -> None:
+        super().__init__(__name__, logging.NOTSET, __file__, 0, "", None, None)
+        self.done = threading.Event()
+
+
+class _DrainingQueueListener(QueueListener):
+    def dequeue(self, block: bool) -> logging.LogRecord:  # noqa: FBT001 - overrides QueueListener
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return super().dequeue(block)
+
+    def handle(self, record: logging.LogRecord) -> None:
+        if isinstance(record, _FlushRequest):
+            for handler in self.handlers:
+                handler.flush()
+            record.done.set()
+        else:
+            super().handle(record)
+
+
+class QueuedFileHandler(QueueHandler):
+    """Handler that queues records for a background thread writing them to *target*.
+
+    Parameters
+    ----------
+    target:
+        The handler the listener thread writes records to. It is closed with this
+        handler.
+    """
+
+    def __init__(self, target: logging.Handler) -> None:
+        records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        super().__init__(records)
+        self.target = target
+        self._stopped = False
+        self.listener = _DrainingQueueListener(records, target, respect_handler_level=True)
+        self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so formatting and copying the record
+        # for pickling, as QueueHandler does by default, is left to the listener.
+        return record
+
+    def flush(self) -> None:
+        """Block until every record queued so far is written and flushed to the file."""
+        with self.lock:
+            if self._stopped:
+                return
+            request = _FlushRequest()
+            self.enqueue(request)
+            request.done.wait()
+
+    def close(self) -> None:
+        """Write the queued records, stop the listener thread and close *target*."""
+        with self.lock:
+            if not self._stopped:
+                self._stopped = True
+                self.listener.stop()
+                self.target.close()
+        super().close()
+
+
+class _GzipRotation:
+    """Namer and rotator that gzip each rotated file on a background thread."""
+
+    __slots__ = ("_pending",)
+
+    def __init__(self) -> None:
+        self._pending: threading.Thread | None = None
+
+    def name(self, default_name: str) -> str:
+        # Rotating handlers name the backups before renaming them, so waiting
+        # here keeps a running compression from racing those renames.
+        self.wait()
+        return f"{default_name}.gz"
+
+    def rotate(self, source: str, destination: str) -> None:
+        self.wait()
+        if not os.path.exists(source):  # noqa: PTH110 - paths are str as logging passes them
+            return
+        uncompressed = destination.removesuffix(".gz")
+        os.replace(source, uncompressed)  # noqa: PTH105
+        pending = threading.Thread(
+            target=_compress,
+            args=(uncompressed, destination),
+            name="macpymessenger-log-compression",
+        )
+        pending.start()
+        self._pending = pending
+
+    def wait(self) -> None:
+        pending = self._pending
+        if pending is not None:
+            pending.join()
+            self._pending = None
+
+
+def _compress(source: str, destination: str) -> None:
+    partial = f"{destination}.partial"
+    try:
+        with open(source, "rb") as plain, gzip.open(partial, "wb") as compressed:  # noqa: PTH123
+            shutil.copyfileobj(plain, compressed)
+        os.replace(partial, destination)  # noqa: PTH105
+        os.remove(source)  # noqa: PTH107
+    except OSError:
+        # The rotated file stays uncompressed rather than being lost.
+        Path(partial).unlink(missing_ok=True)
+
+
+def has_file_handler(logger: logging.Logger) -> bool:
+    """Return whether *logger* already writes to a file, directly or through a queue."""
+    return any(
+        isinstance(handler, (logging.FileHandler, QueuedFileHandler)) for handler in logger.handlers
+    )
+
+
+def open_file_handler(configuration: FileLoggingConfiguration) -> logging.Handler:
+    """Open the handler *configuration* describes.
+
+    Raises
+    ------
+    ConfigurationError
+        If the log file cannot be opened.
+    """
+    path = (
+        Path(configuration.path)
+        if configuration.path is not None
+        else Path.cwd() / "macpymessenger.log"
+    )
+    buffered = configuration.asynchronous
+    try:
+        if configuration.max_bytes:
+            handler_type = _BufferedRotatingFileHandler if buffered else RotatingFileHandler
+            file_handler: logging.FileHandler = handler_type(
+                path,
+                maxBytes=configuration.max_bytes,
+                backupCount=configuration.backup_count,
+                encoding="utf-8",
+            )
+        elif configuration.when is not None:
+            timed_type = _BufferedTimedRotatingFileHandler if buffered else TimedRotatingFileHandler
+            file_handler = timed_type(
+                path,
+                when=configuration.when,
+                backupCount=configuration.backup_count,
+                encoding="utf-8",
+            )
+        else:
+            plain_type = _BufferedFileHandler if buffered else logging.FileHandler
+            file_handler = plain_type(path, encoding="utf-8")
+    except OSError as error:
+        error_message = error.strerror or str(error)
+        raise ConfigurationError.file_logging_unavailable(path, error_message) from error
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if configuration.compress and isinstance(
+        file_handler, (RotatingFileHandler, TimedRotatingFileHandler)
+    ):
+        rotation = _GzipRotation()
+        file_handler.namer = rotation.name
+        file_handler.rotator = rotation.rotate
+    if buffered:
+        return QueuedFileHandler(file_handler)
+    return file_handler
@@ -0,0 +1,208 @@
+"""Delivery metrics for macpymessenger.
+
+:class:`~macpymessenger.delivery.MessageDelivery` reports to a
+:class:`MetricsSink` when one is configured:
+
+- the time spent in each stage of a send (``validate``, ``build_command`` and
+  ``execute``, which includes rate limiting, retries and backoff),
+- one result per recipient, with the type of the exception for failures,
+- the number of recipients being sent to at the moment.
+
+:class:`DeliveryMetrics` is the built-in sink. It keeps fixed-bucket latency
+histograms and counters in memory, and :func:`render_prometheus` renders them
+in the Prometheus text exposition format, so they can be served by any HTTP
+handler without a client library. Without a sink, delivery skips every clock
+read and call.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Final, Protocol
+
+__all__ = [
+    "DEFAULT_LATENCY_BUCKETS",
+    "STAGES",
+    "DeliveryMetrics",
+    "HistogramSnapshot",
+    "MetricsSink",
+    "render_prometheus",
+]
+
+STAGES: Final = ("validate", "build_command", "execute")
+"""Stages of a send reported by :class:`~macpymessenger.delivery.MessageDelivery`."""
+
+DEFAULT_LATENCY_BUCKETS: Final = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Histogram upper bounds in seconds, from in-process stages to ``osascript`` sends."""
+
+
+class MetricsSink(Protocol):
+    """Protocol describing receivers of delivery metrics.
+
+    Methods are called on the sending thread, so they should be cheap and thread-safe.
+    """
+
+    def observe(self, stage: str, seconds: float) -> None:  # pragma: no cover - Protocol
+        """Record that *stage* of one send or batch chunk took *seconds*."""
+
+    def record(self, error: BaseException | None) -> None:  # pragma: no cover - Protocol
+        """Record one recipient's result: ``None`` for success, else the raised error."""
+
+    def add_in_flight(self, count: int) -> None:  # pragma: no cover - Protocol
+        """Add *count*, which may be negative, to the recipients being sent to."""
+
+
+@dataclass(frozen=True, slots=True)
+class HistogramSnapshot:
+    """Cumulative bucket counts of one histogram, as Prometheus reports them."""
+
+    bounds: tuple[float, ...]
+    cumulative_counts: tuple[int, ...]
+    """Observations at or below each bound, followed by the total for ``+Inf``."""
+    total: float
+
+    @property
+    def count(self) -> int:
+        return self.cumulative_counts[-1]
+
+
+class _Histogram:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class DeliveryMetrics:
+    """Thread-safe in-memory :class:`MetricsSink` with per-stage latency histograms.
+
+    Parameters
+    ----------
+    buckets:
+        Increasing histogram upper bounds in seconds. An implicit ``+Inf`` bucket
+        follows the last one.
+    """
+
+    __slots__ = ("_failures", "_histograms", "_in_flight", "_lock", "_succeeded", "buckets")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._histograms: dict[str, _Histogram] = {}
+        self._succeeded = 0
+        self._failures: dict[str, int] = {}
+        self._in_flight = 0
+
+    def observe(self, stage: str, seconds: float) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[index] += 1
+            histogram.total += seconds
+
+    def record(self, error: BaseException | None) -> None:
+        with self._lock:
+            if error is None:
+                self._succeeded += 1
+            else:
+                name = type(error).__name__
+                self._failures[name] = self._failures.get(name, 0) + 1
+
+    def add_in_flight(self, count: int) -> None:
+        with self._lock:
+            self._in_flight += count
+
+    @property
+    def succeeded(self) -> int:
+        """Recipients sent to successfully."""
+        return self._succeeded
+
+    @property
+    def in_flight(self) -> int:
+        """Recipients being sent to now."""
+        return self._in_flight
+
+    def failures(self) -> dict[str, int]:
+        """Return failed recipients counted by exception type name."""
+        with self._lock:
+            return dict(self._failures)
+
+    def histograms(self) -> dict[str, HistogramSnapshot]:
+        """Return a snapshot of the latency histogram of every observed stage."""
+        with self._lock:
+            snapshots: dict[str, HistogramSnapshot] = {}
+            for stage, histogram in self._histograms.items():
+                cumulative: list[int] = []
+                running = 0
+                for count in histogram.counts:
+                    running += count
+                    cumulative.append(running)
+                snapshots[stage] = HistogramSnapshot(
+                    self.buckets, tuple(cumulative), histogram.total
+                )
+            return snapshots
+
+
+def render_prometheus(metrics: DeliveryMetrics, namespace: str = "macpymessenger") -> str:
+    """Return *metrics* in the Prometheus text exposition format, version 0.0.4."""
+    stage_name = f"{namespace}_delivery_stage_seconds"
+    succeeded_name = f"{namespace}_deliveries_succeeded_total"
+    failed_name = f"{namespace}_deliveries_failed_total"
+    in_flight_name = f"{namespace}_deliveries_in_flight"
+    lines = [
+        f"# HELP {stage_name} Time spent in each delivery stage.",
+        f"# TYPE {stage_name} histogram",
+    ]
+    for stage, histogram in sorted(metrics.histograms().items()):
+        label = f'stage="{_escape(stage)}"'
+        bounds = [*map(_format_float, histogram.bounds), "+Inf"]
+        lines.extend(
+            f'{stage_name}_bucket{{{label},le="{bound}"}} {count}'
+            for bound, count in zip(bounds, histogram.cumulative_counts, strict=True)
+        )
+        lines.append(f"{stage_name}_sum{{{label}}} {_format_float(histogram.total)}")
+        lines.append(f"{stage_name}_count{{{label}}} {histogram.count}")
+    lines += [
+        f"# HELP {succeeded_name} Recipients sent to successfully.",
+        f"# TYPE {succeeded_name} counter",
+        f"{succeeded_name} {metrics.succeeded}",
+        f"# HELP {failed_name} Recipients whose send failed, by exception type.",
+        f"# TYPE {failed_name} counter",
+    ]
+    lines.extend(
+        f'{failed_name}{{error="{_escape(error)}"}} {count}'
+        for error, count in sorted(metrics.failures().items())
+    )
+    lines += [
+        f"# HELP {in_flight_name} Recipients being sent to now.",
+        f"# TYPE {in_flight_name} gauge",
+        f"{in_flight_name} {metrics.in_flight}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
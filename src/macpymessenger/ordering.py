@@ -0,0 +1,166 @@
+"""In-order delivery per recipient for concurrent sends.
+
+:class:`KeyedSerialExecutor` runs sends through
+:class:`~macpymessenger.delivery.MessageDelivery` on a thread pool. Sends to
+different recipient handles run in parallel, but sends to one handle wait in a
+queue for that handle and run one at a time, in submission order, so a
+``"code: 1234"`` followed by ``"expires in 5 min"`` cannot overtake each other.
+
+Only handles with queued or running sends are tracked. A handle's queue is
+dropped as soon as it runs empty, so memory is bounded by the sends in flight,
+not by the number of distinct recipients ever seen. A busy handle gives up its
+thread after ``sends_per_turn`` sends, so it cannot hold a pool thread while
+other handles wait.
+
+Handles are compared as given; normalize them first, for example with
+:func:`~macpymessenger.recipients.normalize_handle`.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Final, Self
+
+from .exceptions import DispatcherError, InvalidConcurrencyError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import TracebackType
+
+    from .delivery import MessageDelivery
+
+__all__ = ["DEFAULT_SENDS_PER_TURN", "KeyedSerialExecutor"]
+
+DEFAULT_SENDS_PER_TURN: Final = 16
+"""Sends one handle runs in a row before its remaining sends are queued behind other handles."""
+
+# A queued send: (message body, future completed when it is sent).
+_Send = tuple[str, Future[None]]
+
+
+class KeyedSerialExecutor:
+    """Run sends in parallel across recipients and in order for each recipient.
+
+    Use the executor as a context manager, or call :meth:`shutdown`, to stop its
+    threads.
+
+    Parameters
+    ----------
+    delivery:
+        Delivery used for each send. Sends are delivered with no delay.
+    max_workers:
+        Number of threads, and so the most recipients sent to at once.
+    sends_per_turn:
+        Sends one recipient runs in a row before yielding its thread to others.
+
+    Raises
+    ------
+    InvalidConcurrencyError
+        If ``max_workers`` or ``sends_per_turn`` is not a positive ``int``.
+    """
+
+    __slots__ = ("_closed", "_delivery", "_lock", "_pool", "_queues", "sends_per_turn")
+
+    def __init__(
+        self,
+        delivery: MessageDelivery,
+        *,
+        max_workers: int = 8,
+        sends_per_turn: int = DEFAULT_SENDS_PER_TURN,
+    ) -> None:
+        for count in (max_workers, sends_per_turn):
+            if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+                raise InvalidConcurrencyError
+        self._delivery = delivery
+        self.sends_per_turn = sends_per_turn
+        self._lock = threading.Lock()
+        self._queues: dict[str, deque[_Send]] = {}
+        self._closed = False
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="macpymessenger-keyed"
+        )
+
+    def submit(self, recipient_handle: str, message_body: str) -> Future[None]:
+        """Queue *message_body* for *recipient_handle* behind its earlier sends.
+
+        The returned future resolves to ``None`` once the message is sent, or to the
+        :class:`~macpymessenger.exceptions.MessageSendError` raised by delivery. A
+        failed send does not stop later sends to the same handle. Cancelling the
+        future before the send starts skips it.
+
+        Raises
+        ------
+        DispatcherError
+            If the executor is shut down.
+        """
+        future: Future[None] = Future()
+        with self._lock:
+            if self._closed:
+                raise DispatcherError.closed()
+            queued = self._queues.get(recipient_handle)
+            if queued is not None:
+                queued.append((message_body, future))
+                return future
+            self._queues[recipient_handle] = deque([(message_body, future)])
+            self._pool.submit(self._run, recipient_handle)
+        return future
+
+    def submit_many(self, messages: Iterable[tuple[str, str]]) -> list[Future[None]]:
+        """Queue ``(recipient_handle, message_body)`` pairs and return their futures in order."""
+        return [self.submit(recipient_handle, body) for recipient_handle, body in messages]
+
+    def active_recipients(self) -> int:
+        """Return the number of handles with queued or running sends."""
+        with self._lock:
+            return len(self._queues)
+
+    def shutdown(self, *, cancel_pending: bool = False) -> None:
+        """Stop accepting sends and wait for the threads to finish.
+
+        By default every queued send is delivered first. With ``cancel_pending``
+        queued sends are cancelled; sends already running still finish.
+        """
+        with self._lock:
+            self._closed = True
+            if cancel_pending:
+                for queued in self._queues.values():
+                    for _, future in queued:
+                        future.cancel()
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.shutdown()
+
+    def _run(self, recipient_handle: str) -> None:
+        """Send the queued messages of one handle in order, for up to one turn."""
+        queued = self._queues[recipient_handle]
+        sent = 0
+        while True:
+            with self._lock:
+                if not queued:
+                    # Idle: drop the queue so an idle handle costs no memory.
+                    del self._queues[recipient_handle]
+                    return
+                if sent == self.sends_per_turn and not self._closed:
+                    # Let handles waiting in the pool run before the rest of this one.
+                    self._pool.submit(self._run, recipient_handle)
+                    return
+                message_body, future = queued.popleft()
+            if future.set_running_or_notify_cancel():
+                try:
+                    self._delivery.deliver(recipient_handle, message_body)
+                except Exception as error:  # noqa: BLE001 - surfaced through the future
+                    future.set_exception(error)
+                else:
+                    future.set_result(None)
+            sent += 1
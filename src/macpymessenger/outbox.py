@@ -0,0 +1,371 @@
+"""Durable outbox for macpymessenger.
+
+This module defines :class:`Outbox`, a local SQLite queue of messages waiting to
+be sent. Messages are enqueued in batched transactions and drained through
+:class:`~macpymessenger.delivery.MessageDelivery` with at-least-once semantics:
+
+- Draining leases a batch of rows before sending. A lease that expires, for
+  example because the draining process died, makes its rows claimable again.
+- A row is marked sent right after its send succeeds, so a crash resends at
+  most the messages that were in flight.
+- Failed sends return to the queue until ``max_attempts`` is reached, then stay
+  in the ``failed`` state with their last error. A failed message is not
+  claimable again until its backoff, from a
+  :class:`~macpymessenger.retry.RetryPolicy`, has passed, so an outage
+  shorter than the total backoff does not use up its attempts.
+
+The database uses WAL journaling so enqueueing and draining do not block each
+other, and ``synchronous=NORMAL`` so each commit does not wait for a full sync.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, Final, Self
+
+from .exceptions import MessageSendError, OutboxError, TemplateError
+from .retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+    from pathlib import Path
+    from types import TracebackType
+
+    from .delivery import MessageDelivery
+    from .templates import TemplateManager
+
+__all__ = [
+    "DEFAULT_ENQUEUE_BATCH_SIZE",
+    "DEFAULT_LEASE_SECONDS",
+    "DEFAULT_MAX_ATTEMPTS",
+    "DEFAULT_RETRY_BACKOFF",
+    "DrainReport",
+    "Outbox",
+    "OutboxEntry",
+    "OutboxMessage",
+]
+
+DEFAULT_LEASE_SECONDS: Final = 300.0
+"""Seconds a drained batch stays leased before other drainers may claim it."""
+
+DEFAULT_MAX_ATTEMPTS: Final = 5
+"""Send attempts before a message is left in the ``failed`` state."""
+
+DEFAULT_RETRY_BACKOFF: Final = RetryPolicy(initial_backoff=30.0, max_backoff=3600.0)
+"""Backoff before a failed message is claimable again: 30 s, doubling up to an hour."""
+
+DEFAULT_ENQUEUE_BATCH_SIZE: Final = 10_000
+"""Rows inserted per transaction by :meth:`Outbox.enqueue_many`."""
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    recipient_handle TEXT NOT NULL,
+    message_body TEXT,
+    template_id TEXT,
+    context TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_expires_at REAL,
+    next_attempt_at REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_status_id ON outbox (status, id);
+"""
+
+_INSERT: Final = """
+INSERT INTO outbox (recipient_handle, message_body, template_id, context, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_CLAIM: Final = """
+UPDATE outbox
+SET status = 'leased', lease_expires_at = ?, attempts = attempts + 1, updated_at = ?
+WHERE id IN (
+    SELECT id FROM outbox
+    WHERE (status = 'pending' AND (next_attempt_at IS NULL OR next_attempt_at <= ?))
+        OR (status = 'leased' AND lease_expires_at <= ?)
+    ORDER BY id
+    LIMIT ?
+)
+RETURNING id, recipient_handle, message_body, template_id, context, attempts
+"""
+
+_MARK_SENT: Final = """
+UPDATE outbox
+SET status = 'sent', lease_expires_at = NULL, next_attempt_at = NULL, last_error = NULL,
+    updated_at = ?
+WHERE id = ?
+"""
+
+_MARK_FAILED: Final = """
+UPDATE outbox
+SET status = ?, lease_expires_at = NULL, next_attempt_at = ?, last_error = ?, updated_at = ?
+WHERE id = ?
+"""
+
+_NEXT_DUE: Final = """
+SELECT MIN(COALESCE(next_attempt_at, 0)) FROM outbox WHERE status = 'pending'
+"""
+
+_RECOVER: Final = """
+UPDATE outbox SET status = 'pending', lease_expires_at = NULL, updated_at = ?
+WHERE status = 'leased'
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxEntry:
+    """A message to enqueue: either a message body or a template identifier and context."""
+
+    recipient_handle: str
+    message_body: str | None = None
+    template_id: str | None = None
+    context: Mapping[str, object] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxMessage:
+    """A leased outbox row handed to the drainer."""
+
+    id: int
+    recipient_handle: str
+    message_body: str | None
+    template_id: str | None
+    context: Mapping[str, object] | None
+    attempts: int
+
+
+@dataclass(frozen=True, slots=True)
+class DrainReport:
+    """Counts of what one :meth:`Outbox.drain` call did."""
+
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+class Outbox:
+    """SQLite-backed queue of messages awaiting delivery.
+
+    Parameters
+    ----------
+    database_path:
+        SQLite database file. It is created with the outbox schema if missing.
+    lease_seconds:
+        How long a claimed batch stays reserved for the drainer that claimed it.
+    max_attempts:
+        Send attempts before a message is left in the ``failed`` state.
+    retry_backoff:
+        Policy whose :meth:`~macpymessenger.retry.RetryPolicy.backoff` sets how long
+        a failed message waits before it can be claimed again. Its ``max_attempts``
+        and ``retryable`` are not used.
+    clock:
+        Wall-clock time source in seconds. Leases must survive process restarts,
+        so this is not a monotonic clock.
+    """
+
+    __slots__ = ("_clock", "_connection", "lease_seconds", "max_attempts", "retry_backoff")
+
+    def __init__(
+        self,
+        database_path: str | Path,
+        *,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_backoff: RetryPolicy = DEFAULT_RETRY_BACKOFF,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._clock = clock
+        self._connection = sqlite3.connect(database_path, autocommit=True)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def enqueue(self, recipient_handle: str, message_body: str) -> None:
+        """Queue *message_body* for *recipient_handle*."""
+        self.enqueue_many([OutboxEntry(recipient_handle, message_body=message_body)])
+
+    def enqueue_template(
+        self,
+        recipient_handle: str,
+        template_id: str,
+        context: Mapping[str, object] | None = None,
+    ) -> None:
+        """Queue a template send, rendered with *context* when drained."""
+        self.enqueue_many([OutboxEntry(recipient_handle, template_id=template_id, context=context)])
+
+    def enqueue_many(
+        self,
+        entries: Iterable[OutboxEntry],
+        *,
+        batch_size: int = DEFAULT_ENQUEUE_BATCH_SIZE,
+    ) -> int:
+        """Queue *entries* in transactions of *batch_size* rows and return how many were queued.
+
+        Raises
+        ------
+        OutboxError:
+            When an entry has both or neither of ``message_body`` and ``template_id``.
+        """
+        queued = 0
+        iterator = iter(entries)
+        while batch := list(islice(iterator, batch_size)):
+            now = self._clock()
+            rows = [self._entry_row(entry, now) for entry in batch]
+            with self._transaction():
+                self._connection.executemany(_INSERT, rows)
+            queued += len(rows)
+        return queued
+
+    def claim(self, limit: int) -> list[OutboxMessage]:
+        """Lease up to *limit* due pending messages, oldest first, and return them."""
+        now = self._clock()
+        rows = self._connection.execute(
+            _CLAIM, (now + self.lease_seconds, now, now, now, limit)
+        ).fetchall()
+        rows.sort()
+        return [
+            OutboxMessage(
+                id=row_id,
+                recipient_handle=recipient_handle,
+                message_body=message_body,
+                template_id=template_id,
+                context=json.loads(context) if context is not None else None,
+                attempts=attempts,
+            )
+            for row_id, recipient_handle, message_body, template_id, context, attempts in rows
+        ]
+
+    def mark_sent(self, message: OutboxMessage) -> None:
+        self._connection.execute(_MARK_SENT, (self._clock(), message.id))
+
+    def mark_failed(self, message: OutboxMessage, reason: str, *, permanent: bool = False) -> bool:
+        """Record a failed send. Return ``True`` if the message will be retried.
+
+        A retried message becomes claimable once the backoff for its attempt count
+        has passed.
+        """
+        now = self._clock()
+        retry = not permanent and message.attempts < self.max_attempts
+        if retry:
+            status, next_attempt_at = "pending", now + self.retry_backoff.backoff(message.attempts)
+        else:
+            status, next_attempt_at = "failed", None
+        self._connection.execute(_MARK_FAILED, (status, next_attempt_at, reason, now, message.id))
+        return retry
+
+    def seconds_until_next(self) -> float | None:
+        """Return the seconds until a pending message is claimable, or ``None`` if none is pending.
+
+        Returns ``0.0`` when a message can be claimed now. Leased messages are not
+        counted.
+        """
+        (next_due,) = self._connection.execute(_NEXT_DUE).fetchone()
+        if next_due is None:
+            return None
+        return max(0.0, next_due - self._clock())
+
+    def drain(
+        self,
+        delivery: MessageDelivery,
+        *,
+        template_manager: TemplateManager | None = None,
+        batch_size: int = 100,
+    ) -> DrainReport:
+        """Send queued messages until none are claimable.
+
+        Template messages are rendered with *template_manager*; a template failure,
+        or a template message with no *template_manager*, is permanent. Delivery
+        failures are retried once their backoff has passed, by a later drain, until
+        ``max_attempts`` is reached; :meth:`seconds_until_next` says when. Any other
+        exception stops the drain and leaves the current batch leased until its
+        lease expires.
+        """
+        sent = retried = failed = 0
+        while messages := self.claim(batch_size):
+            for message in messages:
+                try:
+                    message_body = self._message_body(message, template_manager)
+                except (TemplateError, OutboxError) as error:
+                    self.mark_failed(message, str(error), permanent=True)
+                    failed += 1
+                    continue
+                try:
+                    delivery.deliver(message.recipient_handle, message_body)
+                except MessageSendError as error:
+                    if self.mark_failed(message, str(error)):
+                        retried += 1
+                    else:
+                        failed += 1
+                    continue
+                self.mark_sent(message)
+                sent += 1
+        return DrainReport(sent=sent, retried=retried, failed=failed)
+
+    def recover(self) -> int:
+        """Return every leased message to the queue and return how many were released.
+
+        Call this on startup when this process is the only drainer, so messages
+        leased by a crashed run are retried without waiting for their leases.
+        """
+        return self._connection.execute(_RECOVER, (self._clock(),)).rowcount
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of messages in each state."""
+        rows = self._connection.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+        counts = {"pending": 0, "leased": 0, "sent": 0, "failed": 0}
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    @staticmethod
+    def _entry_row(
+        entry: OutboxEntry, now: float
+    ) -> tuple[str, str | None, str | None, str | None, float, float]:
+        if (entry.message_body is None) == (entry.template_id is None):
+            raise OutboxError.invalid_entry(entry.recipient_handle)
+        context = json.dumps(dict(entry.context)) if entry.context is not None else None
+        return (entry.recipient_handle, entry.message_body, entry.template_id, context, now, now)
+
+    @staticmethod
+    def _message_body(message: OutboxMessage, template_manager: TemplateManager | None) -> str:
+        if message.message_body is not None:
+            return message.message_body
+        template_id = message.template_id or ""
+        if template_manager is None:
+            raise OutboxError.template_manager_required(template_id)
+        return template_manager.render_template(template_id, message.context)
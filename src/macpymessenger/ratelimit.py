@@ -0,0 +1,231 @@
+"""Send rate limiting for macpymessenger.
+
+This module defines :class:`RateLimiter`, which spaces sends with token buckets:
+one global bucket and one bucket per recipient handle. A bucket holds up to
+``burst`` tokens and refills at ``per_second`` tokens per second; each send takes
+one token from every bucket that applies.
+
+Per-recipient buckets are kept in least-recently-used order. A bucket that has
+refilled completely holds no state a new bucket would not, so it is dropped;
+beyond ``max_recipients`` the least recently used bucket is dropped as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final, Self
+
+from .exceptions import InvalidRateLimitError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+__all__ = ["DEFAULT_MAX_TRACKED_RECIPIENTS", "RateLimit", "RateLimiter", "TokenBucket"]
+
+DEFAULT_MAX_TRACKED_RECIPIENTS: Final = 10_000
+"""Default number of per-recipient buckets a :class:`RateLimiter` keeps."""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """A sustained send rate with an allowance for bursts.
+
+    Raises
+    ------
+    InvalidRateLimitError:
+        When ``per_second`` is not positive or ``burst`` is less than one.
+    """
+
+    per_second: float
+    burst: float = 1.0
+
+    def __post_init__(self) -> None:
+        if not self.per_second > 0 or not self.burst >= 1:
+            raise InvalidRateLimitError
+
+    @classmethod
+    def per_minute(cls, sends: float, burst: float = 1.0) -> Self:
+        return cls(sends / 60, burst)
+
+
+class TokenBucket:
+    """Token bucket for one :class:`RateLimit`. Not thread-safe on its own."""
+
+    __slots__ = ("_tokens", "_updated", "limit")
+
+    def __init__(self, limit: RateLimit, now: float) -> None:
+        self.limit = limit
+        self._tokens = limit.burst
+        self._updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Return the seconds until a token is available, or ``0.0`` if one is."""
+        self._refill(now)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.limit.per_second
+
+    def consume(self, now: float) -> None:
+        """Take one token. Call only when :meth:`wait_time` returned ``0.0``."""
+        self._refill(now)
+        self._tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self._tokens >= self.limit.burst
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.limit.burst, self._tokens + elapsed * self.limit.per_second)
+            self._updated = now
+
+
+class RateLimiter:
+    """Limit sends globally and per recipient handle.
+
+    Parameters
+    ----------
+    global_limit:
+        Limit shared by every send. ``None`` disables the global bucket.
+    recipient_limit:
+        Limit applied to each recipient handle separately. ``None`` disables
+        per-recipient buckets.
+    max_recipients:
+        Most per-recipient buckets kept at once. When exceeded, the least recently
+        used bucket is dropped, which lets that recipient start a fresh burst.
+    clock:
+        Monotonic clock returning seconds. Tests substitute a fake clock.
+    sleep:
+        Sleep function used by :meth:`acquire`.
+    """
+
+    __slots__ = (
+        "_buckets",
+        "_global_bucket",
+        "_lock",
+        "_sleep",
+        "clock",
+        "global_limit",
+        "max_recipients",
+        "recipient_limit",
+    )
+
+    def __init__(
+        self,
+        global_limit: RateLimit | None = None,
+        recipient_limit: RateLimit | None = None,
+        *,
+        max_recipients: int = DEFAULT_MAX_TRACKED_RECIPIENTS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], object] = time.sleep,
+    ) -> None:
+        if (
+            isinstance(max_recipients, bool)
+            or not isinstance(max_recipients, int)
+            or max_recipients < 1
+        ):
+            raise InvalidRateLimitError
+        self.global_limit = global_limit
+        self.recipient_limit = recipient_limit
+        self.max_recipients = max_recipients
+        self.clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._global_bucket = TokenBucket(global_limit, clock()) if global_limit else None
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def wait_time(self, recipient_handle: str | None = None) -> float:
+        """Return the seconds until a send to *recipient_handle* would be allowed.
+
+        Without a recipient only the global bucket is considered.
+        """
+        with self._lock:
+            return self._wait_time(recipient_handle, self.clock())
+
+    def try_acquire(self, recipient_handle: str) -> bool:
+        """Take a send slot for *recipient_handle* if one is free now, without waiting."""
+        with self._lock:
+            now = self.clock()
+            if self._wait_time(recipient_handle, now) > 0:
+                return False
+            self._consume(recipient_handle, now)
+            return True
+
+    def acquire(self, recipient_handle: str, timeout: float | None = None) -> bool:
+        """Wait for a send slot for *recipient_handle* and take it.
+
+        Returns ``False`` without taking a slot when none would be free within
+        *timeout* seconds.
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait_seconds = self._take_or_wait(recipient_handle, deadline)
+            if wait_seconds is None:
+                return False
+            if wait_seconds == 0:
+                return True
+            self._sleep(wait_seconds)
+
+    async def acquire_async(self, recipient_handle: str, timeout: float | None = None) -> bool:
+        """Like :meth:`acquire`, but waits with :func:`asyncio.sleep`."""
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait_seconds = self._take_or_wait(recipient_handle, deadline)
+            if wait_seconds is None:
+                return False
+            if wait_seconds == 0:
+                return True
+            await asyncio.sleep(wait_seconds)
+
+    def tracked_recipients(self) -> int:
+        """Return the number of per-recipient buckets currently kept."""
+        with self._lock:
+            return len(self._buckets)
+
+    def _take_or_wait(self, recipient_handle: str, deadline: float | None) -> float | None:
+        """Take a slot and return ``0.0``, or return the wait, or ``None`` past *deadline*."""
+        with self._lock:
+            now = self.clock()
+            wait_seconds = self._wait_time(recipient_handle, now)
+            if wait_seconds <= 0:
+                self._consume(recipient_handle, now)
+                return 0.0
+        if deadline is not None and now + wait_seconds > deadline:
+            return None
+        return wait_seconds
+
+    def _wait_time(self, recipient_handle: str | None, now: float) -> float:
+        wait_seconds = 0.0
+        if self._global_bucket is not None:
+            wait_seconds = self._global_bucket.wait_time(now)
+        if recipient_handle is not None:
+            bucket = self._buckets.get(recipient_handle)
+            if bucket is not None:
+                wait_seconds = max(wait_seconds, bucket.wait_time(now))
+        return wait_seconds
+
+    def _consume(self, recipient_handle: str, now: float) -> None:
+        if self._global_bucket is not None:
+            self._global_bucket.consume(now)
+        if self.recipient_limit is None:
+            return
+        bucket = self._buckets.pop(recipient_handle, None)
+        if bucket is None:
+            bucket = TokenBucket(self.recipient_limit, now)
+        bucket.consume(now)
+        # Reinserting keeps the dict in least-recently-used order.
+        self._buckets[recipient_handle] = bucket
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        while buckets:
+            oldest_handle = next(iter(buckets))
+            if len(buckets) > self.max_recipients or buckets[oldest_handle].is_full(now):
+                del buckets[oldest_handle]
+            else:
+                break
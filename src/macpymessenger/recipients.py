@@ -0,0 +1,161 @@
+"""Recipient handle normalization for macpymessenger.
+
+Recipient lists often spell one handle several ways, for example
+``"+1 (555) 123-4567"`` and ``"5551234567"``. :func:`normalize_handle` maps a
+phone number to its E.164 form and an email address to lower case, so equal
+handles compare equal. :func:`plan_recipients` normalizes a whole list before a
+bulk send, keeping each recipient once in canonical form and reporting the
+duplicates it collapsed and the handles it rejected, so no ``osascript``
+process is started for either.
+
+Phone numbers without an international prefix get ``default_country_code``.
+Separators (spaces, dots, dashes and parentheses) are dropped, ``00`` is read
+as an international prefix, and a single national trunk ``0`` is removed,
+except for countries such as Italy where the leading ``0`` belongs to the number.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Final
+
+from .exceptions import InvalidRecipientHandleError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = [
+    "DEFAULT_COUNTRY_CODE",
+    "RecipientPlan",
+    "normalize_handle",
+    "plan_recipients",
+]
+
+DEFAULT_COUNTRY_CODE: Final = "1"
+"""Country calling code given to phone numbers written without one."""
+
+_CACHE_SIZE: Final = 65_536
+"""Distinct ``(handle, default_country_code)`` pairs kept by :func:`normalize_handle`."""
+
+_E164_MIN_DIGITS: Final = 8
+_E164_MAX_DIGITS: Final = 15
+_NATIONAL_NUMBER_DIGITS: Final = {"1": 10}
+"""National number lengths for country codes with a fixed numbering plan."""
+_KEEPS_LEADING_ZERO: Final = frozenset({"39", "378", "379"})
+"""Country codes without a trunk prefix, whose leading ``0`` is dialled internationally."""
+
+_COUNTRY_CODE_PATTERN: Final = re.compile(r"[1-9]\d{0,2}", re.ASCII)
+_PHONE_PATTERN: Final = re.compile(r"\+?[\d ().\-]+", re.ASCII)
+_EMAIL_PATTERN: Final = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s.]+")
+_SEPARATORS: Final = str.maketrans("", "", " ().-")
+
+
+@dataclass(frozen=True, slots=True)
+class RecipientPlan:
+    """Normalized recipients for one bulk send.
+
+    Attributes
+    ----------
+    recipients:
+        One canonical handle per distinct recipient, in order of first appearance.
+    duplicates:
+        ``(handle, canonical)`` for every input handle that repeated an earlier recipient.
+    rejected:
+        ``(handle, reason)`` for every input handle that could not be normalized.
+    """
+
+    recipients: tuple[str, ...]
+    duplicates: tuple[tuple[str, str], ...] = ()
+    rejected: tuple[tuple[str, str], ...] = ()
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def normalize_handle(handle: str, default_country_code: str = DEFAULT_COUNTRY_CODE) -> str:
+    """Return the canonical form of *handle*.
+
+    Parameters
+    ----------
+    handle:
+        Phone number or email address as written by the user.
+    default_country_code:
+        Country calling code, without ``+``, for phone numbers written without one.
+
+    Returns
+    -------
+    str
+        An E.164 phone number such as ``"+15551234567"``, or a lower-cased email address.
+
+    Raises
+    ------
+    InvalidRecipientHandleError:
+        When *handle* is neither a valid phone number nor a valid email address, or
+        *default_country_code* is not one to three digits.
+    """
+    if _COUNTRY_CODE_PATTERN.fullmatch(default_country_code) is None:
+        raise InvalidRecipientHandleError.invalid_country_code(default_country_code)
+    candidate = handle.strip()
+    if "@" in candidate:
+        if _EMAIL_PATTERN.fullmatch(candidate) is None:
+            raise InvalidRecipientHandleError.invalid_email(handle)
+        return candidate.lower()
+    if _PHONE_PATTERN.fullmatch(candidate) is None:
+        raise InvalidRecipientHandleError.invalid_phone_number(handle)
+    digits = candidate.translate(_SEPARATORS)
+    if digits.startswith("+"):
+        number = digits[1:]
+    elif digits.startswith("00"):
+        number = digits[2:]
+    else:
+        if default_country_code not in _KEEPS_LEADING_ZERO:
+            digits = digits.removeprefix("0")
+        number = _international_number(handle, digits, default_country_code)
+    if not _E164_MIN_DIGITS <= len(number) <= _E164_MAX_DIGITS or number.startswith("0"):
+        raise InvalidRecipientHandleError.invalid_phone_number(handle)
+    return f"+{number}"
+
+
+def _international_number(handle: str, national: str, country_code: str) -> str:
+    """Prefix *national* with *country_code* unless it already starts with it."""
+    expected = _NATIONAL_NUMBER_DIGITS.get(country_code)
+    if expected is None:
+        return country_code + national
+    if len(national) == expected + len(country_code) and national.startswith(country_code):
+        return national
+    if len(national) != expected:
+        raise InvalidRecipientHandleError.invalid_phone_number(handle)
+    return country_code + national
+
+
+def plan_recipients(
+    handles: Iterable[str], *, default_country_code: str = DEFAULT_COUNTRY_CODE
+) -> RecipientPlan:
+    """Normalize and deduplicate *handles* before a bulk send.
+
+    Pass :attr:`RecipientPlan.recipients` to ``send_bulk``; no command runs for
+    duplicates or rejected handles.
+
+    Raises
+    ------
+    InvalidRecipientHandleError:
+        When *default_country_code* is not one to three digits.
+    """
+    if _COUNTRY_CODE_PATTERN.fullmatch(default_country_code) is None:
+        raise InvalidRecipientHandleError.invalid_country_code(default_country_code)
+    seen: set[str] = set()
+    recipients: list[str] = []
+    duplicates: list[tuple[str, str]] = []
+    rejected: list[tuple[str, str]] = []
+    for handle in handles:
+        try:
+            canonical = normalize_handle(handle, default_country_code)
+        except InvalidRecipientHandleError as error:
+            rejected.append((handle, str(error)))
+            continue
+        if canonical in seen:
+            duplicates.append((handle, canonical))
+        else:
+            seen.add(canonical)
+            recipients.append(canonical)
+    return RecipientPlan(tuple(recipients), tuple(duplicates), tuple(rejected))
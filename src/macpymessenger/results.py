@@ -0,0 +1,222 @@
+"""Compact bulk send results for macpymessenger.
+
+This module defines :class:`BulkResult`, returned by ``send_bulk``. Instead of
+two lists of handle strings it keeps one status code, one error kind and one
+duration per input index in :mod:`array` buffers (six bytes per recipient), and
+refers to the caller's recipient sequence rather than copying it. Successful and
+failed handles are exposed as :class:`RecipientView` sequences computed on demand.
+
+For backward compatibility a result unpacks like the old return value::
+
+    successful, failed = client.send_bulk(numbers, "Hello")
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from enum import IntEnum
+from typing import TYPE_CHECKING, Final, overload
+
+from .exceptions import CircuitOpenError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .delivery import DeliveryOutcome
+    from .exceptions import MessageSendError
+
+__all__ = ["BulkResult", "ErrorKind", "RecipientView", "SendStatus"]
+
+_MAX_DURATION_US: Final = 2**32 - 1
+"""Largest duration an ``array('I')`` slot holds, about 71 minutes."""
+
+
+class SendStatus(IntEnum):
+    SENT = 0
+    FAILED = 1
+
+
+class ErrorKind(IntEnum):
+    """Why a send failed, derived from its :class:`MessageSendError`."""
+
+    NONE = 0
+    DELIVERY_FAILED = 1
+    COMMAND_FAILED = 2
+    CIRCUIT_OPEN = 3
+
+    @classmethod
+    def of(cls, error: MessageSendError | None) -> ErrorKind:
+        if error is None:
+            return cls.NONE
+        if isinstance(error, CircuitOpenError):
+            return cls.CIRCUIT_OPEN
+        if isinstance(error.__cause__, OSError):
+            return cls.COMMAND_FAILED
+        return cls.DELIVERY_FAILED
+
+
+class BulkResult:
+    """Per-recipient outcomes of a bulk send, stored in compact arrays.
+
+    Index ``i`` describes the ``i``-th input recipient. When the recipients were
+    given as a sequence the result refers to it instead of copying it, so the
+    sequence should not be modified afterwards.
+    """
+
+    __slots__ = ("_durations_us", "_error_kinds", "_failed_count", "_recipients", "_statuses")
+
+    def __init__(self, recipients: Sequence[str] | None = None) -> None:
+        self._recipients: Sequence[str] = recipients if recipients is not None else []
+        self._statuses = array("B")
+        self._error_kinds = array("B")
+        self._durations_us = array("I")
+        self._failed_count = 0
+
+    @classmethod
+    def from_outcomes(
+        cls,
+        outcomes: Iterable[DeliveryOutcome],
+        recipients: Sequence[str] | None = None,
+    ) -> BulkResult:
+        """Build a result from *outcomes*, one per recipient in input order.
+
+        When *recipients* is omitted the handles are collected from the outcomes.
+        """
+        collected: list[str] | None = None
+        if recipients is None:
+            collected = []
+            recipients = collected
+        result = cls(recipients)
+        statuses = result._statuses
+        error_kinds = result._error_kinds
+        durations_us = result._durations_us
+        failed_count = 0
+        for outcome in outcomes:
+            if collected is not None:
+                collected.append(outcome.recipient_handle)
+            if outcome.error is None:
+                statuses.append(SendStatus.SENT)
+                error_kinds.append(ErrorKind.NONE)
+            else:
+                statuses.append(SendStatus.FAILED)
+                error_kinds.append(ErrorKind.of(outcome.error))
+                failed_count += 1
+            durations_us.append(min(outcome.duration_us, _MAX_DURATION_US))
+        result._failed_count = failed_count
+        return result
+
+    def __len__(self) -> int:
+        return len(self._statuses)
+
+    def __iter__(self) -> Iterator[RecipientView]:
+        """Unpack as ``(successful, failed)``, like the former tuple of lists."""
+        yield self.successful
+        yield self.failed
+
+    def __repr__(self) -> str:
+        return (
+            f"BulkResult(total={len(self)}, succeeded={self.succeeded_count}, "
+            f"failed={self.failed_count})"
+        )
+
+    @property
+    def recipients(self) -> Sequence[str]:
+        return self._recipients
+
+    @property
+    def successful(self) -> RecipientView:
+        return RecipientView(self, SendStatus.SENT)
+
+    @property
+    def failed(self) -> RecipientView:
+        return RecipientView(self, SendStatus.FAILED)
+
+    @property
+    def succeeded_count(self) -> int:
+        return len(self._statuses) - self._failed_count
+
+    @property
+    def failed_count(self) -> int:
+        return self._failed_count
+
+    @property
+    def statuses(self) -> memoryview:
+        """Read-only view of the status code per input index."""
+        return memoryview(self._statuses).toreadonly()
+
+    @property
+    def error_kinds(self) -> memoryview:
+        """Read-only view of the :class:`ErrorKind` code per input index."""
+        return memoryview(self._error_kinds).toreadonly()
+
+    @property
+    def durations_us(self) -> memoryview:
+        """Read-only view of the send duration in microseconds per input index."""
+        return memoryview(self._durations_us).toreadonly()
+
+    def status(self, index: int) -> SendStatus:
+        return SendStatus(self._statuses[index])
+
+    def error_kind(self, index: int) -> ErrorKind:
+        return ErrorKind(self._error_kinds[index])
+
+    def duration_us(self, index: int) -> int:
+        return self._durations_us[index]
+
+
+class RecipientView(Sequence[str]):  # noqa: PLW1641 - unhashable, like list
+    """Recipient handles of a :class:`BulkResult` with one status, in input order.
+
+    Iteration walks the result's arrays without copying. Indexing builds an index
+    array on first use. A view compares equal to a list or view with the same
+    handles, so comparisons written against the former ``list[str]`` results keep
+    working.
+    """
+
+    __slots__ = ("_positions", "_result", "_status")
+
+    def __init__(self, result: BulkResult, status: SendStatus) -> None:
+        self._result = result
+        self._status = status
+        self._positions: array[int] | None = None
+
+    def __len__(self) -> int:
+        if self._status is SendStatus.FAILED:
+            return self._result.failed_count
+        return self._result.succeeded_count
+
+    def __iter__(self) -> Iterator[str]:
+        status = self._status
+        for handle, handle_status in zip(
+            self._result.recipients, self._result._statuses, strict=False
+        ):
+            if handle_status == status:
+                yield handle
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        positions = self._positions
+        if positions is None:
+            statuses = self._result._statuses
+            positions = array("Q", (i for i, code in enumerate(statuses) if code == self._status))
+            self._positions = positions
+        recipients = self._result.recipients
+        if isinstance(index, slice):
+            return [recipients[position] for position in positions[index]]
+        return recipients[positions[index]]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RecipientView | list):
+            return len(self) == len(other) and all(
+                mine == theirs for mine, theirs in zip(self, other, strict=True)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
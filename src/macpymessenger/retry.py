@@ -0,0 +1,194 @@
+"""Retry and circuit breaking for macpymessenger.
+
+This module defines :class:`RetryPolicy`, which decides whether and when a failed
+send command is run again, and :class:`CircuitBreaker`, which stops sending after
+a run of failures. While the breaker is open, sends fail at once with
+:class:`~macpymessenger.exceptions.CircuitOpenError` instead of starting an
+``osascript`` process that is bound to fail, for example while Messages is
+signed out. After ``recovery_seconds`` one trial send is let through; its result
+closes the breaker or opens it again.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from .exceptions import CircuitOpenError, InvalidRetryPolicyError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+__all__ = ["CircuitBreaker", "CircuitState", "RetryPolicy"]
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """How often and how soon a failed send command is retried.
+
+    The wait before retry ``n`` is ``initial_backoff * multiplier ** (n - 1)``,
+    capped at ``max_backoff``. With ``jitter`` the wait is drawn uniformly between
+    zero and that value, so clients that failed together do not retry together.
+
+    Raises
+    ------
+    InvalidRetryPolicyError:
+        When ``max_attempts`` is not a positive ``int``, a backoff is negative, or
+        ``multiplier`` is below one.
+    """
+
+    max_attempts: int = 3
+    initial_backoff: float = 0.5
+    max_backoff: float = 30.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    retryable: tuple[type[BaseException], ...] = (subprocess.CalledProcessError, OSError)
+
+    def __post_init__(self) -> None:
+        if (
+            isinstance(self.max_attempts, bool)
+            or not isinstance(self.max_attempts, int)
+            or self.max_attempts < 1
+        ):
+            raise InvalidRetryPolicyError
+        if self.initial_backoff < 0 or self.max_backoff < 0 or self.multiplier < 1:
+            raise InvalidRetryPolicyError
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Return whether *error* from attempt number *attempt* is worth another try."""
+        return attempt < self.max_attempts and isinstance(error, self.retryable)
+
+    def backoff(self, attempt: int) -> float:
+        """Return the seconds to wait after attempt number *attempt* failed."""
+        delay = min(self.max_backoff, self.initial_backoff * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, delay)  # noqa: S311 - not used for security
+        return delay
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail sends fast after repeated failures.
+
+    Parameters
+    ----------
+    failure_threshold:
+        Consecutive failed send commands that open the breaker.
+    recovery_seconds:
+        Seconds the breaker stays open before letting one trial send through.
+    logger:
+        Logger that receives a warning for every state change.
+    clock:
+        Monotonic clock returning seconds. Tests substitute a fake clock.
+    """
+
+    __slots__ = (
+        "_consecutive_failures",
+        "_lock",
+        "_opened_at",
+        "_state",
+        "_trial_in_flight",
+        "clock",
+        "failure_threshold",
+        "logger",
+        "recovery_seconds",
+    )
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_seconds: float = 30.0,
+        *,
+        logger: logging.Logger | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if (
+            isinstance(failure_threshold, bool)
+            or not isinstance(failure_threshold, int)
+            or failure_threshold < 1
+            or recovery_seconds < 0
+        ):
+            raise InvalidRetryPolicyError
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._state
+
+    def before_send(self, recipient_handle: str) -> None:
+        """Let a send through or raise :class:`CircuitOpenError`.
+
+        Once ``recovery_seconds`` have passed the breaker turns half-open and lets a
+        single trial send through; other sends fail until the trial reports back.
+        """
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return
+            remaining = self._opened_at + self.recovery_seconds - self.clock()
+            if self._state is CircuitState.OPEN and remaining <= 0:
+                self._transition(CircuitState.HALF_OPEN)
+            if self._state is CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError.circuit_open(recipient_handle)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+            if self._state is not CircuitState.CLOSED:
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._trial_in_flight = False
+            if self._state is CircuitState.HALF_OPEN or (
+                self._state is CircuitState.CLOSED
+                and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._opened_at = self.clock()
+                self._transition(CircuitState.OPEN)
+
+    def record_aborted(self) -> None:
+        """Release the half-open trial of a send that ended without succeeding or failing.
+
+        Called when a send is cancelled or raises something other than a command
+        failure, so the next send can become the trial instead of the breaker
+        staying open until :meth:`reset`.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def reset(self) -> None:
+        """Close the breaker and forget past failures."""
+        self.record_success()
+
+    def _transition(self, state: CircuitState) -> None:
+        self.logger.warning(
+            "Circuit breaker %s -> %s after %d consecutive failures",
+            self._state,
+            state,
+            self._consecutive_failures,
+        )
+        self._state = state
@@ -0,0 +1,289 @@
+"""Delayed message delivery for macpymessenger.
+
+This module defines :class:`DeliveryScheduler`, which owns delayed sends in
+process instead of passing the delay to the send script. Pending sends sit in a
+heap ordered by due time, and the command runner only starts once a send is
+due, so a waiting message holds no ``osascript`` process or worker thread.
+
+Cancellation is lazy: a cancelled send stays in the heap until it reaches the
+front and is then discarded, so cancelling is constant time. Once cancelled
+sends make up more than half of the heap, it is rebuilt without them, so mass
+cancellation cannot grow the heap without bound.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Self
+
+from .delivery import MessageDelivery
+from .exceptions import DispatcherError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Executor
+    from types import TracebackType
+
+__all__ = ["DeliveryScheduler", "ScheduledSend"]
+
+
+class ScheduledSend:
+    """Handle for a send queued on a :class:`DeliveryScheduler`.
+
+    The handle's :attr:`future` resolves to ``None`` once the message is sent, or
+    to the :class:`~macpymessenger.exceptions.MessageSendError` raised by delivery.
+    """
+
+    __slots__ = ("_scheduler", "due_at", "future", "message_body", "recipient_handle")
+
+    def __init__(
+        self,
+        scheduler: DeliveryScheduler,
+        recipient_handle: str,
+        message_body: str,
+        due_at: float,
+    ) -> None:
+        self._scheduler = scheduler
+        self.recipient_handle = recipient_handle
+        self.message_body = message_body
+        self.due_at = due_at
+        self.future: Future[None] = Future()
+
+    def cancel(self) -> bool:
+        """Cancel the send if it has not started. Return ``True`` when cancelled."""
+        return self._scheduler._cancel(self)
+
+    def cancelled(self) -> bool:
+        return self.future.cancelled()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def seconds_remaining(self) -> float:
+        """Return the seconds until the send is due, or ``0.0`` once it is due."""
+        return max(0.0, self.due_at - self._scheduler.clock())
+
+    def result(self, timeout: float | None = None) -> None:
+        """Wait for the send and re-raise its delivery failure, if any."""
+        self.future.result(timeout)
+
+
+class DeliveryScheduler:
+    """Run delayed sends through :class:`~macpymessenger.delivery.MessageDelivery`.
+
+    Call :meth:`start` to dispatch due sends from a background thread, or call
+    :meth:`run_due` to dispatch them from the caller's thread.
+
+    Parameters
+    ----------
+    delivery:
+        Delivery used for each send once it is due. Sends are delivered with no
+        further delay.
+    executor:
+        Optional executor that runs due sends. By default sends run one at a time
+        on the dispatching thread.
+    clock:
+        Monotonic clock returning seconds. Tests substitute a fake clock.
+    """
+
+    __slots__ = (
+        "_condition",
+        "_delivery",
+        "_executor",
+        "_heap",
+        "_pending",
+        "_sequence",
+        "_stopped",
+        "_thread",
+        "clock",
+    )
+
+    def __init__(
+        self,
+        delivery: MessageDelivery,
+        *,
+        executor: Executor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._delivery = delivery
+        self._executor = executor
+        self.clock = clock
+        self._condition = threading.Condition()
+        self._heap: list[tuple[float, int, ScheduledSend]] = []
+        self._sequence = itertools.count()
+        self._pending = 0
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def schedule(
+        self,
+        recipient_handle: str,
+        message_body: str,
+        delay_seconds: object = 0,
+    ) -> ScheduledSend:
+        """Queue *message_body* for *recipient_handle* after *delay_seconds*.
+
+        Raises
+        ------
+        InvalidDelayTypeError:
+            When ``delay_seconds`` is not a plain ``int``.
+        NegativeDelayError:
+            When ``delay_seconds`` is negative.
+        DispatcherError:
+            When the scheduler has been shut down.
+        """
+        delay_value = MessageDelivery._validate_delay(delay_seconds)
+        scheduled = ScheduledSend(self, recipient_handle, message_body, self.clock() + delay_value)
+        with self._condition:
+            if self._stopped:
+                raise DispatcherError.closed()
+            heapq.heappush(self._heap, (scheduled.due_at, next(self._sequence), scheduled))
+            self._pending += 1
+            if self._heap[0][2] is scheduled:
+                self._condition.notify()
+        return scheduled
+
+    def pending_count(self) -> int:
+        """Return the number of sends that are queued and not cancelled."""
+        with self._condition:
+            return self._pending
+
+    def seconds_until_next(self) -> float | None:
+        """Return the seconds until the next pending send is due, or ``None`` if idle."""
+        with self._condition:
+            self._discard_cancelled()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - self.clock())
+
+    def run_due(self) -> int:
+        """Dispatch every send that is due now and return how many were dispatched."""
+        dispatched = 0
+        while True:
+            with self._condition:
+                scheduled = self._pop_due()
+            if scheduled is None:
+                return dispatched
+            self._dispatch(scheduled)
+            dispatched += 1
+
+    def start(self) -> None:
+        """Start the background thread that dispatches sends as they become due.
+
+        Raises
+        ------
+        DispatcherError:
+            When the scheduler has been shut down.
+        """
+        with self._condition:
+            if self._stopped:
+                raise DispatcherError.closed()
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="macpymessenger-scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def shutdown(self, *, cancel_pending: bool = True) -> None:
+        """Stop the background thread and stop accepting sends.
+
+        With ``cancel_pending`` the queued sends are cancelled. Otherwise the call
+        waits until every queued send has been dispatched.
+        """
+        with self._condition:
+            if cancel_pending:
+                for _, _, scheduled in self._heap:
+                    scheduled.future.cancel()
+                self._heap.clear()
+                self._pending = 0
+            self._stopped = True
+            self._condition.notify_all()
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join()
+        if not cancel_pending:
+            self.drain()
+
+    def drain(self) -> None:
+        """Dispatch every queued send from the caller's thread, waiting until each is due."""
+        while (remaining := self.seconds_until_next()) is not None:
+            if remaining > 0:
+                time.sleep(remaining)
+            self.run_due()
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.shutdown()
+
+    def _cancel(self, scheduled: ScheduledSend) -> bool:
+        with self._condition:
+            if scheduled.future.cancelled():
+                return True
+            if not scheduled.future.cancel():
+                return False
+            self._pending -= 1
+            # Every entry in the heap is either pending or cancelled.
+            if len(self._heap) - self._pending > self._pending:
+                self._heap = [entry for entry in self._heap if not entry[2].future.cancelled()]
+                heapq.heapify(self._heap)
+            self._condition.notify()
+            return True
+
+    def _discard_cancelled(self) -> None:
+        heap = self._heap
+        while heap and heap[0][2].future.cancelled():
+            heapq.heappop(heap)
+
+    def _pop_due(self) -> ScheduledSend | None:
+        """Pop the next due send and mark it running so it can no longer be cancelled."""
+        now = self.clock()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, scheduled = heapq.heappop(self._heap)
+            if scheduled.future.set_running_or_notify_cancel():
+                self._pending -= 1
+                return scheduled
+        return None
+
+    def _dispatch(self, scheduled: ScheduledSend) -> None:
+        if self._executor is None:
+            self._deliver(scheduled)
+        else:
+            self._executor.submit(self._deliver, scheduled)
+
+    def _deliver(self, scheduled: ScheduledSend) -> None:
+        try:
+            self._delivery.deliver(scheduled.recipient_handle, scheduled.message_body)
+        except Exception as error:  # noqa: BLE001 - surfaced through the future
+            scheduled.future.set_exception(error)
+        else:
+            scheduled.future.set_result(None)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    self._discard_cancelled()
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    wait_seconds = self._heap[0][0] - self.clock()
+                    if wait_seconds <= 0:
+                        break
+                    self._condition.wait(wait_seconds)
+                if self._stopped:
+                    return
+            self.run_due()
@@ -0,0 +1,362 @@
+"""Multi-process sharded delivery for macpymessenger.
+
+:class:`ShardedDispatcher` starts ``shards`` worker processes, each with its own
+:class:`~macpymessenger.delivery.MessageDelivery` and command runner, and
+assigns every message to a shard by a stable hash of its recipient handle.
+Each shard sends its messages one at a time in the order it received them, so
+messages to one recipient handle are delivered in submission order while
+different recipients are sent in parallel.
+
+Outcomes and retry counts stream back to the parent process as shards finish
+them and are logged there, through one logger, rather than by the workers. Errors keep
+their type and cause across the process boundary. :meth:`ShardedDispatcher.close`
+lets every shard finish the messages it was given before the workers exit.
+
+Handles are hashed as given; normalize them first, for example with
+:func:`~macpymessenger.recipients.plan_recipients`, so that two spellings of one
+recipient land on the same shard.
+"""
+
+from __future__ import annotations
+
+import copyreg
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import subprocess
+import time
+import zlib
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Final, Self
+
+from .commands import SubprocessCommandRunner
+from .delivery import DeliveryOutcome, MessageDelivery, _elapsed_us
+from .exceptions import DispatcherError, InvalidConcurrencyError, MessageSendError
+from .results import BulkResult
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from multiprocessing.context import SpawnProcess
+    from types import TracebackType
+
+    from .bulklog import BulkLogger, BulkLogPolicy
+    from .commands import CommandRunner
+    from .configuration import Configuration
+    from .retry import RetryPolicy
+
+__all__ = ["DEFAULT_PENDING_PER_SHARD", "ShardedDispatcher", "shard_of"]
+
+DEFAULT_PENDING_PER_SHARD: Final = 32
+"""Messages queued per shard before :meth:`ShardedDispatcher.dispatch` waits for results."""
+
+_POLL_SECONDS: Final = 0.2
+"""How often a parent waiting for results checks that every shard is still running."""
+
+_SHUTDOWN_TIMEOUT_SECONDS: Final = 5.0
+
+# A request is (index, recipient handle, message body); None stops the shard.
+_Request = tuple[int, str, str] | None
+# A result is (index, recipient handle, error, its cause, duration in microseconds,
+# retried commands); a shard that has stopped answers with its shard number alone.
+_Outcome = tuple[int, str, MessageSendError | None, BaseException | None, int, int]
+_Result = _Outcome | int
+
+
+def shard_of(recipient_handle: str, shards: int) -> int:
+    """Return the shard that sends to *recipient_handle*, stable across processes and runs."""
+    return zlib.crc32(recipient_handle.encode()) % shards
+
+
+def _reduce_called_process_error(
+    error: subprocess.CalledProcessError,
+) -> tuple[type[subprocess.CalledProcessError], tuple[object, ...]]:
+    # CalledProcessError does not pass its arguments to BaseException, so the
+    # default reduction cannot recreate it.
+    return type(error), (error.returncode, error.cmd, error.output, error.stderr)
+
+
+def _portable_cause(error: MessageSendError) -> BaseException | None:
+    """Return the cause of *error*, or a stand-in if it does not survive pickling."""
+    cause = error.__cause__
+    if cause is None:
+        return None
+    try:
+        pickle.loads(pickle.dumps(cause))  # noqa: S301 - our own data
+    except Exception:  # noqa: BLE001 - any exception can fail to pickle
+        return RuntimeError(f"{type(cause).__name__}: {cause}")
+    return cause
+
+
+def _run_shard(  # noqa: PLR0913, PLR0917 - process entry point
+    shard: int,
+    configuration: Configuration,
+    runner_factory: Callable[[], CommandRunner],
+    retry_policy: RetryPolicy | None,
+    requests: multiprocessing.Queue[_Request],
+    results: multiprocessing.Queue[_Result],
+) -> None:
+    """Send each request in order until told to stop. Runs in a worker process."""
+    copyreg.pickle(subprocess.CalledProcessError, _reduce_called_process_error)
+    retries = [0]
+
+    def count_retry() -> None:
+        retries[0] += 1
+
+    delivery = MessageDelivery(
+        configuration,
+        runner_factory(),
+        logging.getLogger(f"{__name__}.shard{shard}"),
+        retry_policy=retry_policy,
+    ).without_outcome_logging(on_retry=count_retry)
+    while (request := requests.get()) is not None:
+        index, recipient_handle, message_body = request
+        retries[0] = 0
+        started = time.perf_counter_ns()
+        try:
+            delivery.deliver(recipient_handle, message_body)
+        except MessageSendError as error:
+            # Pickling drops __cause__, so it travels next to the error.
+            cause = _portable_cause(error)
+            duration_us = _elapsed_us(started)
+            results.put((index, recipient_handle, error, cause, duration_us, retries[0]))
+        else:
+            duration_us = _elapsed_us(started)
+            results.put((index, recipient_handle, None, None, duration_us, retries[0]))
+    results.put(shard)
+
+
+class ShardedDispatcher:
+    """Sends messages from a pool of worker processes, keeping per-recipient order.
+
+    Workers are started by the constructor with the ``spawn`` start method. Use the
+    dispatcher as a context manager, or call :meth:`close`, to stop them. A
+    dispatcher runs one :meth:`dispatch` or :meth:`send_bulk` at a time.
+
+    Parameters
+    ----------
+    configuration:
+        Resolved configuration passed to every worker.
+    shards:
+        Number of worker processes. Defaults to the number of CPUs.
+    runner_factory:
+        Picklable callable, such as a class or module-level function, that each
+        worker calls once to create its command runner. Defaults to
+        :class:`~macpymessenger.commands.SubprocessCommandRunner`.
+    retry_policy:
+        Optional :class:`~macpymessenger.retry.RetryPolicy` applied in every worker.
+    logger:
+        Logger for the outcome of every send, written by the parent process.
+    bulk_logging:
+        Optional :class:`~macpymessenger.bulklog.BulkLogPolicy`. When set, outcomes are
+        logged as summaries, samples and deduplicated tracebacks instead.
+    pending_per_shard:
+        Messages submitted per shard before :meth:`dispatch` waits for results, which
+        bounds memory and queue depth for any campaign size.
+
+    Raises
+    ------
+    InvalidConcurrencyError
+        If ``shards`` or ``pending_per_shard`` is not a positive ``int``.
+    """
+
+    __slots__ = (
+        "_bulk_logging",
+        "_closed",
+        "_logger",
+        "_pending",
+        "_processes",
+        "_requests",
+        "_results",
+        "max_pending",
+        "shards",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        configuration: Configuration,
+        *,
+        shards: int | None = None,
+        runner_factory: Callable[[], CommandRunner] = SubprocessCommandRunner,
+        retry_policy: RetryPolicy | None = None,
+        logger: logging.Logger | None = None,
+        bulk_logging: BulkLogPolicy | None = None,
+        pending_per_shard: int = DEFAULT_PENDING_PER_SHARD,
+    ) -> None:
+        shards = (os.cpu_count() or 1) if shards is None else shards
+        for count in (shards, pending_per_shard):
+            if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+                raise InvalidConcurrencyError
+        self.shards = shards
+        self.max_pending = shards * pending_per_shard
+        self._logger = logger if logger is not None else logging.getLogger(__name__)
+        self._bulk_logging = bulk_logging
+        self._pending = 0
+        self._closed = False
+
+        context = multiprocessing.get_context("spawn")
+        self._results: multiprocessing.Queue[_Result] = context.Queue()
+        self._requests: list[multiprocessing.Queue[_Request]] = []
+        self._processes: list[SpawnProcess] = []
+        for shard in range(shards):
+            requests: multiprocessing.Queue[_Request] = context.Queue()
+            process = context.Process(
+                target=_run_shard,
+                args=(shard, configuration, runner_factory, retry_policy, requests, self._results),
+                name=f"macpymessenger-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            self._requests.append(requests)
+            self._processes.append(process)
+
+    def dispatch(
+        self, messages: Iterable[tuple[str, str]]
+    ) -> Iterator[tuple[int, DeliveryOutcome]]:
+        """Send ``(recipient_handle, message_body)`` pairs and yield outcomes as they finish.
+
+        Each outcome is paired with the index of its message in *messages*. Outcomes for
+        one recipient handle arrive in input order; outcomes for different handles may
+        arrive in any order. *messages* is read only as the pending window allows.
+
+        Raises
+        ------
+        DispatcherError
+            If the dispatcher is closed, or a worker process exits unexpectedly.
+        """
+        if self._closed:
+            raise DispatcherError.closed()
+        self._drain()
+        bulk_logger = self._bulk_logger()
+        try:
+            for index, (recipient_handle, message_body) in enumerate(messages):
+                while self._pending >= self.max_pending:
+                    yield self._receive(bulk_logger)
+                shard = shard_of(recipient_handle, self.shards)
+                self._requests[shard].put((index, recipient_handle, message_body))
+                self._pending += 1
+            while self._pending:
+                yield self._receive(bulk_logger)
+        finally:
+            if bulk_logger is not None:
+                bulk_logger.finish()
+
+    def send_bulk(self, phone_numbers: Iterable[str], message: str) -> BulkResult:
+        """Send *message* to every recipient and return the results in input order.
+
+        Raises
+        ------
+        DispatcherError
+            As for :meth:`dispatch`.
+        """
+        received: dict[int, DeliveryOutcome] = dict(
+            self.dispatch((number, message) for number in phone_numbers)
+        )
+        outcomes = (received[index] for index in range(len(received)))
+        recipients = phone_numbers if isinstance(phone_numbers, Sequence) else None
+        return BulkResult.from_outcomes(outcomes, recipients)
+
+    def close(self) -> None:
+        """Let every shard finish its queued messages, then stop the worker processes.
+
+        Outcomes of messages whose :meth:`dispatch` iterator was abandoned are logged
+        and discarded.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for requests in self._requests:
+            requests.put(None)
+        try:
+            stopped: set[int] = set()
+            while self._pending or len(stopped) < self.shards:
+                result = self._next_result(stopped)
+                if isinstance(result, int):
+                    stopped.add(result)
+                else:
+                    self._outcome(result, None)
+        except DispatcherError as error:
+            self._logger.error("%s Outcomes of %d messages are lost.", error, self._pending)  # noqa: TRY400 - the exit is the whole story
+            self._pending = 0
+        finally:
+            for process in self._processes:
+                process.join(_SHUTDOWN_TIMEOUT_SECONDS)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+            for channel in (*self._requests, self._results):
+                channel.close()
+                channel.join_thread()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _bulk_logger(self) -> BulkLogger | None:
+        if self._bulk_logging is None:
+            return None
+        from .bulklog import BulkLogger  # noqa: PLC0415 - only for bulk_logging
+
+        return BulkLogger(self._logger, self._bulk_logging)
+
+    def _drain(self) -> None:
+        """Receive the outcomes left over from an abandoned :meth:`dispatch`."""
+        while self._pending:
+            self._receive(None)
+
+    def _receive(self, bulk_logger: BulkLogger | None) -> tuple[int, DeliveryOutcome]:
+        result = self._next_result(set())
+        if isinstance(result, int):
+            # Shards only stop when told to by close().
+            raise DispatcherError.shard_exited(result, 0)
+        return self._outcome(result, bulk_logger)
+
+    def _outcome(
+        self,
+        result: _Outcome,
+        bulk_logger: BulkLogger | None,
+    ) -> tuple[int, DeliveryOutcome]:
+        index, recipient_handle, error, cause, duration_us, retries = result
+        self._pending -= 1
+        if error is not None:
+            error.__cause__ = cause
+        outcome = DeliveryOutcome(recipient_handle, error, duration_us)
+        if bulk_logger is not None:
+            if retries:
+                bulk_logger.count_retry(retries)
+            bulk_logger.observe(outcome)
+            return index, outcome
+        if retries:
+            self._logger.warning("Send to %s was retried %d times", recipient_handle, retries)
+        if error is None:
+            self._logger.info("Message sent to %s", recipient_handle)
+        else:
+            self._logger.error("Failed to send message to %s", recipient_handle, exc_info=error)
+        return index, outcome
+
+    def _next_result(self, stopped: set[int]) -> _Result:
+        """Wait for the next result, failing if a shard not in *stopped* has exited."""
+        while True:
+            try:
+                return self._results.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                exited = [
+                    (shard, process.exitcode)
+                    for shard, process in enumerate(self._processes)
+                    if process.exitcode is not None and shard not in stopped
+                ]
+            if exited:
+                # A shard's last results can still be in the pipe when it exits.
+                try:
+                    return self._results.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    shard, exitcode = exited[0]
+                    raise DispatcherError.shard_exited(shard, exitcode) from None
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Mapping, MutableMapping
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableMapping
 from dataclasses import dataclass
 from string.templatelib import Interpolation, Template, convert
 
 from .exceptions import TemplateAlreadyExistsError, TemplateNotFoundError, TemplateTypeError
+from .tracing import active_tracer, trace_span
 
 TemplateCallable = Callable[..., Template]
+RenderErrorHandler = Callable[[int, TemplateTypeError], None]
 
 
 @dataclass(frozen=True, slots=True)
@@ -47,41 +49,159 @@ def _process_template(template: Template) -> str:
     return "".join(parts)
 
 
+class _CompiledTemplate:
+    """A template factory paired with a render plan for the t-string it returns.
+
+    The plan is built from the first template the factory returns and reused while
+    the factory keeps returning the same static strings. It keeps the static strings
+    in place, so a render only fills in the interpolated values. Values that are
+    exactly ``str`` with the expected conversion take the fast path: conversions are
+    applied only when present and ``format`` only runs for a non-empty format spec.
+    Anything else is rendered by :func:`_process_template`, which also raises the
+    usual :class:`TemplateTypeError`.
+    """
+
+    __slots__ = ("_plan", "factory")
+
+    def __init__(self, factory: TemplateCallable) -> None:
+        self.factory = factory
+        self._plan: tuple[tuple[str, ...], tuple[str | None, ...], list[str]] | None = None
+
+    def render(self, template: Template) -> str:
+        strings = template.strings
+        plan = self._plan
+        if plan is None or (strings is not plan[0] and strings != plan[0]):
+            plan = self._compile(template)
+        _, conversions, static_parts = plan
+        parts = static_parts.copy()
+        position = 1
+        for interpolation, conversion in zip(template.interpolations, conversions, strict=True):
+            value = interpolation.value
+            if value.__class__ is not str or interpolation.conversion != conversion:
+                return _process_template(template)
+            if conversion is not None:
+                value = convert(value, conversion)
+            format_spec = interpolation.format_spec
+            if format_spec:
+                value = format(value, format_spec)
+            parts[position] = value
+            position += 2
+        return "".join(parts)
+
+    def _compile(
+        self, template: Template
+    ) -> tuple[tuple[str, ...], tuple[str | None, ...], list[str]]:
+        strings = template.strings
+        static_parts = [""] * (2 * len(strings) - 1)
+        static_parts[::2] = strings
+        conversions = tuple(interpolation.conversion for interpolation in template.interpolations)
+        plan = (strings, conversions, static_parts)
+        # One assignment, so concurrent renders never see a partly built plan.
+        self._plan = plan
+        return plan
+
+
 class TemplateManager:
     """Manages message templates using callables that return t-strings."""
 
     def __init__(self) -> None:
         self._templates: MutableMapping[str, TemplateCallable] = {}
+        self._compiled: dict[str, _CompiledTemplate] = {}
 
     def create_template(self, identifier: str, factory: TemplateCallable) -> None:
         if identifier in self._templates:
             raise TemplateAlreadyExistsError.duplicate_identifier(identifier)
         self._templates[identifier] = factory
+        self._compiled[identifier] = _CompiledTemplate(factory)
 
     def update_template(self, identifier: str, factory: TemplateCallable) -> None:
         if identifier not in self._templates:
             raise TemplateNotFoundError.missing_identifier(identifier)
         self._templates[identifier] = factory
+        self._compiled[identifier] = _CompiledTemplate(factory)
 
     def delete_template(self, identifier: str) -> None:
         if identifier not in self._templates:
             raise TemplateNotFoundError.missing_identifier(identifier)
         del self._templates[identifier]
+        del self._compiled[identifier]
 
     def render_template(
         self,
         identifier: str,
         context: Mapping[str, object] | None = None,
     ) -> str:
+        tracer = active_tracer()
+        if tracer is None:
+            return self._render_template(identifier, context)
+        with trace_span(tracer, "macpymessenger.render", template_id=identifier):
+            return self._render_template(identifier, context)
+
+    def _render_template(self, identifier: str, context: Mapping[str, object] | None) -> str:
         try:
-            factory = self._templates[identifier]
+            compiled = self._compiled[identifier]
         except KeyError as error:
             raise TemplateNotFoundError.missing_identifier(identifier) from error
         kwargs = dict(context) if context is not None else {}
-        template = factory(**kwargs)
+        template = compiled.factory(**kwargs)
         if not isinstance(template, Template):
             raise TemplateTypeError.invalid_factory_return()
-        return _process_template(template)
+        return compiled.render(template)
+
+    def render_many(
+        self,
+        identifier: str,
+        contexts: Iterable[Mapping[str, object]],
+        *,
+        on_error: RenderErrorHandler | None = None,
+    ) -> Iterator[str]:
+        """Render *identifier* once per context and yield the results lazily.
+
+        The factory is looked up once and each context is passed to it without
+        being copied, so rendering a large iterable runs in constant memory.
+
+        Parameters
+        ----------
+        identifier:
+            Template to render.
+        contexts:
+            Context mappings, consumed one at a time.
+        on_error:
+            Called with the zero-based context index and the error when a context
+            raises :class:`TemplateTypeError`; that context is skipped. When omitted
+            the error propagates and rendering stops.
+
+        Raises
+        ------
+        TemplateNotFoundError:
+            Immediately, when *identifier* does not exist.
+        """
+        try:
+            compiled = self._compiled[identifier]
+        except KeyError as error:
+            raise TemplateNotFoundError.missing_identifier(identifier) from error
+        return self._render_many(compiled, contexts, on_error)
+
+    @staticmethod
+    def _render_many(
+        compiled: _CompiledTemplate,
+        contexts: Iterable[Mapping[str, object]],
+        on_error: RenderErrorHandler | None,
+    ) -> Iterator[str]:
+        factory = compiled.factory
+        render = compiled.render
+        for index, context in enumerate(contexts):
+            try:
+                template = factory(**context)
+                if not isinstance(template, Template):
+                    raise TemplateTypeError.invalid_factory_return()
+                rendered = render(template)
+            except TemplateTypeError as error:
+                if on_error is None:
+                    raise
+                on_error(index, error)
+                continue
+            yield rendered
 
     def compose_template(
         self,
@@ -0,0 +1,144 @@
+"""Tracing hooks for macpymessenger.
+
+A :class:`Tracer` registered with :func:`set_tracer` is called when each of
+these spans starts and ends:
+
+- ``macpymessenger.render`` around :meth:`TemplateManager.render_template
+  <macpymessenger.templates.TemplateManager.render_template>`, with the
+  ``template_id`` attribute;
+- ``macpymessenger.deliver`` around :meth:`MessageDelivery.deliver
+  <macpymessenger.delivery.MessageDelivery.deliver>` and its async and
+  attachment variants, with the ``recipient`` attribute;
+- ``macpymessenger.command`` around every command runner call, including
+  retries and batch invocations, with ``recipient`` (or ``recipients`` for a
+  batch) and ``attempt``.
+
+Spans nest in that order on the calling thread or task. With no tracer
+registered, instrumented code checks one global and runs unchanged.
+:class:`OpenTelemetryTracer` forwards spans to an OpenTelemetry tracer.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+    from contextlib import AbstractContextManager
+
+__all__ = [
+    "OpenTelemetryTracer",
+    "Span",
+    "Tracer",
+    "active_tracer",
+    "set_tracer",
+    "trace_span",
+]
+
+AttributeValue = str | int | float | bool
+
+
+@dataclass(slots=True)
+class Span:
+    """One traced operation, passed to :meth:`Tracer.on_start` and :meth:`Tracer.on_end`."""
+
+    name: str
+    attributes: dict[str, AttributeValue]
+    start_ns: int = field(default_factory=time.perf_counter_ns)
+    duration_ns: int | None = None
+    """Set when the span ends."""
+    error: BaseException | None = None
+    """The exception that ended the span, if any."""
+    data: Any = None
+    """Free for the tracer to keep its own state between the two callbacks."""
+
+
+class Tracer(Protocol):
+    """Protocol describing receivers of span start and end callbacks.
+
+    Callbacks run on the traced thread, or in the traced task for async sends, so
+    they should be cheap. Exceptions they raise propagate to the caller.
+    """
+
+    def on_start(self, span: Span) -> None:  # pragma: no cover - Protocol definition
+        """Handle the start of *span*."""
+
+    def on_end(self, span: Span) -> None:  # pragma: no cover - Protocol definition
+        """Handle the end of *span*; ``duration_ns`` and ``error`` are set."""
+
+
+class _OpenTelemetryTracer(Protocol):
+    def start_as_current_span(  # pragma: no cover - Protocol definition
+        self, name: str, *, attributes: Mapping[str, AttributeValue]
+    ) -> AbstractContextManager[object]: ...
+
+
+_tracer: Tracer | None = None
+
+
+def set_tracer(tracer: Tracer | None) -> Tracer | None:
+    """Register *tracer* for the whole process, or remove it with ``None``.
+
+    Returns the previously registered tracer.
+    """
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def active_tracer() -> Tracer | None:
+    """Return the registered tracer, or ``None``."""
+    return _tracer
+
+
+@contextmanager
+def trace_span(tracer: Tracer, name: str, **attributes: AttributeValue) -> Iterator[Span]:
+    """Report a span named *name* to *tracer* around the ``with`` block."""
+    span = Span(name, attributes)
+    tracer.on_start(span)
+    try:
+        yield span
+    except BaseException as error:
+        span.error = error
+        raise
+    finally:
+        span.duration_ns = time.perf_counter_ns() - span.start_ns
+        tracer.on_end(span)
+
+
+class OpenTelemetryTracer:
+    """:class:`Tracer` that mirrors spans onto an OpenTelemetry tracer.
+
+    Each span becomes the current OpenTelemetry span while it runs, so spans
+    started inside it, by macpymessenger or by the caller, become its children.
+    Failed spans record the exception and an error status.
+
+    Parameters
+    ----------
+    tracer:
+        An ``opentelemetry.trace.Tracer``, for example from
+        ``opentelemetry.trace.get_tracer("macpymessenger")``. It is used through
+        ``start_as_current_span`` only, so macpymessenger does not import
+        OpenTelemetry itself.
+    """
+
+    __slots__ = ("tracer",)
+
+    def __init__(self, tracer: _OpenTelemetryTracer) -> None:
+        self.tracer = tracer
+
+    def on_start(self, span: Span) -> None:
+        scope = self.tracer.start_as_current_span(span.name, attributes=span.attributes)
+        scope.__enter__()
+        span.data = scope
+
+    def on_end(self, span: Span) -> None:
+        scope = span.data
+        error = span.error
+        if error is None:
+            scope.__exit__(None, None, None)
+        else:
+            scope.__exit__(type(error), error, error.__traceback__)
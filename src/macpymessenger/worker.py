@@ -0,0 +1,196 @@
+"""Long-lived send worker for the messaging client.
+
+This module defines :class:`WorkerCommandRunner`, a
+:class:`~macpymessenger.commands.CommandRunner` that keeps one send worker
+process alive and feeds it framed send requests over stdin/stdout instead of
+spawning ``osascript`` once per message.
+
+Each request and response is one line of JSON. A request carries ``id``,
+``recipient``, ``body`` and ``delay``; the worker answers with ``id`` and
+``ok``, plus ``error`` when the send failed. The bundled worker is
+``osascript/sendMessageWorker.scpt``; tests substitute any executable that
+speaks the same protocol.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import subprocess
+import threading
+from typing import IO, TYPE_CHECKING, Self, cast
+
+from .commands import _validate_command
+from .exceptions import InvalidCommandError
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import TracebackType
+
+    from .configuration import Configuration
+
+__all__ = ["WorkerCommandRunner"]
+
+_WORKER_SHUTDOWN_TIMEOUT_SECONDS = 5.0
+
+
+class WorkerCommandRunner:
+    """Command runner that reuses one long-lived send worker process.
+
+    The runner accepts the same ``osascript`` argument lists that
+    :class:`~macpymessenger.delivery.MessageDelivery` builds and forwards the
+    recipient handle, message body and delay to the worker. The interpreter
+    and send script named in the command are ignored; the worker command
+    decides what runs.
+
+    A worker that exits is restarted on the next send. If the worker dies
+    before it reads a request, the request is resent once to the new worker;
+    if it dies after reading it, the send is reported as failed because it
+    may already have reached Messages.
+
+    Parameters
+    ----------
+    worker_command:
+        Argument list that starts the worker, for example
+        ``["osascript", "/path/to/sendMessageWorker.scpt"]``.
+    """
+
+    __slots__ = ("_lock", "_next_request_id", "_process", "_worker_command")
+
+    def __init__(self, worker_command: Sequence[str]) -> None:
+        self._worker_command = _validate_command(worker_command)
+        self._lock = threading.Lock()
+        self._next_request_id = 0
+        self._process: subprocess.Popen[str] | None = None
+
+    @classmethod
+    def from_configuration(cls, configuration: Configuration) -> Self:
+        """Create a runner for the worker script resolved by *configuration*."""
+        return cls(["osascript", str(configuration.worker_script_path)])
+
+    def __call__(self, command: Sequence[str]) -> None:
+        arguments = _validate_command(command)
+        segments = arguments[2:]
+        if len(segments) not in {2, 3} or not all(delay.isdecimal() for delay in segments[2:]):
+            raise InvalidCommandError.malformed_send()
+        recipient_handle, message_body, *delay_arguments = segments
+        delay_seconds = int(delay_arguments[0]) if delay_arguments else 0
+        with self._lock:
+            self._next_request_id += 1
+            request_id = self._next_request_id
+            frame = json.dumps(
+                {
+                    "id": request_id,
+                    "recipient": recipient_handle,
+                    "body": message_body,
+                    "delay": delay_seconds,
+                },
+                ensure_ascii=False,
+            )
+            response = self._exchange(request_id, frame, arguments)
+        if response.get("ok") is not True:
+            raise subprocess.CalledProcessError(
+                returncode=1,
+                cmd=arguments,
+                stderr=str(response.get("error", "")),
+            )
+
+    def close(self) -> None:
+        """Stop the worker process if it is running."""
+        with self._lock:
+            self._stop_process()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _exchange(
+        self,
+        request_id: int,
+        frame: str,
+        arguments: tuple[str, ...],
+    ) -> dict[str, object]:
+        """Send *frame* to the worker and return its decoded response."""
+        process = self._ensure_process()
+        try:
+            self._write_frame(process, frame)
+        except OSError:
+            # The worker died before reading the request; nothing was sent.
+            self._stop_process()
+            process = self._ensure_process()
+            self._write_frame(process, frame)
+
+        line = cast("IO[str]", process.stdout).readline()
+        if not line:
+            returncode = self._stop_process()
+            raise subprocess.CalledProcessError(
+                returncode=returncode or 1,
+                cmd=arguments,
+                stderr="Send worker exited before responding.",
+            )
+        try:
+            response = json.loads(line)
+        except json.JSONDecodeError as error:
+            self._stop_process()
+            raise subprocess.CalledProcessError(
+                returncode=1,
+                cmd=arguments,
+                stderr=f"Send worker returned a malformed response: {line!r}",
+            ) from error
+        if not isinstance(response, dict) or response.get("id") != request_id:
+            self._stop_process()
+            raise subprocess.CalledProcessError(
+                returncode=1,
+                cmd=arguments,
+                stderr=f"Send worker answered out of turn: {line!r}",
+            )
+        return response
+
+    @staticmethod
+    def _write_frame(process: subprocess.Popen[str], frame: str) -> None:
+        stdin = cast("IO[str]", process.stdin)
+        stdin.write(frame + "\n")
+        stdin.flush()
+
+    def _ensure_process(self) -> subprocess.Popen[str]:
+        process = self._process
+        if process is not None and process.poll() is None:
+            return process
+        if process is not None:
+            self._stop_process()
+        process = subprocess.Popen(  # noqa: S603
+            self._worker_command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            shell=False,
+        )
+        self._process = process
+        return process
+
+    def _stop_process(self) -> int | None:
+        """Stop the current worker and return its exit code."""
+        process = self._process
+        self._process = None
+        if process is None:
+            return None
+        if process.stdin is not None:
+            # Closing stdin flushes it, which fails if the worker already exited.
+            with contextlib.suppress(OSError):
+                process.stdin.close()
+        try:
+            returncode = process.wait(timeout=_WORKER_SHUTDOWN_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            returncode = process.wait()
+        if process.stdout is not None:
+            process.stdout.close()
+        return returncode
@@ -1,14 +1,62 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import subprocess
 from typing import TYPE_CHECKING
 
+from benchmarks._stubs import StubRunner, StubRunnerFactory, create_chat_database, write_fake_worker
+
+from macpymessenger.logfiles import QueuedFileHandler
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
+    from pathlib import Path
+
+__all__ = [
+    "FakeClock",
+    "StubAsyncRunner",
+    "StubOutputRunner",
+    "StubRunner",
+    "StubRunnerFactory",
+    "create_chat_database",
+    "read_fake_worker_log",
+    "remove_file_handlers",
+    "write_fake_worker",
+]
+
+
+class StubAsyncRunner:
+    """Async runner stub that records commands and tracks how many run at once."""
+
+    def __init__(
+        self,
+        failing_recipient_handles: Sequence[str] | None = None,
+        latency_seconds: float = 0.0,
+    ) -> None:
+        self.commands: list[list[str]] = []
+        self.failing_recipient_handles = set(failing_recipient_handles or ())
+        self.latency_seconds = latency_seconds
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, command: Sequence[str]) -> None:
+        arguments = list(command)
+        self.commands.append(arguments)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_seconds)
+        finally:
+            self.in_flight -= 1
+        if arguments[2] in self.failing_recipient_handles:
+            raise subprocess.CalledProcessError(returncode=1, cmd=arguments)
+
 
+class StubOutputRunner:
+    """Batch runner stub that reports per-recipient results like the batch send script."""
 
-class StubRunner:
     def __init__(self, failing_recipient_handles: Sequence[str] | None = None) -> None:
         self.commands: list[list[str]] = []
         if failing_recipient_handles is None:
@@ -16,16 +64,42 @@ class StubRunner:
         else:
             self.failing_recipient_handles = set(failing_recipient_handles)
 
-    def __call__(self, command: Sequence[str]) -> None:
+    def __call__(self, command: Sequence[str]) -> str:
         arguments = list(command)
         self.commands.append(arguments)
-        recipient_handle = arguments[2]
-        if recipient_handle in self.failing_recipient_handles:
-            raise subprocess.CalledProcessError(returncode=1, cmd=arguments)
+        recipient_handles = arguments[2::2]
+        lines = []
+        for index, recipient_handle in enumerate(recipient_handles):
+            if recipient_handle in self.failing_recipient_handles:
+                lines.append(f'{index}\terror\tCan\'t get buddy id "{recipient_handle}".')
+            else:
+                lines.append(f"{index}\tok")
+        return "\n".join(lines) + "\n"
 
 
 def remove_file_handlers(logger: logging.Logger) -> None:
     for handler in list(logger.handlers):
-        if isinstance(handler, logging.FileHandler):
+        if isinstance(handler, (logging.FileHandler, QueuedFileHandler)):
             handler.close()
             logger.removeHandler(handler)
+
+
+def read_fake_worker_log(log_path: Path) -> list[tuple[int, str, str]]:
+    """Return ``(pid, recipient, body)`` rows recorded by the stand-in worker."""
+    if not log_path.exists():
+        return []
+    rows = log_path.read_text(encoding="utf-8").splitlines()
+    return [(pid, recipient, body) for pid, recipient, body in map(json.loads, rows)]
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from macpymessenger import AsyncIMessageClient, AsyncSubprocessCommandRunner
+from macpymessenger.exceptions import (
+    InvalidConcurrencyError,
+    InvalidDelayTypeError,
+    MessageSendError,
+    NegativeDelayError,
+)
+from tests.support import StubAsyncRunner
+
+if TYPE_CHECKING:
+    from macpymessenger import Configuration, TemplateManager
+
+
+@pytest.fixture
+def async_client(
+    configuration: Configuration, template_manager: TemplateManager
+) -> tuple[AsyncIMessageClient, StubAsyncRunner]:
+    runner = StubAsyncRunner()
+    client_instance = AsyncIMessageClient(
+        configuration=configuration,
+        template_manager=template_manager,
+        command_runner=runner,
+        logger=logging.getLogger("test.async_client"),
+    )
+    return client_instance, runner
+
+
+def test_async_send_passes_command_to_runner(
+    async_client: tuple[AsyncIMessageClient, StubAsyncRunner], configuration: Configuration
+) -> None:
+    instance, runner = async_client
+    asyncio.run(instance.send("+10000000000", "Hello", delay_seconds=5))
+    assert runner.commands == [
+        ["osascript", str(configuration.send_script_path), "+10000000000", "Hello", "5"]
+    ]
+
+
+def test_async_send_maps_failures_to_message_send_error(
+    async_client: tuple[AsyncIMessageClient, StubAsyncRunner],
+) -> None:
+    instance, runner = async_client
+    runner.failing_recipient_handles.add("+19999999999")
+    with pytest.raises(MessageSendError, match="Failed to send message to \\+19999999999"):
+        asyncio.run(instance.send("+19999999999", "Hello"))
+
+
+def test_async_send_validates_delay(
+    async_client: tuple[AsyncIMessageClient, StubAsyncRunner],
+) -> None:
+    instance, runner = async_client
+    with pytest.raises(NegativeDelayError):
+        asyncio.run(instance.send("+10000000000", "Hello", delay_seconds=-1))
+    with pytest.raises(InvalidDelayTypeError):
+        asyncio.run(instance.send("+10000000000", "Hello", delay_seconds=1.5))
+    assert runner.commands == []
+
+
+def test_async_send_template_renders_content(
+    async_client: tuple[AsyncIMessageClient, StubAsyncRunner],
+    template_manager: TemplateManager,
+) -> None:
+    instance, runner = async_client
+    template_manager.create_template("greeting", lambda name: t"Hello, {name}!")
+    asyncio.run(instance.send_template("+10000000000", "greeting", {"name": "Ada"}))
+    assert runner.commands[-1][3] == "Hello, Ada!"
+
+
+def test_async_send_bulk_preserves_input_order(
+    configuration: Configuration, template_manager: TemplateManager
+) -> None:
+    runner = StubAsyncRunner(["2", "4"], latency_seconds=0.001)
+    instance = AsyncIMessageClient(
+        configuration=configuration,
+        template_manager=template_manager,
+        command_runner=runner,
+    )
+    success, failure = asyncio.run(instance.send_bulk(["1", "2", "3", "4", "5"], "Ping"))
+    assert success == ["1", "3", "5"]
+    assert failure == ["2", "4"]
+
+
+def test_async_send_bulk_bounds_concurrency(
+    configuration: Configuration, template_manager: TemplateManager
+) -> None:
+    runner = StubAsyncRunner(latency_seconds=0.001)
+    instance = AsyncIMessageClient(
+        configuration=configuration,
+        template_manager=template_manager,
+        command_runner=runner,
+        max_concurrency=3,
+    )
+    recipients = [str(index) for index in range(50)]
+    success, failure = asyncio.run(instance.send_bulk(recipients, "Ping"))
+    assert success == recipients
+    assert failure == []
+    assert runner.max_in_flight == 3  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("max_concurrency", [0, -1, True, 2.5])
+def test_async_client_rejects_invalid_concurrency(
+    configuration: Configuration, max_concurrency: Any
+) -> None:
+    with pytest.raises(InvalidConcurrencyError):
+        AsyncIMessageClient(configuration, max_concurrency=max_concurrency)
+
+
+def test_async_subprocess_runner_raises_on_non_zero_exit() -> None:
+    runner = AsyncSubprocessCommandRunner()
+    asyncio.run(runner([sys.executable, "-c", "raise SystemExit(0)"]))
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        asyncio.run(runner([sys.executable, "-c", "raise SystemExit(4)"]))
+    assert exc_info.value.returncode == 4  # noqa: PLR2004
@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from macpymessenger import AttachmentPolicy, AttachmentStore, Configuration, IMessageClient
+from macpymessenger.attachments import (
+    SNIFF_BYTES,
+    STAGED_RETENTION_SECONDS,
+    file_digest,
+    inspect_attachment,
+    remove_staged_attachments,
+    sniff_media_type,
+    stage_attachment,
+)
+from macpymessenger.exceptions import AttachmentError
+from tests.support import FakeClock, StubRunner
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 24
+
+
+def _write(path: Path, header: bytes, size: int | None = None) -> Path:
+    with path.open("wb") as handle:
+        handle.write(header)
+        if size is not None:
+            handle.truncate(size)
+    return path
+
+
+@pytest.mark.parametrize(
+    ("header", "media_type"),
+    [
+        (PNG_HEADER, "image/png"),
+        (b"\xff\xd8\xff\xe0\x00\x10JFIF", "image/jpeg"),
+        (b"\x00\x00\x00\x18ftypheic\x00\x00", "image/heic"),
+        (b"\x00\x00\x00\x14ftypqt  \x00\x00", "video/quicktime"),
+        (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp"),
+        ("Grüße\n".encode(), "text/plain"),
+        (b"\x00\x01\x02\x03binary", None),
+    ],
+)
+def test_sniff_media_type_recognizes_signatures(header: bytes, media_type: str | None) -> None:
+    assert sniff_media_type(header) == media_type
+
+
+def test_inspect_reads_only_the_header_of_large_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = _write(tmp_path / "movie.mov", b"\x00\x00\x00\x14ftypqt  ", size=300 * 1024 * 1024)
+    reads: list[int] = []
+    original_open = Path.open
+
+    class RecordingReader(io.BufferedReader):
+        def read(self, size: int | None = -1) -> bytes:
+            reads.append(-1 if size is None else size)
+            return super().read(size)
+
+    def recording_open(self: Path, mode: str = "r", *args: Any, **kwargs: Any) -> Any:
+        if self == path:
+            return RecordingReader(io.FileIO(self, mode))
+        return original_open(self, mode, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", recording_open)
+    attachment = inspect_attachment(path, AttachmentPolicy(max_bytes=400 * 1024 * 1024))
+    assert (attachment.size, attachment.media_type) == (300 * 1024 * 1024, "video/quicktime")
+    assert reads == [SNIFF_BYTES]
+
+
+@pytest.mark.parametrize(
+    ("header", "size", "match"),
+    [
+        (PNG_HEADER, 2048, "limit is 1024 bytes"),
+        (b"\x00\x01binary", None, "unsupported type unknown"),
+        (b"%PDF-1.7", None, "unsupported type application/pdf"),
+    ],
+)
+def test_inspect_rejects_files_outside_the_policy(
+    tmp_path: Path, header: bytes, size: int | None, match: str
+) -> None:
+    path = _write(tmp_path / "file", header, size)
+    policy = AttachmentPolicy(max_bytes=1024, allowed_media_types=frozenset({"image/png"}))
+    with pytest.raises(AttachmentError, match=match):
+        inspect_attachment(path, policy)
+
+
+def test_inspect_rejects_missing_files_and_directories(tmp_path: Path) -> None:
+    with pytest.raises(AttachmentError, match="not a readable regular file"):
+        inspect_attachment(tmp_path / "missing.png")
+    with pytest.raises(AttachmentError, match="not a readable regular file"):
+        inspect_attachment(tmp_path)
+
+
+def test_stage_hard_links_on_the_same_file_system(tmp_path: Path) -> None:
+    attachment = inspect_attachment(_write(tmp_path / "photo.png", PNG_HEADER))
+    staged = stage_attachment(attachment, tmp_path / "staging")
+    assert staged.name == "photo.png"
+    assert staged.stat().st_ino == attachment.path.stat().st_ino
+
+
+def test_stage_copies_when_link_and_clone_fail(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def refuse(*_: object) -> bool:
+        return False
+
+    monkeypatch.setattr("macpymessenger.attachments._link", refuse)
+    monkeypatch.setattr("macpymessenger.attachments._clone", refuse)
+    attachment = inspect_attachment(_write(tmp_path / "photo.png", PNG_HEADER))
+    staged = stage_attachment(attachment, tmp_path / "staging")
+    assert staged.read_bytes() == PNG_HEADER
+    assert staged.stat().st_ino != attachment.path.stat().st_ino
+
+
+def test_remove_staged_attachments_deletes_old_directories(tmp_path: Path) -> None:
+    attachment = inspect_attachment(_write(tmp_path / "photo.png", PNG_HEADER))
+    stage_attachment(attachment, tmp_path / "staging")
+    assert remove_staged_attachments(tmp_path / "staging", older_than_seconds=60) == 0
+    assert remove_staged_attachments(tmp_path / "staging", older_than_seconds=-1) == 1
+    assert list((tmp_path / "staging").iterdir()) == []
+
+
+def test_file_digest_hashes_in_chunks(tmp_path: Path) -> None:
+    content = bytes(range(256)) * 100
+    path = tmp_path / "data"
+    path.write_bytes(content)
+    assert file_digest(path, chunk_size=1000) == hashlib.sha256(content).hexdigest()
+
+
+def _png(path: Path, fill: int) -> Path:
+    return _write(path, PNG_HEADER + bytes([fill]) * 1000)
+
+
+def test_store_stages_identical_content_once(tmp_path: Path) -> None:
+    store = AttachmentStore(tmp_path / "store")
+    first = inspect_attachment(_png(tmp_path / "a.png", 1))
+    copy = inspect_attachment(_png(tmp_path / "b.png", 1))
+    with store.lease(first) as staged, store.lease(copy) as again:
+        assert staged == again
+        assert staged.parent.name == file_digest(first.path)
+        assert staged.read_bytes() == first.path.read_bytes()
+        assert staged.stat().st_ino != first.path.stat().st_ino
+    assert (len(store), store.size_bytes) == (1, first.size)
+
+
+def test_store_hashes_an_unchanged_file_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = AttachmentStore(tmp_path / "store")
+    attachment = inspect_attachment(_png(tmp_path / "a.png", 1))
+    hashed: list[Path] = []
+
+    def recording_digest(path: Path, chunk_size: int) -> str:
+        hashed.append(path)
+        return file_digest(path, chunk_size)
+
+    monkeypatch.setattr("macpymessenger.attachments.file_digest", recording_digest)
+    for _ in range(3):
+        with store.lease(attachment):
+            pass
+    assert hashed == [attachment.path]
+
+
+def test_store_evicts_least_recently_used_entries_over_quota(tmp_path: Path) -> None:
+    attachments = [inspect_attachment(_png(tmp_path / f"{fill}.png", fill)) for fill in range(3)]
+    store = AttachmentStore(
+        tmp_path / "store", quota_bytes=2 * attachments[0].size, retention_seconds=0
+    )
+    with store.lease(attachments[0]) as oldest:
+        pass
+    with store.lease(attachments[1]) as middle:
+        pass
+    with store.lease(attachments[0]):
+        pass
+    with store.lease(attachments[2]) as newest:
+        pass
+    assert (oldest.exists(), middle.exists(), newest.exists()) == (True, False, True)
+    assert store.size_bytes == 2 * attachments[0].size
+
+
+def test_store_never_evicts_entries_in_use(tmp_path: Path) -> None:
+    first = inspect_attachment(_png(tmp_path / "a.png", 1))
+    second = inspect_attachment(_png(tmp_path / "b.png", 2))
+    store = AttachmentStore(tmp_path / "store", quota_bytes=first.size)
+    with store.lease(first) as pinned:
+        with store.lease(second) as other:
+            assert (pinned.exists(), other.exists()) == (True, True)
+        assert other.exists()
+        assert pinned.exists()
+    assert len(store) == 2  # noqa: PLR2004
+
+
+def test_store_keeps_released_entries_for_the_retention_time(tmp_path: Path) -> None:
+    first = inspect_attachment(_png(tmp_path / "a.png", 1))
+    second = inspect_attachment(_png(tmp_path / "b.png", 2))
+    clock = FakeClock(1_000_000.0)
+    store = AttachmentStore(
+        tmp_path / "store", quota_bytes=first.size, retention_seconds=60, clock=clock
+    )
+    with store.lease(first) as sent:
+        pass
+    with store.lease(second):
+        assert sent.exists()
+    clock.advance(60)
+    with store.lease(second) as kept:
+        assert not sent.exists()
+    assert kept.exists()
+    assert len(store) == 1
+
+
+def test_store_indexes_existing_entries(tmp_path: Path) -> None:
+    attachment = inspect_attachment(_png(tmp_path / "a.png", 1))
+    with AttachmentStore(tmp_path / "store").lease(attachment) as staged:
+        pass
+    reopened = AttachmentStore(tmp_path / "store")
+    assert (len(reopened), reopened.size_bytes) == (1, attachment.size)
+    with reopened.lease(attachment) as again:
+        assert again == staged
+    assert len(list((tmp_path / "store").iterdir())) == 1
+
+
+def test_store_treats_an_unindexed_entry_as_staged(tmp_path: Path) -> None:
+    attachment = inspect_attachment(_png(tmp_path / "a.png", 1))
+    store = AttachmentStore(tmp_path / "store")
+    entry_directory = tmp_path / "store" / file_digest(attachment.path)
+    entry_directory.mkdir(parents=True)
+    (entry_directory / "a.png").write_bytes(attachment.path.read_bytes())
+
+    with store.lease(attachment) as staged:
+        assert staged == entry_directory / "a.png"
+    assert (len(store), store.size_bytes) == (1, attachment.size)
+    assert [path.name for path in (tmp_path / "store").iterdir()] == [entry_directory.name]
+
+
+def test_store_stages_without_blocking_other_content(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    slow = inspect_attachment(_png(tmp_path / "slow.png", 1))
+    fast = inspect_attachment(_png(tmp_path / "fast.png", 2))
+    store = AttachmentStore(tmp_path / "store")
+    copying = threading.Event()
+    release = threading.Event()
+    released: list[bool] = []
+
+    def blocking_copy(source: Path, target: Path) -> None:
+        if source == slow.path:
+            copying.set()
+            released.append(release.wait(1))
+        target.write_bytes(source.read_bytes())
+
+    monkeypatch.setattr("macpymessenger.attachments._clone_or_copy", blocking_copy)
+    slow_lease = threading.Thread(target=lambda: store.release(file_digest(store.acquire(slow))))
+    slow_lease.start()
+    copying.wait(5)
+    try:
+        with store.lease(fast) as staged:
+            assert staged.exists()
+    finally:
+        release.set()
+        slow_lease.join()
+    assert released == [True]
+    assert len(store) == 2  # noqa: PLR2004
+
+
+def _client(
+    script_path: Path,
+    tmp_path: Path,
+    runner: StubRunner,
+    attachment_store: AttachmentStore | None = None,
+) -> IMessageClient:
+    configuration = Configuration(
+        script_path,
+        attachment_script_path=script_path,
+        attachment_staging_path=tmp_path / "staging",
+    )
+    return IMessageClient(
+        configuration,
+        command_runner=runner,
+        logger=logging.getLogger("test.attachments"),
+        attachment_store=attachment_store,
+    )
+
+
+def test_send_with_attachment_runs_the_attachment_script(script_path: Path, tmp_path: Path) -> None:
+    runner = StubRunner()
+    _write(tmp_path / "photo.png", PNG_HEADER)
+    _client(script_path, tmp_path, runner).send_with_attachment(
+        "+15551234567", "Look", str(tmp_path / "photo.png")
+    )
+    [command] = runner.commands
+    assert command[:3] == ["osascript", str(script_path), "+15551234567"]
+    assert command[3].startswith(str(tmp_path / "staging"))
+    assert command[4] == "Look"
+
+
+def test_send_attachment_bulk_stages_once(script_path: Path, tmp_path: Path) -> None:
+    runner = StubRunner(["+15550000002"])
+    _write(tmp_path / "photo.png", PNG_HEADER)
+    client = _client(script_path, tmp_path, runner)
+    successful, failed = client.send_attachment_bulk(
+        ["+15550000001", "+15550000002"], str(tmp_path / "photo.png")
+    )
+    assert (successful, failed) == (["+15550000001"], ["+15550000002"])
+    assert len({command[3] for command in runner.commands}) == 1
+    assert len(list((tmp_path / "staging").iterdir())) == 1
+
+
+def test_sends_remove_stale_staged_attachments_once_per_interval(
+    script_path: Path, tmp_path: Path
+) -> None:
+    stale_time = time.time() - STAGED_RETENTION_SECONDS - 60
+    _write(tmp_path / "photo.png", PNG_HEADER)
+    client = _client(script_path, tmp_path, StubRunner())
+
+    (tmp_path / "staging" / "old").mkdir(parents=True)
+    os.utime(tmp_path / "staging" / "old", (stale_time, stale_time))
+    client.send_with_attachment("+15550000001", "", str(tmp_path / "photo.png"))
+    assert not (tmp_path / "staging" / "old").exists()
+
+    (tmp_path / "staging" / "older").mkdir()
+    os.utime(tmp_path / "staging" / "older", (stale_time, stale_time))
+    client.send_with_attachment("+15550000001", "", str(tmp_path / "photo.png"))
+    assert (tmp_path / "staging" / "older").exists()
+    assert len(list((tmp_path / "staging").iterdir())) == 3  # noqa: PLR2004
+
+
+def test_store_reuses_one_staged_file_across_sends(script_path: Path, tmp_path: Path) -> None:
+    runner = StubRunner()
+    store = AttachmentStore(tmp_path / "store")
+    client = _client(script_path, tmp_path, runner, store)
+    _write(tmp_path / "photo.png", PNG_HEADER)
+    client.send_attachment_bulk(["+15550000001", "+15550000002"], str(tmp_path / "photo.png"))
+    client.send_with_attachment("+15550000003", "Again", str(tmp_path / "photo.png"))
+    assert len({command[3] for command in runner.commands}) == 1
+    assert runner.commands[0][3].startswith(str(tmp_path / "store"))
+    assert not (tmp_path / "staging").exists()
+    assert len(store) == 1
+
+
+def test_invalid_attachment_is_rejected_before_any_send(script_path: Path, tmp_path: Path) -> None:
+    runner = StubRunner()
+    _write(tmp_path / "blob.bin", b"\x00\x01")
+    with pytest.raises(AttachmentError):
+        _client(script_path, tmp_path, runner).send_attachment_bulk(
+            ["+15550000001"], str(tmp_path / "blob.bin")
+        )
+    assert runner.commands == []
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import subprocess
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from macpymessenger import AsyncIMessageClient, BulkLogPolicy, IMessageClient, RetryPolicy
+from macpymessenger.bulklog import OTHER_SIGNATURE, BulkLogger, error_signature
+from macpymessenger.delivery import DeliveryOutcome, MessageDelivery
+from macpymessenger.exceptions import InvalidBulkLogPolicyError, MessageSendError
+from tests.support import StubAsyncRunner, StubOutputRunner, StubRunner
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from macpymessenger import Configuration
+
+
+def _messages(caplog: pytest.LogCaptureFixture, level: int) -> list[str]:
+    return [record.getMessage() for record in caplog.records if record.levelno == level]
+
+
+def _raised(
+    configuration: Configuration, returncode: int, recipient_handle: str
+) -> MessageSendError:
+    def fail(command: Sequence[str]) -> None:
+        raise subprocess.CalledProcessError(returncode, list(command))
+
+    logger = logging.getLogger("test.bulklog.raised")
+    logger.disabled = True
+    delivery = MessageDelivery(configuration, fail, logger)
+    with pytest.raises(MessageSendError) as raised:
+        delivery.deliver(recipient_handle, "Ping")
+    return raised.value
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"summary_every": 0},
+        {"success_sample_every": -1},
+        {"tracebacks_per_signature": -1},
+        {"max_signatures": 0},
+    ],
+)
+def test_policy_rejects_out_of_range_settings(options: dict[str, Any]) -> None:
+    with pytest.raises(InvalidBulkLogPolicyError):
+        BulkLogPolicy(**options)
+
+
+def test_error_signature_ignores_recipient_and_names_exit_status(
+    configuration: Configuration,
+) -> None:
+    first = error_signature(_raised(configuration, 1, "+15550000001"))
+    second = error_signature(_raised(configuration, 1, "+15550000002"))
+
+    assert first == second
+    assert first.startswith("MessageSendError <- CalledProcessError(exit 1) at test_bulklog.py:")
+    assert error_signature(_raised(configuration, 2, "+15550000001")) != first
+
+
+def test_error_signature_includes_first_note_without_quoted_handles() -> None:
+    error = MessageSendError.delivery_failed("+15550000001")
+    error.add_note("Batch script reported: timeout")
+    first = MessageSendError.delivery_failed("+15550000001")
+    first.add_note('Batch script reported: Can\'t get buddy id "+15550000001"')
+    second = MessageSendError.delivery_failed("+15550000002")
+    second.add_note('Batch script reported: Can\'t get buddy id "+15550000002"')
+
+    assert error_signature(error) == "MessageSendError [Batch script reported: timeout]"
+    assert error_signature(first) == error_signature(second)
+
+
+def test_send_bulk_with_policy_logs_summaries_samples_and_one_traceback(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    recipients = [str(index) for index in range(2_500)]
+    failing = recipients[::100]
+    client = IMessageClient(
+        configuration,
+        command_runner=StubRunner(failing),
+        logger=logging.getLogger("test.bulklog.client"),
+        bulk_logging=BulkLogPolicy(summary_every=1_000, success_sample_every=500),
+    )
+
+    with caplog.at_level(logging.INFO, logger="test.bulklog.client"):
+        successful, failed = client.send_bulk(recipients, "Ping")
+
+    assert len(failed) == len(failing)
+    info = _messages(caplog, logging.INFO)
+    assert sum(message.startswith("Message sent to") for message in info) == len(successful) // 500
+    progress = [message for message in info if message.startswith("Bulk send progress")]
+    assert len(progress) == 3  # noqa: PLR2004
+    assert progress[0].startswith("Bulk send progress: 990 sent, 10 failed of 1000")
+    assert "p50" in progress[0]
+    assert "p99" in progress[0]
+    assert info[-1].startswith("Bulk send finished: 2475 sent, 25 failed of 2500")
+
+    errors = [record for record in caplog.records if record.levelno == logging.ERROR]
+    assert len(errors) == 1
+    assert errors[0].getMessage().startswith("Failed to send message to 0 (MessageSendError")
+    assert errors[0].exc_info is not None
+    assert _messages(caplog, logging.WARNING)[0].startswith(
+        "9 more failures without traceback: MessageSendError <- CalledProcessError(exit 1)"
+    )
+
+
+def test_send_bulk_without_policy_still_logs_every_recipient(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    client = IMessageClient(
+        configuration,
+        command_runner=StubRunner(),
+        logger=logging.getLogger("test.bulklog.default"),
+    )
+
+    with caplog.at_level(logging.INFO, logger="test.bulklog.default"):
+        client.send_bulk(["1", "2", "3"], "Ping")
+
+    assert _messages(caplog, logging.INFO) == [f"Message sent to {number}" for number in "123"]
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_send_bulk_with_policy_counts_retries_in_summaries(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture, max_workers: int | None
+) -> None:
+    recipients = [str(index) for index in range(10)]
+    client = IMessageClient(
+        configuration,
+        command_runner=StubRunner(recipients[:4]),
+        logger=logging.getLogger("test.bulklog.retries"),
+        retry_policy=RetryPolicy(max_attempts=3, initial_backoff=0, jitter=False),
+        bulk_logging=BulkLogPolicy(summary_every=5),
+    )
+
+    with caplog.at_level(logging.INFO, logger="test.bulklog.retries"):
+        client.send_bulk(recipients, "Ping", max_workers=max_workers)
+
+    assert not any("retrying" in message for message in _messages(caplog, logging.WARNING))
+    info = _messages(caplog, logging.INFO)
+    assert "8 retries" in info[0]
+    assert "0 retries" in info[1]
+    assert info[-1].startswith("Bulk send finished: 6 sent, 4 failed of 10")
+    assert info[-1].endswith(", 8 retries")
+
+
+def test_single_sends_keep_logging_with_policy(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    client = IMessageClient(
+        configuration,
+        command_runner=StubRunner(),
+        logger=logging.getLogger("test.bulklog.single"),
+        bulk_logging=BulkLogPolicy(),
+    )
+
+    with caplog.at_level(logging.INFO, logger="test.bulklog.single"):
+        client.send("+15555555555", "Ping")
+
+    assert _messages(caplog, logging.INFO) == ["Message sent to +15555555555"]
+
+
+def test_batch_send_with_policy_groups_failures_by_reported_reason(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    client = IMessageClient(
+        configuration,
+        command_runner=StubRunner(),
+        output_command_runner=StubOutputRunner(["2", "4"]),
+        logger=logging.getLogger("test.bulklog.batch"),
+        bulk_logging=BulkLogPolicy(tracebacks_per_signature=0),
+    )
+
+    with caplog.at_level(logging.INFO, logger="test.bulklog.batch"):
+        _, failed = client.send_bulk(["1", "2", "3", "4"], "Ping", batch_size=2)
+
+    assert failed == ["2", "4"]
+    assert _messages(caplog, logging.ERROR) == []
+    signature = 'MessageSendError [Batch script reported: Can\'t get buddy id "...".]'
+    assert _messages(caplog, logging.WARNING) == [
+        f"2 more failures without traceback: {signature} (2 in total)"
+    ]
+
+
+def test_distinct_signatures_are_capped(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    logger = logging.getLogger("test.bulklog.cap")
+    bulk_logger = BulkLogger(logger, BulkLogPolicy(max_signatures=2))
+
+    with caplog.at_level(logging.INFO, logger="test.bulklog.cap"):
+        for returncode in range(1, 6):
+            bulk_logger.observe(DeliveryOutcome("1", _raised(configuration, returncode, "1")))
+        bulk_logger.finish()
+
+    errors = _messages(caplog, logging.ERROR)
+    assert len(errors) == 3  # noqa: PLR2004
+    assert errors[-1].endswith(f"({OTHER_SIGNATURE})")
+    assert _messages(caplog, logging.WARNING) == [
+        f"2 more failures without traceback: {OTHER_SIGNATURE} (3 in total)"
+    ]
+
+
+def test_async_send_bulk_with_policy_logs_summary(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    client = AsyncIMessageClient(
+        configuration,
+        command_runner=StubAsyncRunner(["2"]),
+        logger=logging.getLogger("test.bulklog.async"),
+        bulk_logging=BulkLogPolicy(summary_every=2),
+    )
+
+    with caplog.at_level(logging.INFO, logger="test.bulklog.async"):
+        asyncio.run(client.send_bulk(["1", "2", "3"], "Ping"))
+
+    info = _messages(caplog, logging.INFO)
+    assert not any(message.startswith("Message sent to") for message in info)
+    assert len([message for message in info if message.startswith("Bulk send progress")]) == 2  # noqa: PLR2004
+    assert info[-1].startswith("Bulk send finished: 2 sent, 1 failed of 3")
+    assert len(_messages(caplog, logging.ERROR)) == 1
+
+
+def test_without_outcome_logging_shares_collaborators(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    commands: list[Sequence[str]] = []
+    logger = logging.getLogger("test.bulklog.delivery")
+    delivery = MessageDelivery(configuration, commands.append, logger)
+    quiet = delivery.without_outcome_logging()
+
+    with caplog.at_level(logging.INFO, logger="test.bulklog.delivery"):
+        quiet.deliver("+15555555555", "Ping")
+
+    assert len(commands) == 1
+    assert quiet.metrics is delivery.metrics
+    assert caplog.records == []
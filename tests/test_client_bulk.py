@@ -1,7 +1,21 @@
 from __future__ import annotations
 
+import logging
+import threading
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
 from macpymessenger import Configuration, IMessageClient, TemplateManager
-from tests.support import StubRunner
+from macpymessenger.exceptions import (
+    ConflictingBulkOptionsError,
+    InvalidBatchSizeError,
+    InvalidConcurrencyError,
+)
+from tests.support import StubOutputRunner, StubRunner
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 
 def test_send_bulk_classifies_recipient_handles(
@@ -44,3 +58,155 @@ def test_send_bulk_classifies_all_recipient_handles_as_failures(
     success, failure = client_instance.send_bulk(["1", "2"], "Ping")
     assert success == []
     assert failure == ["1", "2"]
+
+
+def test_send_bulk_batch_mode_uses_one_invocation_per_chunk(
+    configuration: Configuration, template_manager: TemplateManager
+) -> None:
+    runner = StubRunner()
+    output_runner = StubOutputRunner(["2"])
+    client_instance = IMessageClient(
+        configuration=configuration,
+        template_manager=template_manager,
+        command_runner=runner,
+        output_command_runner=output_runner,
+    )
+    success, failure = client_instance.send_bulk(["1", "2", "3"], "Ping", batch_size=2)
+    assert success == ["1", "3"]
+    assert failure == ["2"]
+    assert len(output_runner.commands) == 2  # noqa: PLR2004
+    assert runner.commands == []
+
+
+def test_send_bulk_concurrent_mode_preserves_input_order(
+    configuration: Configuration, template_manager: TemplateManager
+) -> None:
+    runner = StubRunner(["2", "5"], latency_seconds=0.001)
+    client_instance = IMessageClient(
+        configuration=configuration,
+        template_manager=template_manager,
+        command_runner=runner,
+    )
+    recipients = [str(index) for index in range(20)]
+    success, failure = client_instance.send_bulk(recipients, "Ping", max_workers=4)
+    assert success == [number for number in recipients if number not in {"2", "5"}]
+    assert failure == ["2", "5"]
+    assert len(runner.commands) == len(recipients)
+
+
+def test_send_bulk_concurrent_mode_runs_sends_in_parallel(
+    configuration: Configuration, template_manager: TemplateManager
+) -> None:
+    barrier = threading.Barrier(3, timeout=5)
+
+    def rendezvous_runner(command: list[str]) -> None:  # noqa: ARG001
+        barrier.wait()
+
+    client_instance = IMessageClient(
+        configuration=configuration,
+        template_manager=template_manager,
+        command_runner=rendezvous_runner,
+    )
+    success, failure = client_instance.send_bulk(["1", "2", "3"], "Ping", max_workers=3)
+    assert success == ["1", "2", "3"]
+    assert failure == []
+
+
+def test_send_bulk_concurrent_mode_logs_one_record_per_recipient(
+    configuration: Configuration,
+    template_manager: TemplateManager,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    logger = logging.getLogger("test.bulk.concurrent")
+    client_instance = IMessageClient(
+        configuration=configuration,
+        template_manager=template_manager,
+        command_runner=StubRunner(["7"], latency_seconds=0.001),
+        logger=logger,
+    )
+    recipients = [str(index) for index in range(40)]
+    with caplog.at_level(logging.INFO, logger="test.bulk.concurrent"):
+        client_instance.send_bulk(recipients, "Ping", max_workers=8)
+    sent = sorted(
+        record.getMessage() for record in caplog.records if record.levelno == logging.INFO
+    )
+    assert sent == sorted(f"Message sent to {number}" for number in recipients if number != "7")
+    errors = [record.getMessage() for record in caplog.records if record.levelno == logging.ERROR]
+    assert errors == ["Failed to send message to 7"]
+
+
+@pytest.mark.parametrize("max_workers", [0, -2, True, 1.5])
+def test_send_bulk_rejects_invalid_max_workers(
+    client: tuple[IMessageClient, StubRunner], max_workers: Any
+) -> None:
+    instance, runner = client
+    with pytest.raises(InvalidConcurrencyError):
+        instance.send_bulk(["1"], "Ping", max_workers=max_workers)
+    assert runner.commands == []
+
+
+def test_send_bulk_rejects_batch_size_with_max_workers(
+    client: tuple[IMessageClient, StubRunner],
+) -> None:
+    instance, _ = client
+    with pytest.raises(ConflictingBulkOptionsError):
+        instance.send_bulk(["1"], "Ping", batch_size=10, max_workers=2)
+
+
+def test_send_bulk_iter_streams_outcomes_from_a_generator(
+    client: tuple[IMessageClient, StubRunner],
+) -> None:
+    instance, runner = client
+    runner.failing_recipient_handles.add("2")
+    read: list[str] = []
+
+    def recipients() -> Iterator[str]:
+        for number in ("1", "2", "3"):
+            read.append(number)
+            yield number
+
+    outcomes = instance.send_bulk_iter(recipients(), "Ping")
+    assert read == []
+    first = next(outcomes)
+    assert (first.recipient_handle, first.succeeded) == ("1", True)
+    assert read == ["1"]
+    assert len(runner.commands) == 1
+    assert [outcome.succeeded for outcome in outcomes] == [False, True]
+
+
+def test_send_bulk_iter_reports_progress(client: tuple[IMessageClient, StubRunner]) -> None:
+    instance, runner = client
+    runner.failing_recipient_handles.add("2")
+    counts: list[tuple[int, int]] = []
+    outcomes = instance.send_bulk_iter(
+        iter(["1", "2", "3"]),
+        "Ping",
+        max_workers=2,
+        progress=lambda succeeded, failed: counts.append((succeeded, failed)),
+    )
+    assert [outcome.recipient_handle for outcome in outcomes] == ["1", "2", "3"]
+    assert counts == [(1, 0), (1, 1), (2, 1)]
+
+
+def test_send_bulk_iter_batch_mode_consumes_one_chunk_at_a_time(
+    configuration: Configuration,
+) -> None:
+    output_runner = StubOutputRunner()
+    instance = IMessageClient(
+        configuration, command_runner=StubRunner(), output_command_runner=output_runner
+    )
+    outcomes = instance.send_bulk_iter(
+        (str(number) for number in range(1_000_000)), "Ping", batch_size=2
+    )
+    assert [next(outcomes).recipient_handle for _ in range(3)] == ["0", "1", "2"]
+    assert len(output_runner.commands) == 2  # noqa: PLR2004
+
+
+def test_send_bulk_iter_validates_options_before_sending(
+    client: tuple[IMessageClient, StubRunner],
+) -> None:
+    instance, _ = client
+    with pytest.raises(InvalidConcurrencyError):
+        instance.send_bulk_iter(iter(["1"]), "Ping", max_workers=0)
+    with pytest.raises(InvalidBatchSizeError):
+        instance.send_bulk_iter(iter(["1"]), "Ping", batch_size=0)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import gzip
 import logging
+import threading
+from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -12,6 +16,7 @@ from macpymessenger import (
     TemplateManager,
 )
 from macpymessenger.exceptions import ConfigurationError
+from macpymessenger.logfiles import QueuedFileHandler, open_file_handler
 from tests.support import StubRunner, remove_file_handlers
 
 
@@ -174,3 +179,158 @@ def test_client_file_logging_raises_configuration_error_on_oserror(
             command_runner=StubRunner(),
             file_logging=FileLoggingConfiguration(log_directory),
         )
+
+
+def test_asynchronous_file_logging_writes_records_on_close(
+    configuration: Configuration,
+    template_manager: TemplateManager,
+    tmp_path: Path,
+) -> None:
+    log_path = tmp_path / "async.log"
+    logger = logging.getLogger("test_asynchronous_file_logging")
+    logger.setLevel(logging.INFO)
+    client_instance = IMessageClient(
+        configuration=configuration,
+        template_manager=template_manager,
+        command_runner=StubRunner(),
+        logger=logger,
+        file_logging=FileLoggingConfiguration(log_path, asynchronous=True),
+    )
+    try:
+        handlers = [
+            handler for handler in logger.handlers if isinstance(handler, QueuedFileHandler)
+        ]
+        assert len(handlers) == 1
+        assert not any(isinstance(handler, logging.FileHandler) for handler in logger.handlers)
+
+        client_instance.send("+15555555555", "Hello")
+        client_instance.close()
+
+        contents = log_path.read_text(encoding="utf-8")
+        assert "INFO" in contents
+        assert "+15555555555" in contents
+    finally:
+        remove_file_handlers(logger)
+
+
+def test_asynchronous_file_logging_is_not_attached_twice(
+    configuration: Configuration,
+    template_manager: TemplateManager,
+    tmp_path: Path,
+) -> None:
+    logger = logging.getLogger("test_asynchronous_file_logging_twice")
+    file_logging = FileLoggingConfiguration(tmp_path / "async.log", asynchronous=True)
+    try:
+        for _ in range(2):
+            IMessageClient(
+                configuration=configuration,
+                template_manager=template_manager,
+                command_runner=StubRunner(),
+                logger=logger,
+                file_logging=file_logging,
+            )
+        assert len(logger.handlers) == 1
+    finally:
+        remove_file_handlers(logger)
+
+
+def test_queued_handler_flush_and_close_write_every_record(tmp_path: Path) -> None:
+    log_path = tmp_path / "queued.log"
+    handler = open_file_handler(FileLoggingConfiguration(log_path, asynchronous=True))
+    assert isinstance(handler, QueuedFileHandler)
+    logger = logging.getLogger("test_closing_queued_handler")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        for index in range(100):
+            logger.info("record %d", index)
+        handler.flush()
+        lines = log_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 100  # noqa: PLR2004
+        assert lines[-1].endswith("record 99")
+
+        logger.info("last record")
+        handler.close()
+        assert log_path.read_text(encoding="utf-8").endswith("last record\n")
+        handler.flush()
+    finally:
+        logger.removeHandler(handler)
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_size_rotation_keeps_backup_count_files(tmp_path: Path, *, asynchronous: bool) -> None:
+    log_path = tmp_path / "rotating.log"
+    handler = open_file_handler(
+        FileLoggingConfiguration(log_path, asynchronous=asynchronous, max_bytes=200, backup_count=2)
+    )
+    logger = logging.getLogger(f"test_size_rotation_{asynchronous}")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        for index in range(50):
+            logger.info("rotating record %d", index)
+    finally:
+        handler.close()
+        logger.removeHandler(handler)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "rotating.log",
+        "rotating.log.1",
+        "rotating.log.2",
+    ]
+    assert log_path.stat().st_size <= 200  # noqa: PLR2004
+
+
+def test_compressed_rotation_gzips_backups(tmp_path: Path) -> None:
+    log_path = tmp_path / "compressed.log"
+    handler = open_file_handler(
+        FileLoggingConfiguration(
+            log_path, asynchronous=True, max_bytes=200, backup_count=3, compress=True
+        )
+    )
+    logger = logging.getLogger("test_compressed_rotation")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        for index in range(50):
+            logger.info("compressed record %d", index)
+    finally:
+        handler.close()
+        logger.removeHandler(handler)
+
+    for thread in threading.enumerate():
+        if thread.name == "macpymessenger-log-compression":
+            thread.join()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "compressed.log",
+        "compressed.log.1.gz",
+        "compressed.log.2.gz",
+        "compressed.log.3.gz",
+    ]
+    newest_backup = gzip.decompress((tmp_path / "compressed.log.1.gz").read_bytes())
+    assert b"compressed record" in newest_backup
+
+
+def test_time_rotation_uses_timed_handler(tmp_path: Path) -> None:
+    handler = open_file_handler(
+        FileLoggingConfiguration(tmp_path / "timed.log", when="midnight", backup_count=7)
+    )
+    try:
+        assert isinstance(handler, TimedRotatingFileHandler)
+        assert handler.backupCount == 7  # noqa: PLR2004
+    finally:
+        handler.close()
+
+
+@pytest.mark.parametrize(
+    ("options", "reason"),
+    [
+        ({"max_bytes": -1}, "must not be negative"),
+        ({"backup_count": -1}, "must not be negative"),
+        ({"max_bytes": 1024, "when": "H"}, "not both"),
+        ({"when": "fortnightly"}, "unknown interval"),
+    ],
+)
+def test_invalid_rotation_raises_configuration_error(options: dict[str, Any], reason: str) -> None:
+    with pytest.raises(ConfigurationError, match=reason):
+        FileLoggingConfiguration(**options)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import subprocess
 from typing import TYPE_CHECKING, Any
 
 import pytest
@@ -7,7 +8,7 @@ import pytest
 import macpymessenger
 from macpymessenger import client as client_module
 from macpymessenger import commands as commands_module
-from macpymessenger.commands import SubprocessCommandRunner
+from macpymessenger.commands import SubprocessCommandRunner, SubprocessOutputCommandRunner
 from macpymessenger.exceptions import InvalidCommandError
 
 if TYPE_CHECKING:
@@ -46,6 +47,31 @@ def test_subprocess_runner_invokes_subprocess_without_shell(
     assert expected_kwargs.items() <= recorded["kwargs"].items()
 
 
+def test_subprocess_output_runner_returns_stdout(monkeypatch: pytest.MonkeyPatch) -> None:
+    recorded: dict[str, Any] = {}
+
+    def fake_run(command: Sequence[str], **kwargs: object) -> subprocess.CompletedProcess[str]:
+        recorded["command"] = command
+        recorded["kwargs"] = kwargs
+        return subprocess.CompletedProcess(command, 0, stdout="0\tok\n")
+
+    monkeypatch.setattr("macpymessenger.commands.subprocess.run", fake_run)
+    runner = SubprocessOutputCommandRunner()
+    output = runner(["osascript", "batch.scpt", "+10000000000", "hello"])
+
+    assert output == "0\tok\n"
+    assert recorded["command"] == ("osascript", "batch.scpt", "+10000000000", "hello")
+    expected_kwargs = {"check": True, "text": True, "shell": False, "stdout": subprocess.PIPE}
+    assert expected_kwargs.items() <= recorded["kwargs"].items()
+
+
+def test_subprocess_output_runner_rejects_non_string_command_segments() -> None:
+    runner = SubprocessOutputCommandRunner()
+    command: Any = ["osascript", 1]
+    with pytest.raises(InvalidCommandError, match="Command segments must be strings"):
+        runner(command)
+
+
 def test_command_runner_exports_remain_importable_from_client_and_package_root() -> None:
     assert client_module.SubprocessCommandRunner is commands_module.SubprocessCommandRunner
     assert macpymessenger.SubprocessCommandRunner is commands_module.SubprocessCommandRunner
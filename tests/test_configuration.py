@@ -43,3 +43,52 @@ def test_configuration_raises_for_unreadable_script(
 
     with pytest.raises(ScriptNotFoundError):
         Configuration(script_path)
+
+
+def test_configuration_defaults_to_packaged_worker_script() -> None:
+    configuration = Configuration()
+    assert configuration.worker_script_path.name == "sendMessageWorker.scpt"
+    assert configuration.worker_script_path.exists()
+
+
+def test_configuration_raises_for_missing_worker_script(tmp_path: Path) -> None:
+    with pytest.raises(ScriptNotFoundError):
+        Configuration(worker_script_path=tmp_path / "missing.scpt")
+
+
+def test_configuration_defaults_to_packaged_batch_script() -> None:
+    configuration = Configuration()
+    assert configuration.batch_script_path.name == "sendMessageBatch.scpt"
+    assert configuration.batch_script_path.exists()
+
+
+def test_configuration_opens_each_unchanged_script_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    script_path = tmp_path / "cached.scpt"
+    script_path.write_text("-- mock script", encoding="utf-8")
+    opened: list[Path] = []
+    original_open = Path.open
+
+    def recording_open(self: Path, mode: str = "r", *args: Any, **kwargs: Any) -> Any:
+        if mode == "rb":
+            opened.append(self)
+        return original_open(self, mode, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", recording_open)
+    Configuration(script_path)
+    Configuration(script_path)
+    assert opened.count(script_path) == 1
+
+    script_path.write_text("-- edited script", encoding="utf-8")
+    Configuration(script_path)
+    assert opened.count(script_path) == 2  # noqa: PLR2004
+
+
+def test_configuration_revalidates_a_replaced_script(tmp_path: Path) -> None:
+    script_path = tmp_path / "replaced.scpt"
+    script_path.write_text("-- mock script", encoding="utf-8")
+    Configuration(script_path)
+    script_path.unlink()
+    with pytest.raises(ScriptNotFoundError):
+        Configuration(script_path)
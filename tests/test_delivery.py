@@ -2,20 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import subprocess
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
 from macpymessenger import Configuration
 from macpymessenger.delivery import MessageDelivery
 from macpymessenger.exceptions import (
+    ConfigurationError,
+    InvalidBatchSizeError,
     InvalidDelayTypeError,
     MessageSendError,
     NegativeDelayError,
 )
-from tests.support import StubRunner
+from tests.support import StubAsyncRunner, StubOutputRunner, StubRunner
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -195,6 +198,22 @@ class TestExecute:
             )
         assert any("+19999999999" in record.message for record in caplog.records)
 
+    def test_async_only_delivery_rejects_synchronous_sends(
+        self,
+        configuration: Configuration,
+        delivery_logger: logging.Logger,
+    ) -> None:
+        with pytest.raises(ConfigurationError):
+            MessageDelivery(configuration, None, delivery_logger)
+        runner = StubAsyncRunner()
+        instance = MessageDelivery(
+            configuration, None, delivery_logger, async_command_runner=runner
+        )
+        asyncio.run(instance.deliver_async("+10000000000", "hi"))
+        assert len(runner.commands) == 1
+        with pytest.raises(ConfigurationError, match="needs a command_runner"):
+            instance.deliver("+10000000000", "hi")
+
 
 # ---------------------------------------------------------------------------
 # deliver (full integration path through the delivery object)
@@ -279,3 +298,150 @@ class TestDeliver:
             "Execution error while sending to +10000000000" in record.message
             for record in caplog.records
         )
+
+
+# ---------------------------------------------------------------------------
+# deliver_batch (chunked batch send script)
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def batch_delivery(
+    configuration: Configuration,
+    delivery_logger: logging.Logger,
+) -> tuple[MessageDelivery, StubOutputRunner]:
+    output_runner = StubOutputRunner()
+    instance = MessageDelivery(
+        configuration=configuration,
+        command_runner=StubRunner(),
+        logger=delivery_logger,
+        output_command_runner=output_runner,
+    )
+    return instance, output_runner
+
+
+class TestDeliverBatch:
+    def test_sends_pairs_in_one_invocation(
+        self,
+        batch_delivery: tuple[MessageDelivery, StubOutputRunner],
+        configuration: Configuration,
+    ) -> None:
+        instance, output_runner = batch_delivery
+        outcomes = instance.deliver_batch([("+10000000001", "Hi A"), ("+10000000002", "Hi B")])
+        assert output_runner.commands == [
+            [
+                "osascript",
+                str(configuration.batch_script_path),
+                "+10000000001",
+                "Hi A",
+                "+10000000002",
+                "Hi B",
+            ]
+        ]
+        assert [outcome.recipient_handle for outcome in outcomes] == [
+            "+10000000001",
+            "+10000000002",
+        ]
+        assert all(outcome.succeeded for outcome in outcomes)
+
+    def test_chunks_by_count(
+        self,
+        batch_delivery: tuple[MessageDelivery, StubOutputRunner],
+    ) -> None:
+        instance, output_runner = batch_delivery
+        messages = [(f"+1000000000{index}", "Hi") for index in range(5)]
+        outcomes = instance.deliver_batch(messages, chunk_size=2)
+        assert [len(command[2:]) // 2 for command in output_runner.commands] == [2, 2, 1]
+        assert [outcome.recipient_handle for outcome in outcomes] == [
+            recipient_handle for recipient_handle, _ in messages
+        ]
+
+    def test_chunks_by_argument_bytes(
+        self,
+        batch_delivery: tuple[MessageDelivery, StubOutputRunner],
+    ) -> None:
+        instance, output_runner = batch_delivery
+        messages = [("+10000000001", "x" * 40), ("+10000000002", "y" * 40)]
+        instance.deliver_batch(messages, max_argument_bytes=64)
+        assert len(output_runner.commands) == len(messages)
+
+    def test_reports_failures_per_recipient(
+        self,
+        batch_delivery: tuple[MessageDelivery, StubOutputRunner],
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        instance, output_runner = batch_delivery
+        output_runner.failing_recipient_handles.add("+19999999999")
+        with caplog.at_level(logging.ERROR, logger="test.delivery"):
+            outcomes = instance.deliver_batch([("+10000000001", "Hi"), ("+19999999999", "Hi")])
+        assert outcomes[0].succeeded
+        assert isinstance(outcomes[1].error, MessageSendError)
+        assert str(outcomes[1].error) == "Failed to send message to +19999999999"
+        assert any("+19999999999" in record.message for record in caplog.records)
+
+    def test_missing_report_line_is_a_failure(
+        self,
+        configuration: Configuration,
+        delivery_logger: logging.Logger,
+    ) -> None:
+        instance = MessageDelivery(
+            configuration=configuration,
+            command_runner=StubRunner(),
+            logger=delivery_logger,
+            output_command_runner=lambda command: "0\tok\n",  # noqa: ARG005
+        )
+        outcomes = instance.deliver_batch([("+10000000001", "Hi"), ("+10000000002", "Hi")])
+        assert outcomes[0].succeeded
+        assert isinstance(outcomes[1].error, MessageSendError)
+
+    def test_called_process_error_fails_whole_chunk(
+        self,
+        configuration: Configuration,
+        delivery_logger: logging.Logger,
+    ) -> None:
+        def raising_runner(command: list[str]) -> str:
+            raise subprocess.CalledProcessError(returncode=1, cmd=command)
+
+        instance = MessageDelivery(
+            configuration=configuration,
+            command_runner=StubRunner(),
+            logger=delivery_logger,
+            output_command_runner=raising_runner,
+        )
+        outcomes = instance.deliver_batch([("+10000000001", "Hi"), ("+10000000002", "Hi")])
+        assert [str(outcome.error) for outcome in outcomes] == [
+            "Failed to send message to +10000000001",
+            "Failed to send message to +10000000002",
+        ]
+        assert all(
+            isinstance(outcome.error.__cause__, subprocess.CalledProcessError)
+            for outcome in outcomes
+        )
+
+    def test_oserror_maps_to_command_failed(
+        self,
+        configuration: Configuration,
+        delivery_logger: logging.Logger,
+    ) -> None:
+        def raising_runner(command: object) -> str:  # noqa: ARG001
+            msg = "exec failed"
+            raise OSError(msg)
+
+        instance = MessageDelivery(
+            configuration=configuration,
+            command_runner=StubRunner(),
+            logger=delivery_logger,
+            output_command_runner=raising_runner,
+        )
+        outcomes = instance.deliver_batch([("+10000000001", "Hi")])
+        assert str(outcomes[0].error) == "Failed to execute osascript for +10000000001"
+
+    @pytest.mark.parametrize("chunk_size", [0, -1, True, 1.5])
+    def test_rejects_invalid_chunk_size(
+        self,
+        batch_delivery: tuple[MessageDelivery, StubOutputRunner],
+        chunk_size: Any,
+    ) -> None:
+        instance, _ = batch_delivery
+        with pytest.raises(InvalidBatchSizeError):
+            instance.deliver_batch([("+10000000001", "Hi")], chunk_size=chunk_size)
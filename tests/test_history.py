@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from macpymessenger import ChatDatabaseTailer, ChatHistoryReader, Configuration, IMessageClient
+from macpymessenger.exceptions import ChatHistoryError
+from macpymessenger.history import _SELECT_PAGE
+from tests.support import StubRunner, create_chat_database
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def chat_database(tmp_path: Path) -> Path:
+    path = tmp_path / "chat.db"
+    create_chat_database(path, {"+15550000001": 25, "ada@example.com": 3})
+    return path
+
+
+def test_messages_are_returned_newest_first(chat_database: Path) -> None:
+    with ChatHistoryReader(chat_database) as reader:
+        page = reader.messages("ada@example.com", limit=2)
+    assert [message.text for message in page] == ["message 2", "message 1"]
+    assert page[0].handle == "ada@example.com"
+    assert page[0].is_from_me is False
+    assert page[1].is_from_me is True
+    assert page[0].chat_id == 2  # noqa: PLR2004
+    assert page[0].sent_at == datetime(2001, 1, 1, 0, 2, 2, tzinfo=UTC)
+
+
+def test_keyset_pages_cover_the_conversation_once(chat_database: Path) -> None:
+    texts: list[str] = []
+    with ChatHistoryReader(chat_database) as reader:
+        before = None
+        while page := reader.messages("+15550000001", limit=10, before=before):
+            texts.extend(message.text or "" for message in page)
+            before = page[-1].rowid
+    assert texts == [f"message {index}" for index in reversed(range(25))]
+
+
+def test_pages_merge_services_and_break_date_ties_by_rowid(chat_database: Path) -> None:
+    connection = sqlite3.connect(chat_database)
+    with connection:
+        connection.execute(
+            "INSERT INTO handle (ROWID, id, service) VALUES (3, 'ada@example.com', 'SMS')"
+        )
+        connection.executemany(
+            "INSERT INTO message (guid, text, handle_id, date) VALUES (?, ?, 3, ?)",
+            [("sms-0", "sms 0", 62_000_000_000), ("sms-1", "sms 1", 122_000_000_000)],
+        )
+    connection.close()
+    texts: list[str] = []
+    with ChatHistoryReader(chat_database) as reader:
+        before = None
+        while page := reader.messages("ada@example.com", limit=2, before=before):
+            texts.extend(message.text or "" for message in page)
+            before = page[-1].rowid
+    assert texts == ["sms 1", "message 2", "sms 0", "message 1", "message 0"]
+
+
+def test_unknown_handle_and_cursor_return_empty_pages(chat_database: Path) -> None:
+    with ChatHistoryReader(chat_database) as reader:
+        assert reader.messages("+19999999999") == []
+        assert reader.messages("ada@example.com", before=10_000) == []
+
+
+def test_reader_does_not_write_to_the_database(chat_database: Path) -> None:
+    with ChatHistoryReader(chat_database) as reader:
+        reader.messages("ada@example.com")
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            reader._connect().execute("DELETE FROM message")
+
+
+def test_page_query_seeks_the_handle_index(chat_database: Path) -> None:
+    with ChatHistoryReader(chat_database) as reader:
+        plan = reader._connect().execute(f"EXPLAIN QUERY PLAN {_SELECT_PAGE}", (2, 1, 1, 1))
+        details = " ".join(row[-1] for row in plan)
+    assert "message_idx_handle" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_missing_database_raises_chat_history_error(tmp_path: Path) -> None:
+    with pytest.raises(ChatHistoryError, match="Full Disk Access"):
+        ChatHistoryReader(tmp_path / "missing.db").messages("+15550000001")
+    assert not (tmp_path / "missing.db").exists()
+
+
+@pytest.mark.parametrize("limit", [0, -1, True])
+def test_invalid_limit_is_rejected(chat_database: Path, limit: int) -> None:
+    with pytest.raises(ChatHistoryError):
+        ChatHistoryReader(chat_database).messages("+15550000001", limit=limit)
+
+
+def test_client_reads_history_from_configured_database(
+    script_path: Path, chat_database: Path
+) -> None:
+    configuration = Configuration(script_path, chat_database_path=chat_database)
+    client = IMessageClient(configuration, command_runner=StubRunner())
+    page = client.get_chat_history("+15550000001", limit=3)
+    older = client.get_chat_history("+15550000001", limit=3, before=page[-1].rowid)
+    client.close()
+    assert [message.text for message in page + older] == [
+        f"message {index}" for index in range(24, 18, -1)
+    ]
+
+
+def _add_messages(path: Path, *texts: str, handle_id: int = 1) -> None:
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.executemany(
+            "INSERT INTO message (guid, text, handle_id, date, is_from_me) VALUES (?, ?, ?, ?, 0)",
+            [(f"new-{text}", text, handle_id, 10**15) for text in texts],
+        )
+    connection.close()
+
+
+def test_tailer_starts_after_the_newest_message(chat_database: Path) -> None:
+    with ChatDatabaseTailer(chat_database) as tailer:
+        assert tailer.poll() == []
+        _add_messages(chat_database, "reply", handle_id=0)
+        [message] = tailer.poll()
+    assert (message.text, message.handle) == ("reply", None)
+    assert tailer.watermark == message.rowid
+
+
+def test_tailer_resumes_from_a_saved_watermark_in_batches(chat_database: Path) -> None:
+    with ChatDatabaseTailer(chat_database, watermark=20, batch_size=4) as tailer:
+        batches = [tailer.poll() for _ in range(3)]
+    assert [[message.rowid for message in batch] for batch in batches] == [
+        [21, 22, 23, 24],
+        [25, 26, 27, 28],
+        [],
+    ]
+    assert batches[0][0].handle == "+15550000001"
+
+
+def test_tailer_skips_the_query_while_files_are_unchanged(chat_database: Path) -> None:
+    statements: list[str] = []
+    with ChatDatabaseTailer(chat_database) as tailer:
+        tailer.poll()
+        tailer._connect().set_trace_callback(statements.append)
+        tailer.poll()
+        assert statements == []
+        _add_messages(chat_database, "later")
+        assert [message.text for message in tailer.poll()] == ["later"]
+    assert len(statements) == 1
+
+
+def test_follow_backs_off_while_idle_and_yields_new_batches(chat_database: Path) -> None:
+    stop = threading.Event()
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        if len(sleeps) == 3:  # noqa: PLR2004
+            _add_messages(chat_database, "a", "b", "c")
+        if len(sleeps) == 5:  # noqa: PLR2004
+            stop.set()
+
+    tailer = ChatDatabaseTailer(
+        chat_database, batch_size=2, min_interval=1, max_interval=3, sleep=sleep
+    )
+    batches = [[message.text for message in batch] for batch in tailer.follow(stop)]
+    tailer.close()
+    assert batches == [["a", "b"], ["c"]]
+    assert sleeps == [2, 3, 3, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "options", [{"batch_size": 0}, {"min_interval": 0}, {"min_interval": 2, "max_interval": 1}]
+)
+def test_tailer_rejects_invalid_settings(chat_database: Path, options: Any) -> None:
+    with pytest.raises(ChatHistoryError):
+        ChatDatabaseTailer(chat_database, **options)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+import pytest
+
+from macpymessenger import (
+    AsyncIMessageClient,
+    Configuration,
+    DeliveryMetrics,
+    IMessageClient,
+    render_prometheus,
+)
+from macpymessenger.delivery import MessageDelivery
+from macpymessenger.exceptions import InvalidDelayTypeError, MessageSendError
+from tests.support import StubAsyncRunner, StubOutputRunner, StubRunner
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from macpymessenger import CommandRunner
+
+
+def _delivery(
+    script_path: Path, metrics: DeliveryMetrics, runner: CommandRunner | None = None
+) -> MessageDelivery:
+    return MessageDelivery(
+        Configuration(script_path),
+        runner if runner is not None else StubRunner(["+15550000002"]),
+        logging.getLogger("test.metrics"),
+        output_command_runner=StubOutputRunner(["+15550000002"]),
+        metrics=metrics,
+    )
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    metrics = DeliveryMetrics(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.01, 0.05, 3.0):
+        metrics.observe("execute", seconds)
+    histogram = metrics.histograms()["execute"]
+    assert histogram.cumulative_counts == (2, 3, 4)
+    assert histogram.total == pytest.approx(3.065)
+    assert histogram.count == 4  # noqa: PLR2004
+
+
+def test_deliver_reports_every_stage_and_result(script_path: Path) -> None:
+    metrics = DeliveryMetrics()
+    delivery = _delivery(script_path, metrics)
+    delivery.deliver("+15550000001", "Hello")
+    with pytest.raises(MessageSendError):
+        delivery.deliver("+15550000002", "Hello")
+    with pytest.raises(InvalidDelayTypeError):
+        delivery.deliver("+15550000001", "Hello", delay_seconds="soon")
+    counts = {stage: histogram.count for stage, histogram in metrics.histograms().items()}
+    assert counts == {"validate": 2, "build_command": 2, "execute": 2}
+    assert metrics.succeeded == 1
+    assert metrics.failures() == {"MessageSendError": 1, "InvalidDelayTypeError": 1}
+    assert metrics.in_flight == 0
+
+
+def test_in_flight_counts_sends_while_their_command_runs(script_path: Path) -> None:
+    metrics = DeliveryMetrics()
+    seen: list[int] = []
+
+    def runner(_command: Sequence[str]) -> None:
+        seen.append(metrics.in_flight)
+
+    delivery = _delivery(script_path, metrics, runner=runner)
+    delivery.deliver("+15550000001", "Hello")
+    assert (seen, metrics.in_flight) == ([1], 0)
+
+
+def test_batch_chunks_report_each_recipient(script_path: Path) -> None:
+    metrics = DeliveryMetrics()
+    outcomes = _delivery(script_path, metrics).deliver_batch(
+        [("+15550000001", "a"), ("+15550000002", "b"), ("+15550000003", "c")], chunk_size=2
+    )
+    assert [outcome.succeeded for outcome in outcomes] == [True, False, True]
+    assert metrics.histograms()["execute"].count == 2  # noqa: PLR2004
+    assert (metrics.succeeded, metrics.failures()) == (2, {"MessageSendError": 1})
+
+
+def test_clients_pass_metrics_to_delivery(script_path: Path) -> None:
+    metrics = DeliveryMetrics()
+    client = IMessageClient(
+        Configuration(script_path), command_runner=StubRunner(), metrics=metrics
+    )
+    client.send("+15550000001", "Hello")
+    async_client = AsyncIMessageClient(
+        Configuration(script_path), command_runner=StubAsyncRunner(), metrics=metrics
+    )
+    asyncio.run(async_client.send("+15550000001", "Hello"))
+    assert metrics.succeeded == 2  # noqa: PLR2004
+    assert metrics.histograms()["validate"].count == 2  # noqa: PLR2004
+
+
+def test_render_prometheus_text_format() -> None:
+    metrics = DeliveryMetrics(buckets=(0.5, 1.0))
+    metrics.observe("execute", 0.25)
+    metrics.record(None)
+    metrics.record(MessageSendError.delivery_failed("+15550000001"))
+    text = render_prometheus(metrics)
+    assert text.endswith("\n")
+    assert text.splitlines() == [
+        "# HELP macpymessenger_delivery_stage_seconds Time spent in each delivery stage.",
+        "# TYPE macpymessenger_delivery_stage_seconds histogram",
+        'macpymessenger_delivery_stage_seconds_bucket{stage="execute",le="0.5"} 1',
+        'macpymessenger_delivery_stage_seconds_bucket{stage="execute",le="1.0"} 1',
+        'macpymessenger_delivery_stage_seconds_bucket{stage="execute",le="+Inf"} 1',
+        'macpymessenger_delivery_stage_seconds_sum{stage="execute"} 0.25',
+        'macpymessenger_delivery_stage_seconds_count{stage="execute"} 1',
+        "# HELP macpymessenger_deliveries_succeeded_total Recipients sent to successfully.",
+        "# TYPE macpymessenger_deliveries_succeeded_total counter",
+        "macpymessenger_deliveries_succeeded_total 1",
+        (
+            "# HELP macpymessenger_deliveries_failed_total"
+            " Recipients whose send failed, by exception type."
+        ),
+        "# TYPE macpymessenger_deliveries_failed_total counter",
+        'macpymessenger_deliveries_failed_total{error="MessageSendError"} 1',
+        "# HELP macpymessenger_deliveries_in_flight Recipients being sent to now.",
+        "# TYPE macpymessenger_deliveries_in_flight gauge",
+        "macpymessenger_deliveries_in_flight 0",
+    ]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import wait
+from typing import TYPE_CHECKING
+
+import pytest
+
+from macpymessenger import KeyedSerialExecutor
+from macpymessenger.delivery import MessageDelivery
+from macpymessenger.exceptions import (
+    DispatcherError,
+    InvalidConcurrencyError,
+    MessageSendError,
+)
+from tests.support import StubRunner
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from macpymessenger import Configuration
+
+
+def _delivery(
+    configuration: Configuration, runner: Callable[[Sequence[str]], None]
+) -> MessageDelivery:
+    logger = logging.getLogger("test.ordering")
+    logger.disabled = True
+    return MessageDelivery(configuration, runner, logger)
+
+
+@pytest.mark.parametrize("options", [{"max_workers": 0}, {"sends_per_turn": True}])
+def test_rejects_invalid_counts(configuration: Configuration, options: dict[str, int]) -> None:
+    with pytest.raises(InvalidConcurrencyError):
+        KeyedSerialExecutor(_delivery(configuration, StubRunner()), **options)
+
+
+def test_sends_to_one_recipient_keep_submission_order(configuration: Configuration) -> None:
+    runner = StubRunner(latency_seconds=0.001)
+    recipients = ["+15550000001", "+15550000002", "+15550000003"]
+    messages = [(recipients[index % 3], f"Message {index}") for index in range(30)]
+
+    with KeyedSerialExecutor(
+        _delivery(configuration, runner), max_workers=3, sends_per_turn=2
+    ) as executor:
+        futures = executor.submit_many(messages)
+
+    assert all(future.done() for future in futures)
+    for recipient in recipients:
+        sent = [command[3] for command in runner.commands if command[2] == recipient]
+        assert sent == [body for handle, body in messages if handle == recipient]
+
+
+def test_different_recipients_run_in_parallel(configuration: Configuration) -> None:
+    both_sending = threading.Barrier(2, timeout=5)
+
+    def runner(_command: Sequence[str]) -> None:
+        both_sending.wait()
+
+    with KeyedSerialExecutor(_delivery(configuration, runner), max_workers=2) as executor:
+        futures = [executor.submit("+15550000001", "A"), executor.submit("+15550000002", "B")]
+
+    for future in futures:
+        future.result(timeout=0)
+
+
+def test_failure_does_not_stop_later_sends_and_idle_keys_are_dropped(
+    configuration: Configuration,
+) -> None:
+    runner = StubRunner(["+15550000001"])
+    executor = KeyedSerialExecutor(_delivery(configuration, runner), max_workers=2)
+
+    failed = executor.submit("+15550000001", "First")
+    futures = [executor.submit(f"+1555{index:07d}", "Ping") for index in range(2, 200)]
+    for future in futures:
+        future.result(timeout=5)
+
+    with pytest.raises(MessageSendError):
+        failed.result(timeout=5)
+    assert executor.active_recipients() == 0
+    executor.submit("+15550000002", "Again").result(timeout=5)
+    executor.shutdown()
+    assert len(runner.commands) == 200  # noqa: PLR2004
+
+
+def test_long_queue_yields_to_other_recipients(configuration: Configuration) -> None:
+    runner = StubRunner()
+    release = threading.Event()
+
+    def blocking_runner(command: Sequence[str]) -> None:
+        release.wait(5)
+        runner(command)
+
+    with KeyedSerialExecutor(
+        _delivery(configuration, blocking_runner), max_workers=1, sends_per_turn=2
+    ) as executor:
+        futures = executor.submit_many(
+            [("busy", "1"), ("busy", "2"), ("busy", "3"), ("busy", "4"), ("quiet", "1")]
+        )
+        release.set()
+        wait(futures, timeout=5)
+
+    assert [command[2:4] for command in runner.commands] == [
+        ["busy", "1"],
+        ["busy", "2"],
+        ["quiet", "1"],
+        ["busy", "3"],
+        ["busy", "4"],
+    ]
+
+
+def test_shutdown_can_cancel_queued_sends(configuration: Configuration) -> None:
+    runner = StubRunner()
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_runner(command: Sequence[str]) -> None:
+        started.set()
+        release.wait(5)
+        runner(command)
+
+    executor = KeyedSerialExecutor(_delivery(configuration, blocking_runner), max_workers=1)
+    running, queued = executor.submit_many([("+15550000001", "1"), ("+15550000001", "2")])
+    started.wait(5)
+    threading.Timer(0.05, release.set).start()
+    executor.shutdown(cancel_pending=True)
+
+    running.result(timeout=0)
+    assert queued.cancelled()
+    assert len(runner.commands) == 1
+    with pytest.raises(DispatcherError):
+        executor.submit("+15550000001", "3")
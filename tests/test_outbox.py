@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import pytest
+
+from macpymessenger import Outbox, OutboxEntry, RetryPolicy
+from macpymessenger.delivery import MessageDelivery
+from macpymessenger.exceptions import OutboxError
+from macpymessenger.outbox import DrainReport
+from tests.support import FakeClock, StubRunner
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from macpymessenger import Configuration, IMessageClient, TemplateManager
+
+
+class _CrashError(BaseException):
+    """Stands in for the process dying mid-send."""
+
+
+class _CrashingRunner(StubRunner):
+    def __init__(self, crash_recipient_handle: str) -> None:
+        super().__init__()
+        self.crash_recipient_handle = crash_recipient_handle
+
+    def __call__(self, command: Sequence[str]) -> None:
+        super().__call__(command)
+        if command[2] == self.crash_recipient_handle:
+            raise _CrashError
+
+
+def _delivery(configuration: Configuration, runner: StubRunner) -> MessageDelivery:
+    return MessageDelivery(
+        configuration=configuration,
+        command_runner=runner,
+        logger=logging.getLogger("test.outbox"),
+    )
+
+
+def _sent_recipients(runner: StubRunner) -> list[str]:
+    return [command[2] for command in runner.commands]
+
+
+def test_drain_sends_messages_in_enqueue_order(
+    tmp_path: Path, configuration: Configuration
+) -> None:
+    runner = StubRunner()
+    with Outbox(tmp_path / "outbox.db") as outbox:
+        outbox.enqueue("+10000000001", "One")
+        outbox.enqueue_many(OutboxEntry(f"+1000000000{index}", "Many") for index in (2, 3))
+        report = outbox.drain(_delivery(configuration, runner), batch_size=2)
+        assert report.sent == 3  # noqa: PLR2004
+        assert outbox.counts()["sent"] == 3  # noqa: PLR2004
+    assert _sent_recipients(runner) == ["+10000000001", "+10000000002", "+10000000003"]
+
+
+def test_crash_and_resume_delivers_every_message_at_least_once(
+    tmp_path: Path, configuration: Configuration
+) -> None:
+    database_path = tmp_path / "outbox.db"
+    recipients = [f"+1000000000{index}" for index in range(6)]
+    with Outbox(database_path) as outbox:
+        outbox.enqueue_many(OutboxEntry(recipient, "Hello") for recipient in recipients)
+
+    crashing_runner = _CrashingRunner(recipients[2])
+    outbox = Outbox(database_path)
+    with pytest.raises(_CrashError):
+        outbox.drain(_delivery(configuration, crashing_runner), batch_size=4)
+    outbox.close()
+
+    resumed_runner = StubRunner()
+    with Outbox(database_path) as resumed:
+        assert resumed.recover() == 2  # noqa: PLR2004
+        report = resumed.drain(_delivery(configuration, resumed_runner))
+        assert resumed.counts() == {"pending": 0, "leased": 0, "sent": 6, "failed": 0}
+
+    assert _sent_recipients(crashing_runner) == recipients[:3]
+    assert _sent_recipients(resumed_runner) == recipients[2:]
+    assert report.sent == 4  # noqa: PLR2004
+
+
+def test_expired_lease_is_reclaimed_by_another_drainer(tmp_path: Path) -> None:
+    database_path = tmp_path / "outbox.db"
+    clock = FakeClock(1_000.0)
+    with Outbox(database_path, lease_seconds=60, clock=clock) as first:
+        first.enqueue("+10000000000", "Hello")
+        assert len(first.claim(10)) == 1
+        with Outbox(database_path, lease_seconds=60, clock=clock) as second:
+            assert second.claim(10) == []
+            clock.advance(61)
+            reclaimed = second.claim(10)
+    assert [message.attempts for message in reclaimed] == [2]
+
+
+def test_failed_sends_retry_after_backoff_until_max_attempts(
+    tmp_path: Path, configuration: Configuration
+) -> None:
+    runner = StubRunner(["+19999999999"])
+    clock = FakeClock(1_000.0)
+    backoff = RetryPolicy(initial_backoff=10, jitter=False)
+    delivery = _delivery(configuration, runner)
+    with Outbox(
+        tmp_path / "outbox.db", max_attempts=3, retry_backoff=backoff, clock=clock
+    ) as outbox:
+        outbox.enqueue("+19999999999", "Hello")
+        outbox.enqueue("+10000000000", "Hello")
+        first = outbox.drain(delivery)
+        assert (first.sent, first.retried, first.failed) == (1, 1, 0)
+        assert outbox.seconds_until_next() == 10  # noqa: PLR2004
+        assert outbox.drain(delivery) == DrainReport()
+
+        clock.advance(10)
+        assert outbox.drain(delivery).retried == 1
+        assert outbox.seconds_until_next() == 20  # noqa: PLR2004
+        clock.advance(20)
+        assert outbox.drain(delivery).failed == 1
+        assert outbox.counts()["failed"] == 1
+        assert outbox.seconds_until_next() is None
+    assert _sent_recipients(runner).count("+19999999999") == 3  # noqa: PLR2004
+
+
+def test_template_message_without_template_manager_fails_alone(
+    tmp_path: Path, configuration: Configuration
+) -> None:
+    runner = StubRunner()
+    with Outbox(tmp_path / "outbox.db") as outbox:
+        outbox.enqueue_template("+10000000000", "greeting")
+        outbox.enqueue("+10000000001", "Hello")
+        report = outbox.drain(_delivery(configuration, runner))
+        assert outbox.counts() == {"pending": 0, "leased": 0, "sent": 1, "failed": 1}
+    assert (report.sent, report.failed) == (1, 1)
+
+
+def test_template_entries_render_when_drained(
+    tmp_path: Path,
+    client: tuple[IMessageClient, StubRunner],
+    template_manager: TemplateManager,
+) -> None:
+    instance, runner = client
+    template_manager.create_template("greeting", lambda name: t"Hello, {name}!")
+    with Outbox(tmp_path / "outbox.db") as outbox:
+        outbox.enqueue_template("+10000000000", "greeting", {"name": "Ada"})
+        outbox.enqueue_template("+10000000001", "missing")
+        report = instance.drain_outbox(outbox)
+    assert (report.sent, report.failed) == (1, 1)
+    assert runner.commands[-1][3] == "Hello, Ada!"
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        OutboxEntry("+10000000000"),
+        OutboxEntry("+10000000000", message_body="Hello", template_id="greeting"),
+    ],
+)
+def test_enqueue_rejects_ambiguous_entries(tmp_path: Path, entry: OutboxEntry) -> None:
+    with Outbox(tmp_path / "outbox.db") as outbox:
+        with pytest.raises(OutboxError):
+            outbox.enqueue_many([OutboxEntry("+10000000001", "Valid"), entry])
+        assert outbox.counts()["pending"] == 0
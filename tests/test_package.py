@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import macpymessenger
+
+HEAVY_MODULES = (
+    "asyncio",
+    "sqlite3",
+    "concurrent.futures",
+    "ctypes",
+    "logging.handlers",
+    "shutil",
+    "uuid",
+)
+
+
+def _modules_after(statement: str) -> set[str]:
+    code = f"import json, sys\n{statement}\nprint(json.dumps(sorted(sys.modules)))"
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return set(json.loads(completed.stdout))
+
+
+def test_import_loads_no_submodules() -> None:
+    modules = _modules_after("import macpymessenger")
+    assert not {name for name in modules if name.startswith("macpymessenger.")}
+
+
+def test_client_import_skips_modules_of_unused_features() -> None:
+    modules = _modules_after(
+        "from macpymessenger import Configuration, IMessageClient\nIMessageClient(Configuration())"
+    )
+    assert "macpymessenger.client" in modules
+    assert not modules.intersection(HEAVY_MODULES)
+
+
+def test_every_export_resolves_and_is_listed() -> None:
+    for name in macpymessenger.__all__:
+        assert getattr(macpymessenger, name).__name__ == name
+    assert set(macpymessenger.__all__) <= set(dir(macpymessenger))
+
+
+def test_unknown_attribute_raises_attribute_error() -> None:
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        _ = macpymessenger.missing
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from macpymessenger import AsyncIMessageClient, IMessageClient, RateLimit, RateLimiter
+from macpymessenger.exceptions import InvalidRateLimitError
+from tests.support import FakeClock, StubAsyncRunner, StubRunner
+
+if TYPE_CHECKING:
+    from macpymessenger import Configuration
+
+
+class _SleepRecorder:
+    """Sleep stand-in that advances a fake clock instead of waiting."""
+
+    def __init__(self, clock: FakeClock) -> None:
+        self.clock = clock
+        self.sleeps: list[float] = []
+
+    def __call__(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.clock.advance(seconds)
+
+
+def _limiter(
+    clock: FakeClock,
+    global_limit: RateLimit | None = None,
+    recipient_limit: RateLimit | None = None,
+    max_recipients: int = 100,
+) -> tuple[RateLimiter, _SleepRecorder]:
+    sleep = _SleepRecorder(clock)
+    limiter = RateLimiter(
+        global_limit,
+        recipient_limit,
+        max_recipients=max_recipients,
+        clock=clock,
+        sleep=sleep,
+    )
+    return limiter, sleep
+
+
+def test_global_bucket_allows_burst_then_reports_wait() -> None:
+    clock = FakeClock()
+    limiter, _ = _limiter(clock, RateLimit(per_second=2, burst=3))
+    assert [limiter.try_acquire(str(index)) for index in range(4)] == [True, True, True, False]
+    assert limiter.wait_time() == pytest.approx(0.5)
+    clock.advance(0.5)
+    assert limiter.try_acquire("4")
+
+
+def test_recipient_buckets_are_independent() -> None:
+    clock = FakeClock()
+    limiter, _ = _limiter(clock, recipient_limit=RateLimit.per_minute(6))
+    assert limiter.try_acquire("+10000000000")
+    assert not limiter.try_acquire("+10000000000")
+    assert limiter.try_acquire("+10000000001")
+    assert limiter.wait_time("+10000000000") == pytest.approx(10.0)
+    assert limiter.wait_time("+19999999999") == 0.0
+
+
+def test_acquire_sleeps_exactly_until_a_slot_is_free() -> None:
+    clock = FakeClock()
+    limiter, sleep = _limiter(clock, RateLimit(per_second=4))
+    for _ in range(3):
+        assert limiter.acquire("+10000000000")
+    assert sleep.sleeps == [pytest.approx(0.25), pytest.approx(0.25)]
+
+
+def test_acquire_gives_up_when_timeout_is_too_short() -> None:
+    clock = FakeClock()
+    limiter, sleep = _limiter(clock, RateLimit(per_second=1))
+    assert limiter.acquire("+10000000000", timeout=0)
+    assert not limiter.acquire("+10000000000", timeout=0.5)
+    assert sleep.sleeps == []
+
+
+def test_idle_and_least_recently_used_buckets_are_evicted() -> None:
+    clock = FakeClock()
+    limiter, _ = _limiter(clock, recipient_limit=RateLimit(per_second=1), max_recipients=3)
+    for index in range(5):
+        limiter.try_acquire(str(index))
+    assert limiter.tracked_recipients() == 3  # noqa: PLR2004
+    clock.advance(1)
+    limiter.try_acquire("5")
+    assert limiter.tracked_recipients() == 1
+
+
+@pytest.mark.parametrize(("per_second", "burst"), [(0, 1), (-1, 1), (1, 0.5)])
+def test_rate_limit_rejects_invalid_values(per_second: float, burst: float) -> None:
+    with pytest.raises(InvalidRateLimitError):
+        RateLimit(per_second, burst)
+
+
+@pytest.mark.parametrize("max_recipients", [0, True, 2.5])
+def test_rate_limiter_rejects_invalid_bucket_bound(max_recipients: Any) -> None:
+    with pytest.raises(InvalidRateLimitError):
+        RateLimiter(max_recipients=max_recipients)
+
+
+def test_client_sends_wait_on_rate_limiter(configuration: Configuration) -> None:
+    clock = FakeClock()
+    limiter, sleep = _limiter(clock, recipient_limit=RateLimit(per_second=0.5))
+    runner = StubRunner()
+    client = IMessageClient(
+        configuration,
+        command_runner=runner,
+        logger=logging.getLogger("test.ratelimit"),
+        rate_limiter=limiter,
+    )
+    client.send("+10000000000", "One")
+    client.send("+10000000001", "Two")
+    client.send("+10000000000", "Three")
+    assert len(runner.commands) == 3  # noqa: PLR2004
+    assert sleep.sleeps == [pytest.approx(2.0)]
+
+
+def test_async_client_sends_wait_on_rate_limiter(configuration: Configuration) -> None:
+    limiter = RateLimiter(RateLimit(per_second=20))
+    runner = StubAsyncRunner()
+    client = AsyncIMessageClient(configuration, command_runner=runner, rate_limiter=limiter)
+    started = time.monotonic()
+    successful, _ = asyncio.run(client.send_bulk(["1", "2", "3"], "Ping"))
+    assert successful == ["1", "2", "3"]
+    assert time.monotonic() - started >= 0.09  # noqa: PLR2004
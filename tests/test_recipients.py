@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from macpymessenger import IMessageClient, normalize_handle, plan_recipients
+from macpymessenger.exceptions import InvalidRecipientHandleError
+from tests.support import StubRunner
+
+if TYPE_CHECKING:
+    from macpymessenger import Configuration
+
+
+@pytest.mark.parametrize(
+    ("handle", "expected"),
+    [
+        ("+1 (555) 123-4567", "+15551234567"),
+        ("5551234567", "+15551234567"),
+        ("1-555-123-4567", "+15551234567"),
+        ("555.123.4567", "+15551234567"),
+        ("+44 7911 123456", "+447911123456"),
+        ("0044 7911 123456", "+447911123456"),
+        ("  Ada.Lovelace@Example.COM ", "ada.lovelace@example.com"),
+    ],
+)
+def test_normalize_handle_returns_canonical_form(handle: str, expected: str) -> None:
+    assert normalize_handle(handle) == expected
+
+
+def test_national_numbers_use_the_default_country_code() -> None:
+    assert normalize_handle("07911 123456", "44") == "+447911123456"
+    assert normalize_handle("06 1234 5678", "39") == "+390612345678"
+
+
+@pytest.mark.parametrize(
+    "handle", ["555-1234", "phone", "+1 555 123 4567 ext 2", "12345678901234567", "a@b", "@x.com"]
+)
+def test_normalize_handle_rejects_invalid_handles(handle: str) -> None:
+    with pytest.raises(InvalidRecipientHandleError):
+        normalize_handle(handle)
+
+
+@pytest.mark.parametrize("country_code", ["", "0", "1234", "+1"])
+def test_invalid_default_country_code_is_rejected(country_code: str) -> None:
+    with pytest.raises(InvalidRecipientHandleError):
+        normalize_handle("5551234567", country_code)
+    with pytest.raises(InvalidRecipientHandleError):
+        plan_recipients([], default_country_code=country_code)
+
+
+def test_normalize_handle_caches_results() -> None:
+    normalize_handle.cache_clear()
+    normalize_handle("+1 (555) 000-0001")
+    normalize_handle("+1 (555) 000-0001")
+    assert normalize_handle.cache_info().hits == 1
+
+
+def test_plan_collapses_duplicates_and_rejects_invalid_handles() -> None:
+    plan = plan_recipients(
+        ["+1 (555) 123-4567", "ADA@example.com", "5551234567", "nope", "ada@example.com"]
+    )
+    assert plan.recipients == ("+15551234567", "ada@example.com")
+    assert plan.duplicates == (
+        ("5551234567", "+15551234567"),
+        ("ada@example.com", "ada@example.com"),
+    )
+    assert [handle for handle, _ in plan.rejected] == ["nope"]
+    assert "not a valid phone number" in plan.rejected[0][1]
+
+
+def test_planned_bulk_send_runs_one_command_per_recipient(configuration: Configuration) -> None:
+    runner = StubRunner()
+    client = IMessageClient(configuration, command_runner=runner)
+    plan = plan_recipients(["5551234567", "+15551234567", "x@y"])
+    successful, failed = client.send_bulk(plan.recipients, "Ping")
+    assert (successful, failed) == (["+15551234567"], [])
+    assert len(runner.commands) == 1
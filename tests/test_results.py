@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from macpymessenger import BulkResult, CircuitBreaker, ErrorKind, IMessageClient, SendStatus
+from macpymessenger.delivery import DeliveryOutcome
+from macpymessenger.exceptions import CircuitOpenError, MessageSendError
+from tests.support import StubRunner
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from macpymessenger import Configuration
+
+
+def _failure(recipient_handle: str, cause: BaseException) -> MessageSendError:
+    error = MessageSendError.delivery_failed(recipient_handle)
+    error.__cause__ = cause
+    return error
+
+
+def _result() -> BulkResult:
+    return BulkResult.from_outcomes(
+        [
+            DeliveryOutcome("1", duration_us=120),
+            DeliveryOutcome("2", _failure("2", subprocess.CalledProcessError(1, [])), 80),
+            DeliveryOutcome("3", duration_us=2**40),
+            DeliveryOutcome("4", _failure("4", FileNotFoundError())),
+            DeliveryOutcome("5", CircuitOpenError.circuit_open("5")),
+        ]
+    )
+
+
+def test_result_unpacks_to_views_equal_to_the_former_lists() -> None:
+    successful, failed = _result()
+    assert successful == ["1", "3"]
+    assert failed == ["2", "4", "5"]
+    assert failed != ["2", "4"]
+    assert list(failed) == ["2", "4", "5"]
+
+
+def test_result_counts_and_per_index_codes() -> None:
+    result = _result()
+    assert len(result) == 5  # noqa: PLR2004
+    assert (result.succeeded_count, result.failed_count) == (2, 3)
+    assert [result.status(index) for index in range(5)] == [
+        SendStatus.SENT,
+        SendStatus.FAILED,
+        SendStatus.SENT,
+        SendStatus.FAILED,
+        SendStatus.FAILED,
+    ]
+    assert list(result.error_kinds) == [
+        ErrorKind.NONE,
+        ErrorKind.DELIVERY_FAILED,
+        ErrorKind.NONE,
+        ErrorKind.COMMAND_FAILED,
+        ErrorKind.CIRCUIT_OPEN,
+    ]
+    assert result.duration_us(0) == 120  # noqa: PLR2004
+    assert result.duration_us(2) == 2**32 - 1
+
+
+def test_views_support_indexing_and_slicing() -> None:
+    successful, failed = _result()
+    assert (len(successful), len(failed)) == (2, 3)
+    assert successful[-1] == "3"
+    assert failed[1:] == ["4", "5"]
+    with pytest.raises(IndexError):
+        successful[2]
+
+
+def test_array_views_are_read_only() -> None:
+    result = _result()
+    with pytest.raises(TypeError):
+        result.statuses[0] = SendStatus.FAILED
+
+
+def test_result_refers_to_the_recipient_sequence(configuration: Configuration) -> None:
+    recipients: Sequence[str] = ["1", "2", "3"]
+    client = IMessageClient(configuration, command_runner=StubRunner(["2"]))
+    result = client.send_bulk(recipients, "Ping")
+    assert result.recipients is recipients
+    assert result.failed == ["2"]
+    assert all(duration >= 0 for duration in result.durations_us)
+
+
+def test_result_collects_handles_from_an_iterator(configuration: Configuration) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=60)
+    client = IMessageClient(
+        configuration, command_runner=StubRunner(["a"]), circuit_breaker=breaker
+    )
+    result = client.send_bulk(iter(["a", "b"]), "Ping")
+    assert list(result.recipients) == ["a", "b"]
+    assert [result.error_kind(index) for index in range(2)] == [
+        ErrorKind.DELIVERY_FAILED,
+        ErrorKind.CIRCUIT_OPEN,
+    ]
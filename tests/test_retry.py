@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import subprocess
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from macpymessenger import (
+    AsyncIMessageClient,
+    CircuitBreaker,
+    CircuitState,
+    IMessageClient,
+    RetryPolicy,
+)
+from macpymessenger.exceptions import (
+    CircuitOpenError,
+    InvalidRetryPolicyError,
+    MessageSendError,
+)
+from tests.support import FakeClock, StubAsyncRunner, StubOutputRunner, StubRunner
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from macpymessenger import Configuration
+
+NO_BACKOFF = RetryPolicy(max_attempts=3, initial_backoff=0, jitter=False)
+
+
+class _FlakyRunner(StubRunner):
+    """Fails the first *failures* commands, then succeeds."""
+
+    def __init__(self, failures: int, error: Exception | None = None) -> None:
+        super().__init__()
+        self.failures = failures
+        self.error = error
+
+    def __call__(self, command: Sequence[str]) -> None:
+        super().__call__(command)
+        if len(self.commands) <= self.failures:
+            raise self.error or subprocess.CalledProcessError(1, list(command))
+
+
+def _client(configuration: Configuration, runner: StubRunner, **options: Any) -> IMessageClient:
+    return IMessageClient(
+        configuration,
+        command_runner=runner,
+        logger=logging.getLogger("test.retry"),
+        **options,
+    )
+
+
+def test_backoff_grows_exponentially_up_to_the_cap() -> None:
+    policy = RetryPolicy(initial_backoff=0.5, max_backoff=3, jitter=False)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1, 2, 3, 3]
+
+
+def test_jittered_backoff_stays_within_the_exponential_bound() -> None:
+    policy = RetryPolicy(initial_backoff=1, multiplier=3)
+    assert all(0 <= policy.backoff(3) <= 9 for _ in range(100))  # noqa: PLR2004
+
+
+def test_should_retry_checks_attempts_and_error_class() -> None:
+    policy = RetryPolicy(max_attempts=2, retryable=(OSError,))
+    assert policy.should_retry(OSError(), 1)
+    assert not policy.should_retry(OSError(), 2)
+    assert not policy.should_retry(subprocess.CalledProcessError(1, []), 1)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"max_attempts": 0}, {"max_attempts": True}, {"initial_backoff": -1}, {"multiplier": 0.5}],
+)
+def test_retry_policy_rejects_invalid_settings(options: Any) -> None:
+    with pytest.raises(InvalidRetryPolicyError):
+        RetryPolicy(**options)
+
+
+def test_send_retries_until_success(configuration: Configuration) -> None:
+    runner = _FlakyRunner(failures=2)
+    _client(configuration, runner, retry_policy=NO_BACKOFF).send("+10000000000", "Hello")
+    assert len(runner.commands) == 3  # noqa: PLR2004
+
+
+def test_send_gives_up_after_max_attempts(configuration: Configuration) -> None:
+    runner = _FlakyRunner(failures=5)
+    client = _client(configuration, runner, retry_policy=NO_BACKOFF)
+    with pytest.raises(MessageSendError, match="Failed to send message"):
+        client.send("+10000000000", "Hello")
+    assert len(runner.commands) == 3  # noqa: PLR2004
+
+
+def test_send_does_not_retry_non_retryable_errors(configuration: Configuration) -> None:
+    runner = _FlakyRunner(failures=5)
+    policy = RetryPolicy(initial_backoff=0, retryable=(OSError,))
+    with pytest.raises(MessageSendError):
+        _client(configuration, runner, retry_policy=policy).send("+10000000000", "Hello")
+    assert len(runner.commands) == 1
+
+
+def test_breaker_fails_fast_once_open_and_recovers_after_trial(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=10, clock=clock)
+    runner = _FlakyRunner(failures=2)
+    client = _client(configuration, runner, circuit_breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(MessageSendError):
+            client.send("+10000000000", "Hello")
+    with caplog.at_level(logging.WARNING), pytest.raises(CircuitOpenError):
+        client.send("+10000000000", "Hello")
+    assert len(runner.commands) == 2  # noqa: PLR2004
+    assert breaker.state is CircuitState.OPEN
+
+    clock.advance(10)
+    with caplog.at_level(logging.WARNING):
+        client.send("+10000000000", "Hello")
+    assert breaker.state is CircuitState.CLOSED
+    assert "open -> half_open" in caplog.text
+    assert "half_open -> closed" in caplog.text
+
+
+def test_failed_trial_reopens_the_breaker() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=5, clock=clock)
+    breaker.record_failure()
+    clock.advance(5)
+    breaker.before_send("+10000000000")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_send("+10000000001")
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_cancelled_trial_releases_the_half_open_slot(configuration: Configuration) -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=5, clock=clock)
+    breaker.record_failure()
+    clock.advance(5)
+    client = AsyncIMessageClient(
+        configuration,
+        command_runner=StubAsyncRunner(latency_seconds=10),
+        logger=logging.getLogger("test.retry"),
+        circuit_breaker=breaker,
+    )
+
+    async def cancel_trial() -> None:
+        trial = asyncio.create_task(client.send("+10000000000", "Hello"))
+        await asyncio.sleep(0)
+        assert breaker.state is CircuitState.HALF_OPEN
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+    asyncio.run(cancel_trial())
+
+    breaker.before_send("+10000000001")
+    assert breaker.state is CircuitState.HALF_OPEN
+
+
+def test_open_breaker_stops_retries(configuration: Configuration) -> None:
+    breaker = CircuitBreaker(failure_threshold=1)
+    runner = _FlakyRunner(failures=5)
+    client = _client(configuration, runner, retry_policy=NO_BACKOFF, circuit_breaker=breaker)
+    with pytest.raises(MessageSendError):
+        client.send("+10000000000", "Hello")
+    assert len(runner.commands) == 1
+
+
+def test_send_bulk_reports_recipients_skipped_by_open_breaker(
+    configuration: Configuration,
+) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=60)
+    runner = StubRunner(["1", "2"])
+    client = _client(configuration, runner, circuit_breaker=breaker)
+    successful, failed = client.send_bulk(["1", "2", "3", "4"], "Ping")
+    assert successful == []
+    assert failed == ["1", "2", "3", "4"]
+    assert len(runner.commands) == 2  # noqa: PLR2004
+
+
+def test_batch_send_retries_failed_invocation(configuration: Configuration) -> None:
+    class FlakyOutputRunner(StubOutputRunner):
+        def __call__(self, command: Sequence[str]) -> str:
+            output = super().__call__(command)
+            if len(self.commands) == 1:
+                raise subprocess.CalledProcessError(1, list(command))
+            return output
+
+    output_runner = FlakyOutputRunner()
+    client = _client(
+        configuration, StubRunner(), output_command_runner=output_runner, retry_policy=NO_BACKOFF
+    )
+    successful, failed = client.send_bulk(["1", "2"], "Ping", batch_size=2)
+    assert (successful, failed) == (["1", "2"], [])
+    assert len(output_runner.commands) == 2  # noqa: PLR2004
+
+
+def test_batch_send_skips_chunks_while_breaker_is_open(configuration: Configuration) -> None:
+    output_runner = StubOutputRunner()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=60)
+    client = _client(
+        configuration,
+        StubRunner(),
+        output_command_runner=output_runner,
+        circuit_breaker=breaker,
+    )
+    breaker.record_failure()
+    successful, failed = client.send_bulk(["1", "2"], "Ping", batch_size=2)
+    assert (successful, failed) == ([], ["1", "2"])
+    assert output_runner.commands == []
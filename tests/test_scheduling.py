@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import CancelledError
+from typing import TYPE_CHECKING
+
+import pytest
+
+from macpymessenger import DeliveryScheduler
+from macpymessenger.delivery import MessageDelivery
+from macpymessenger.exceptions import (
+    DispatcherError,
+    InvalidDelayTypeError,
+    MessageSendError,
+    NegativeDelayError,
+)
+from tests.support import FakeClock, StubRunner
+
+if TYPE_CHECKING:
+    from macpymessenger import Configuration, IMessageClient
+
+
+@pytest.fixture
+def scheduler(
+    configuration: Configuration,
+) -> tuple[DeliveryScheduler, StubRunner, FakeClock]:
+    runner = StubRunner()
+    delivery = MessageDelivery(
+        configuration=configuration,
+        command_runner=runner,
+        logger=logging.getLogger("test.scheduling"),
+    )
+    clock = FakeClock()
+    return DeliveryScheduler(delivery, clock=clock), runner, clock
+
+
+def test_send_runs_only_once_due(
+    scheduler: tuple[DeliveryScheduler, StubRunner, FakeClock],
+) -> None:
+    instance, runner, clock = scheduler
+    scheduled = instance.schedule("+10000000000", "Hello", 30)
+    assert instance.run_due() == 0
+    assert runner.commands == []
+    assert scheduled.seconds_remaining() == 30  # noqa: PLR2004
+    clock.advance(30)
+    assert instance.run_due() == 1
+    assert runner.commands[0][2:] == ["+10000000000", "Hello", "0"]
+    assert scheduled.done()
+    scheduled.result(timeout=0)
+
+
+def test_sends_dispatch_in_due_order(
+    scheduler: tuple[DeliveryScheduler, StubRunner, FakeClock],
+) -> None:
+    instance, runner, clock = scheduler
+    instance.schedule("late", "Hello", 20)
+    instance.schedule("early", "Hello", 5)
+    instance.schedule("middle", "Hello", 10)
+    instance.schedule("middle-second", "Hello", 10)
+    clock.advance(20)
+    assert instance.run_due() == 4  # noqa: PLR2004
+    assert [command[2] for command in runner.commands] == [
+        "early",
+        "middle",
+        "middle-second",
+        "late",
+    ]
+
+
+def test_cancelled_send_never_runs(
+    scheduler: tuple[DeliveryScheduler, StubRunner, FakeClock],
+) -> None:
+    instance, runner, clock = scheduler
+    cancelled = instance.schedule("+10000000001", "Hello", 5)
+    kept = instance.schedule("+10000000002", "Hello", 5)
+    assert cancelled.cancel() is True
+    assert cancelled.cancel() is True
+    assert instance.pending_count() == 1
+    clock.advance(5)
+    instance.run_due()
+    assert [command[2] for command in runner.commands] == ["+10000000002"]
+    assert kept.cancel() is False
+    with pytest.raises(CancelledError):
+        cancelled.result(timeout=0)
+
+
+def test_time_queries(
+    scheduler: tuple[DeliveryScheduler, StubRunner, FakeClock],
+) -> None:
+    instance, _, clock = scheduler
+    assert instance.seconds_until_next() is None
+    first = instance.schedule("+10000000001", "Hello", 10)
+    instance.schedule("+10000000002", "Hello", 40)
+    clock.advance(4)
+    assert instance.seconds_until_next() == 6  # noqa: PLR2004
+    first.cancel()
+    assert instance.seconds_until_next() == 36  # noqa: PLR2004
+    assert instance.pending_count() == 1
+
+
+def test_delivery_failure_is_reported_through_handle(
+    scheduler: tuple[DeliveryScheduler, StubRunner, FakeClock],
+) -> None:
+    instance, runner, _ = scheduler
+    runner.failing_recipient_handles.add("+19999999999")
+    scheduled = instance.schedule("+19999999999", "Hello", 0)
+    instance.run_due()
+    with pytest.raises(MessageSendError):
+        scheduled.result(timeout=0)
+
+
+def test_schedule_validates_delay(
+    scheduler: tuple[DeliveryScheduler, StubRunner, FakeClock],
+) -> None:
+    instance, _, _ = scheduler
+    with pytest.raises(NegativeDelayError):
+        instance.schedule("+10000000000", "Hello", -1)
+    with pytest.raises(InvalidDelayTypeError):
+        instance.schedule("+10000000000", "Hello", 1.5)
+    assert instance.pending_count() == 0
+
+
+def test_thousands_of_pending_sends(
+    scheduler: tuple[DeliveryScheduler, StubRunner, FakeClock],
+) -> None:
+    instance, runner, clock = scheduler
+    handles = [instance.schedule(str(index), "Hello", index % 600) for index in range(5000)]
+    for handle in handles[::2]:
+        handle.cancel()
+    assert instance.pending_count() == 2500  # noqa: PLR2004
+    clock.advance(600)
+    assert instance.run_due() == 2500  # noqa: PLR2004
+    assert len(runner.commands) == 2500  # noqa: PLR2004
+
+
+def test_heap_is_compacted_once_most_sends_are_cancelled(
+    scheduler: tuple[DeliveryScheduler, StubRunner, FakeClock],
+) -> None:
+    instance, runner, clock = scheduler
+    handles = [instance.schedule(str(index), "Hello", 3600) for index in range(1000)]
+    for handle in handles[:900]:
+        handle.cancel()
+    assert instance.pending_count() == 100  # noqa: PLR2004
+    assert len(instance._heap) <= 200  # noqa: PLR2004
+    clock.advance(3600)
+    assert instance.run_due() == 100  # noqa: PLR2004
+    assert [command[2] for command in runner.commands] == [str(index) for index in range(900, 1000)]
+
+
+def test_background_thread_dispatches_due_sends(configuration: Configuration) -> None:
+    runner = StubRunner()
+    delivery = MessageDelivery(
+        configuration=configuration,
+        command_runner=runner,
+        logger=logging.getLogger("test.scheduling"),
+    )
+    with DeliveryScheduler(delivery) as instance:
+        scheduled = instance.schedule("+10000000000", "Hello", 0)
+        scheduled.result(timeout=5)
+    assert runner.commands[0][2] == "+10000000000"
+
+
+def test_shutdown_cancels_pending_sends(configuration: Configuration) -> None:
+    delivery = MessageDelivery(
+        configuration=configuration,
+        command_runner=StubRunner(),
+        logger=logging.getLogger("test.scheduling"),
+    )
+    instance = DeliveryScheduler(delivery)
+    instance.start()
+    scheduled = instance.schedule("+10000000000", "Hello", 3600)
+    instance.shutdown()
+    assert scheduled.cancelled()
+    assert instance.pending_count() == 0
+    with pytest.raises(DispatcherError):
+        instance.schedule("+10000000000", "Hello", 0)
+    with pytest.raises(DispatcherError):
+        instance.start()
+
+
+def test_client_schedule_uses_in_process_delay(
+    client: tuple[IMessageClient, StubRunner],
+) -> None:
+    instance, runner = client
+    try:
+        scheduled = instance.schedule("+10000000000", "Hello", 0)
+        scheduled.result(timeout=5)
+        waiting = instance.schedule("+10000000001", "Later", 3600)
+        assert waiting.seconds_remaining() > 0
+    finally:
+        instance.close()
+    assert runner.commands[0][2:] == ["+10000000000", "Hello", "0"]
+    assert waiting.cancelled()
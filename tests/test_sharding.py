@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from macpymessenger import RetryPolicy, ShardedDispatcher
+from macpymessenger.exceptions import (
+    DispatcherError,
+    InvalidConcurrencyError,
+    MessageSendError,
+)
+from macpymessenger.results import ErrorKind
+from macpymessenger.sharding import shard_of
+from tests.support import StubRunnerFactory
+
+if TYPE_CHECKING:
+    from macpymessenger import Configuration
+
+
+def test_shard_of_is_stable_and_in_range() -> None:
+    shards = [shard_of(f"+1555000{index:04d}", 4) for index in range(200)]
+
+    assert shards == [shard_of(f"+1555000{index:04d}", 4) for index in range(200)]
+    assert set(shards) == {0, 1, 2, 3}
+    assert shard_of("+15555555555", 4) == 1  # crc32 pins the assignment
+
+
+@pytest.mark.parametrize("options", [{"shards": 0}, {"shards": True}, {"pending_per_shard": 0}])
+def test_rejects_invalid_counts(configuration: Configuration, options: dict[str, int]) -> None:
+    with pytest.raises(InvalidConcurrencyError):
+        ShardedDispatcher(configuration, **options)
+
+
+def test_dispatch_keeps_order_per_recipient(configuration: Configuration) -> None:
+    recipients = ["+15550000001", "+15550000002", "+15550000003", "+15550000004"]
+    messages = [(recipients[index % 4], f"Message {index}") for index in range(40)]
+
+    with ShardedDispatcher(
+        configuration,
+        shards=2,
+        runner_factory=StubRunnerFactory(latency_seconds=0.001),
+        pending_per_shard=4,
+    ) as dispatcher:
+        received = list(dispatcher.dispatch(messages))
+
+    assert sorted(index for index, _ in received) == list(range(40))
+    for recipient in recipients:
+        indexes = [index for index, outcome in received if outcome.recipient_handle == recipient]
+        assert indexes == sorted(indexes)
+
+
+def test_send_bulk_streams_errors_back_in_input_order(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    recipients = [f"+1555000000{index}" for index in range(6)]
+    logger = logging.getLogger("test.sharding.bulk")
+
+    with (
+        caplog.at_level(logging.INFO, logger="test.sharding.bulk"),
+        ShardedDispatcher(
+            configuration,
+            shards=2,
+            runner_factory=StubRunnerFactory(recipients[1::2]),
+            logger=logger,
+        ) as dispatcher,
+    ):
+        result = dispatcher.send_bulk(recipients, "Ping")
+
+    assert result.successful == recipients[::2]
+    assert result.failed == recipients[1::2]
+    assert result.error_kind(1) is ErrorKind.DELIVERY_FAILED
+    errors = [record for record in caplog.records if record.levelno == logging.ERROR]
+    assert len(errors) == len(recipients[1::2])
+    for record in errors:
+        assert record.exc_info is not None
+        error = record.exc_info[1]
+        assert isinstance(error, MessageSendError)
+        assert isinstance(error.__cause__, subprocess.CalledProcessError)
+
+
+def test_worker_retries_are_logged_by_the_parent(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    logger = logging.getLogger("test.sharding.retries")
+
+    with (
+        caplog.at_level(logging.WARNING, logger="test.sharding.retries"),
+        ShardedDispatcher(
+            configuration,
+            shards=1,
+            runner_factory=StubRunnerFactory(["+15550000001"]),
+            retry_policy=RetryPolicy(max_attempts=3, initial_backoff=0, jitter=False),
+            logger=logger,
+        ) as dispatcher,
+    ):
+        dispatcher.send_bulk(["+15550000001", "+15550000002"], "Ping")
+
+    warnings = [
+        record.getMessage() for record in caplog.records if record.levelno == logging.WARNING
+    ]
+    assert warnings == ["Send to +15550000001 was retried 2 times"]
+
+
+def test_close_drains_an_abandoned_dispatch(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    logger = logging.getLogger("test.sharding.drain")
+    dispatcher = ShardedDispatcher(
+        configuration,
+        shards=2,
+        runner_factory=StubRunnerFactory(latency_seconds=0.001),
+        logger=logger,
+    )
+    outcomes = dispatcher.dispatch((f"+1555000000{index}", "Ping") for index in range(10))
+    next(outcomes)
+
+    with caplog.at_level(logging.INFO, logger="test.sharding.drain"):
+        dispatcher.close()
+
+    sent = [record for record in caplog.records if record.getMessage().startswith("Message sent")]
+    assert len(sent) == 9  # noqa: PLR2004
+    with pytest.raises(DispatcherError):
+        list(dispatcher.dispatch([("+15555555555", "Ping")]))
+
+
+def test_shard_exit_is_reported(
+    configuration: Configuration, caplog: pytest.LogCaptureFixture
+) -> None:
+    logger = logging.getLogger("test.sharding.exit")
+    dispatcher = ShardedDispatcher(
+        configuration,
+        shards=1,
+        runner_factory=StubRunnerFactory(exiting_recipient_handles=["+15550000002"]),
+        logger=logger,
+    )
+
+    with pytest.raises(DispatcherError, match="Shard 0 exited"):
+        list(dispatcher.dispatch([("+15550000001", "Ping"), ("+15550000002", "Ping")]))
+    with caplog.at_level(logging.ERROR, logger="test.sharding.exit"):
+        dispatcher.close()
+
+    assert caplog.records[-1].getMessage().startswith("Shard 0 exited")
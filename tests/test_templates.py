@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+from types import MappingProxyType
 from typing import TYPE_CHECKING, cast
 
 import pytest
 
 from macpymessenger.exceptions import TemplateNotFoundError, TemplateTypeError
+from macpymessenger.templates import _process_template
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator, Mapping
     from string.templatelib import Template
 
     from macpymessenger import TemplateManager
@@ -50,6 +52,38 @@ def test_template_factory_must_return_t_string(template_manager: TemplateManager
         template_manager.render_template("greeting", context={"name": "Ada"})
 
 
+def test_compiled_render_matches_reference_renderer(template_manager: TemplateManager) -> None:
+    class Name(str):
+        __slots__ = ()
+
+    def factory(name: str, width: str, quoted: str) -> Template:
+        if quoted:
+            return t"Hi {name!r:>{width}}, {name}."
+        return t"Hi {name:>{width}}, {name}."
+
+    template_manager.create_template("greeting", factory)
+    contexts: list[dict[str, str]] = [
+        {"name": "Ada", "width": "", "quoted": ""},
+        {"name": "Ada", "width": "6", "quoted": ""},
+        {"name": "Ada", "width": "", "quoted": "yes"},
+        {"name": Name("Bob"), "width": "4", "quoted": ""},
+        {"name": "Ada", "width": "", "quoted": ""},
+    ]
+    for context in contexts:
+        expected = _process_template(factory(**context))
+        assert template_manager.render_template("greeting", context) == expected
+
+
+def test_compiled_render_still_type_checks_after_warm_up(
+    template_manager: TemplateManager,
+) -> None:
+    template_manager.create_template("greeting", lambda name: t"Hello, {name}!")
+    assert template_manager.render_template("greeting", {"name": "Ada"}) == "Hello, Ada!"
+    context: dict[str, object] = {"name": 123}
+    with pytest.raises(TemplateTypeError, match=r"'name' resolved to int"):
+        template_manager.render_template("greeting", context)
+
+
 def test_update_and_delete_template(
     template_manager: TemplateManager,
 ) -> None:
@@ -69,3 +103,47 @@ def test_update_nonexistent_template_raises(template_manager: TemplateManager) -
 def test_delete_nonexistent_template_raises(template_manager: TemplateManager) -> None:
     with pytest.raises(TemplateNotFoundError):
         template_manager.delete_template("nonexistent")
+
+
+def test_render_many_renders_lazily_in_order(template_manager: TemplateManager) -> None:
+    template_manager.create_template("greeting", lambda name: t"Hello, {name}!")
+    consumed: list[str] = []
+
+    def contexts() -> Iterator[Mapping[str, object]]:
+        for name in ("Ada", "Grace"):
+            consumed.append(name)
+            yield {"name": name}
+        yield MappingProxyType({"name": "Linus"})
+
+    rendered = template_manager.render_many("greeting", contexts())
+    assert consumed == []
+    assert next(rendered) == "Hello, Ada!"
+    assert consumed == ["Ada"]
+    assert list(rendered) == ["Hello, Grace!", "Hello, Linus!"]
+
+
+def test_render_many_is_strict_by_default(template_manager: TemplateManager) -> None:
+    template_manager.create_template("greeting", lambda name: t"Hello, {name}!")
+    rendered = template_manager.render_many("greeting", [{"name": "Ada"}, {"name": 1}])
+    assert next(rendered) == "Hello, Ada!"
+    with pytest.raises(TemplateTypeError):
+        next(rendered)
+
+
+def test_render_many_skips_and_reports_bad_rows(template_manager: TemplateManager) -> None:
+    template_manager.create_template("greeting", lambda name: t"Hello, {name}!")
+    failures: list[tuple[int, TemplateTypeError]] = []
+    contexts: list[dict[str, object]] = [{"name": "Ada"}, {"name": 1}, {"name": "Grace"}]
+    rendered = template_manager.render_many(
+        "greeting", contexts, on_error=lambda index, error: failures.append((index, error))
+    )
+    assert list(rendered) == ["Hello, Ada!", "Hello, Grace!"]
+    assert [index for index, _ in failures] == [1]
+    assert "resolved to int" in str(failures[0][1])
+
+
+def test_render_many_rejects_unknown_template_immediately(
+    template_manager: TemplateManager,
+) -> None:
+    with pytest.raises(TemplateNotFoundError):
+        template_manager.render_many("missing", [])
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+import pytest
+
+from macpymessenger import (
+    AsyncIMessageClient,
+    Configuration,
+    IMessageClient,
+    OpenTelemetryTracer,
+    RetryPolicy,
+    Span,
+    set_tracer,
+)
+from macpymessenger.exceptions import MessageSendError
+from macpymessenger.tracing import active_tracer, trace_span
+from tests.support import StubAsyncRunner, StubOutputRunner, StubRunner
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+    from pathlib import Path
+
+    from macpymessenger import TemplateManager
+
+
+class RecordingTracer:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str, dict[str, object]]] = []
+        self.ended: list[Span] = []
+
+    def on_start(self, span: Span) -> None:
+        self.events.append(("start", span.name, dict(span.attributes)))
+
+    def on_end(self, span: Span) -> None:
+        self.events.append(("end", span.name, dict(span.attributes)))
+        self.ended.append(span)
+
+
+@pytest.fixture
+def tracer() -> Iterator[RecordingTracer]:
+    recording = RecordingTracer()
+    previous = set_tracer(recording)
+    yield recording
+    set_tracer(previous)
+
+
+def test_no_tracer_is_registered_by_default() -> None:
+    assert active_tracer() is None
+
+
+def test_send_template_nests_render_deliver_and_command(
+    client: tuple[IMessageClient, StubRunner],
+    template_manager: TemplateManager,
+    tracer: RecordingTracer,
+) -> None:
+    instance, _ = client
+    template_manager.create_template("greeting", lambda name: t"Hello, {name}!")
+    instance.send_template("+15550000001", "greeting", {"name": "Ada"})
+    assert [(event, name) for event, name, _ in tracer.events] == [
+        ("start", "macpymessenger.render"),
+        ("end", "macpymessenger.render"),
+        ("start", "macpymessenger.deliver"),
+        ("start", "macpymessenger.command"),
+        ("end", "macpymessenger.command"),
+        ("end", "macpymessenger.deliver"),
+    ]
+    assert tracer.events[0][2] == {"template_id": "greeting"}
+    assert tracer.events[3][2] == {"recipient": "+15550000001", "attempt": 1}
+    assert all(span.duration_ns is not None and span.duration_ns >= 0 for span in tracer.ended)
+
+
+def test_failed_attempts_are_traced_with_their_error(
+    script_path: Path, tracer: RecordingTracer
+) -> None:
+    client = IMessageClient(
+        Configuration(script_path),
+        command_runner=StubRunner(["+15550000002"]),
+        retry_policy=RetryPolicy(max_attempts=2, initial_backoff=0, jitter=False),
+    )
+    with pytest.raises(MessageSendError):
+        client.send("+15550000002", "Hello")
+    commands = [span for span in tracer.ended if span.name == "macpymessenger.command"]
+    [deliver] = [span for span in tracer.ended if span.name == "macpymessenger.deliver"]
+    assert [span.attributes["attempt"] for span in commands] == [1, 2]
+    assert all(span.error is not None for span in commands)
+    assert isinstance(deliver.error, MessageSendError)
+
+
+def test_batch_and_async_sends_are_traced(script_path: Path, tracer: RecordingTracer) -> None:
+    client = IMessageClient(
+        Configuration(script_path),
+        command_runner=StubRunner(),
+        output_command_runner=StubOutputRunner(),
+    )
+    client.send_bulk(["+15550000001", "+15550000002"], "Hello", batch_size=2)
+    async_client = AsyncIMessageClient(Configuration(script_path), command_runner=StubAsyncRunner())
+    asyncio.run(async_client.send("+15550000003", "Hello"))
+    started = [(name, attributes) for event, name, attributes in tracer.events if event == "start"]
+    assert started == [
+        ("macpymessenger.command", {"recipients": 2, "attempt": 1}),
+        ("macpymessenger.deliver", {"recipient": "+15550000003"}),
+        ("macpymessenger.command", {"recipient": "+15550000003", "attempt": 1}),
+    ]
+
+
+def test_open_telemetry_adapter_enters_and_exits_current_spans() -> None:
+    calls: list[tuple[str, object]] = []
+
+    class FakeOpenTelemetryTracer:
+        @contextmanager
+        def start_as_current_span(
+            self, name: str, *, attributes: Mapping[str, object]
+        ) -> Iterator[None]:
+            calls.append(("enter", (name, dict(attributes))))
+            try:
+                yield
+            except ValueError as error:
+                calls.append(("error", error))
+                raise
+            calls.append(("exit", name))
+
+    adapter = OpenTelemetryTracer(FakeOpenTelemetryTracer())
+    with trace_span(adapter, "outer", recipient="+15550000001"):
+        pass
+    failure = ValueError("boom")
+    with pytest.raises(ValueError, match="boom"), trace_span(adapter, "inner"):
+        raise failure
+    assert calls == [
+        ("enter", ("outer", {"recipient": "+15550000001"})),
+        ("exit", "outer"),
+        ("enter", ("inner", {})),
+        ("error", failure),
+    ]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from macpymessenger import Configuration, WorkerCommandRunner
+from macpymessenger.delivery import MessageDelivery
+from macpymessenger.exceptions import InvalidCommandError, MessageSendError
+from tests.support import read_fake_worker_log, write_fake_worker
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def worker(tmp_path: Path) -> Iterator[tuple[WorkerCommandRunner, Path]]:
+    worker_command, log_path = write_fake_worker(tmp_path)
+    runner = WorkerCommandRunner(worker_command)
+    try:
+        yield runner, log_path
+    finally:
+        runner.close()
+
+
+def send_command(recipient_handle: str, message_body: str = "hi") -> list[str]:
+    return ["osascript", "send.scpt", recipient_handle, message_body, "0"]
+
+
+def test_worker_runner_reuses_one_process(worker: tuple[WorkerCommandRunner, Path]) -> None:
+    runner, log_path = worker
+    for recipient_handle in ("+10000000001", "+10000000002", "+10000000003"):
+        runner(send_command(recipient_handle))
+    rows = read_fake_worker_log(log_path)
+    assert [recipient for _, recipient, _ in rows] == [
+        "+10000000001",
+        "+10000000002",
+        "+10000000003",
+    ]
+    assert len({pid for pid, _, _ in rows}) == 1
+
+
+def test_worker_runner_frames_message_bodies_with_newlines(
+    worker: tuple[WorkerCommandRunner, Path],
+) -> None:
+    runner, log_path = worker
+    runner(send_command("+10000000001", "line one\nline two"))
+    runner(send_command("+10000000002", "after"))
+    rows = read_fake_worker_log(log_path)
+    assert [body for _, _, body in rows] == ["line one\nline two", "after"]
+
+
+def test_worker_failure_raises_called_process_error(
+    worker: tuple[WorkerCommandRunner, Path],
+) -> None:
+    runner, _ = worker
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        runner(send_command("fail"))
+    assert exc_info.value.stderr == "buddy not found"
+    runner(send_command("+10000000001"))
+
+
+def test_worker_crash_fails_request_and_restarts(
+    worker: tuple[WorkerCommandRunner, Path],
+) -> None:
+    runner, log_path = worker
+    runner(send_command("+10000000001"))
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        runner(send_command("crash"))
+    assert exc_info.value.returncode == 3  # noqa: PLR2004
+    runner(send_command("+10000000002"))
+    rows = read_fake_worker_log(log_path)
+    assert [recipient for _, recipient, _ in rows] == ["+10000000001", "+10000000002"]
+    assert rows[0][0] != rows[1][0]
+
+
+def test_worker_exit_between_sends_restarts_transparently(
+    worker: tuple[WorkerCommandRunner, Path],
+) -> None:
+    runner, log_path = worker
+    runner(send_command("+10000000001"))
+    runner.close()
+    runner(send_command("+10000000002"))
+    rows = read_fake_worker_log(log_path)
+    assert [recipient for _, recipient, _ in rows] == ["+10000000001", "+10000000002"]
+
+
+def test_worker_runner_rejects_invalid_commands(
+    worker: tuple[WorkerCommandRunner, Path],
+) -> None:
+    runner, _ = worker
+    command: Any = ["osascript", "send.scpt", 1, "hi", "0"]
+    with pytest.raises(InvalidCommandError, match="Command segments must be strings"):
+        runner(command)
+    for malformed in (
+        ["osascript", "send.scpt", "+10000000001"],
+        ["osascript", "send.scpt", "+10000000001", "hi", "soon"],
+    ):
+        with pytest.raises(InvalidCommandError, match="Send commands must be"):
+            runner(malformed)
+
+
+def test_worker_failures_map_to_message_send_error(
+    configuration: Configuration, worker: tuple[WorkerCommandRunner, Path]
+) -> None:
+    runner, _ = worker
+    delivery = MessageDelivery(
+        configuration=configuration,
+        command_runner=runner,
+        logger=logging.getLogger("test.worker"),
+    )
+    delivery.deliver("+10000000001", "Hello")
+    with pytest.raises(MessageSendError, match="Failed to send message to fail"):
+        delivery.deliver("fail", "Hello")
+
+
+def test_worker_runner_from_configuration_uses_bundled_worker_script(
+    configuration: Configuration,
+) -> None:
+    runner = WorkerCommandRunner.from_configuration(configuration)
+    assert configuration.worker_script_path.name == "sendMessageWorker.scpt"
+    assert runner._worker_command == ("osascript", str(configuration.worker_script_path))